@@ -0,0 +1,121 @@
+"""
+Measure the import time of kubeclient, each sample in a fresh interpreter.
+
+    python -m benchmarks.imports --output imports.json
+    python -m benchmarks.imports --baseline imports.json
+
+With --baseline, the run fails when a statement is slower, or loads more
+modules, than the baseline beyond the tolerance.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .run import percentile
+
+STATEMENTS = {
+    "kubeclient": "import kubeclient",
+    "resources_apis": "import kubeclient.resources_apis",
+    "KubernetesApiClient": "from kubeclient import KubernetesApiClient",
+    "Deployer": "from kubeclient import Deployer",
+    "Pod": "from kubeclient.resources_apis import Pod",
+}
+
+PROBE = """
+import sys, time
+modules = len(sys.modules)
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start, len(sys.modules) - modules)
+"""
+
+
+def measure(statement: str, runs: int) -> Dict[str, Any]:
+    seconds = []
+    modules = 0
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(statement=statement)],
+            check=True,
+            stdout=subprocess.PIPE,
+            cwd=Path(__file__).resolve().parent.parent,
+            text=True,
+        ).stdout.split()
+        seconds.append(float(output[0]))
+        modules = int(output[1])
+
+    return {
+        "statement": statement,
+        "runs": runs,
+        "modules": modules,
+        "min_ms": round(min(seconds) * 1000, 3),
+        "p50_ms": round(percentile(seconds, 0.5) * 1000, 3),
+        "max_ms": round(max(seconds) * 1000, 3),
+    }
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """
+    Return the regressions of a run against a baseline: a p50 import time
+    or a number of loaded modules higher than the baseline by more than the
+    tolerance.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        for metric in ("p50_ms", "modules"):
+            if result[metric] > before[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{name} {metric}: {before[metric]} -> {result[metric]}"
+                )
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": {
+            name: measure(statement, args.runs)
+            for name, statement in STATEMENTS.items()
+        },
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        regressions = compare(
+            report, json.loads(args.baseline.read_text()), args.tolerance
+        )
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""
+Benchmark kubeclient against a local stand-in API server seeded with
+synthetic pods, deployments and custom resources.
+
+    python -m benchmarks.run --sizes 1000,10000,100000 --output results.json
+    python -m benchmarks.run --sizes 1000 --baseline results.json
+
+Every scenario runs in a fresh process so its peak RSS is its own, and the
+results are written as JSON. With --baseline, the run fails when a scenario
+is slower or uses more memory than the baseline beyond the tolerance.
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+
+from kubeclient import Deployer, KubernetesApiClient, resources_apis
+
+from .standin import StandInApiServer, manifest, seed
+
+NAMESPACE = "bench"
+SCENARIOS = (
+    "list_pods",
+    "list_pods_raw",
+    "list_deployments",
+    "list_custom_resources",
+    "get_pods",
+    "wait_for_ready",
+    "deployer",
+)
+
+KUBECONFIG = """
+apiVersion: v1
+kind: Config
+clusters:
+- name: standin
+  cluster:
+    server: {server}
+contexts:
+- name: standin
+  context:
+    cluster: standin
+    user: standin
+current-context: standin
+users:
+- name: standin
+  user:
+    token: benchmark
+"""
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(
+    scenario: str,
+    size: int,
+    latencies: List[float],
+    seconds: float,
+    objects: int,
+) -> Dict[str, Any]:
+    return {
+        "scenario": scenario,
+        "size": size,
+        "operations": len(latencies),
+        "objects": objects,
+        "seconds": round(seconds, 4),
+        "operations_per_second": round(len(latencies) / seconds, 2),
+        "objects_per_second": round(objects / seconds, 2),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def repeat(operation: Callable[[], int], min_seconds: float, min_runs: int = 3):
+    """
+    Run an operation until both min_runs and min_seconds are reached and
+    return its latencies, the total time and the objects it returned.
+    """
+    latencies = []
+    objects = 0
+    start = time.perf_counter()
+    while len(latencies) < min_runs or time.perf_counter() - start < min_seconds:
+        before = time.perf_counter()
+        objects += operation()
+        latencies.append(time.perf_counter() - before)
+
+    return latencies, time.perf_counter() - start, objects
+
+
+class _LatencySink:
+    """
+    A metrics sink keeping the exact latency of every request.
+    """
+
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+
+    def observe_request(self, labels, code, seconds, response_bytes) -> None:
+        self.latencies.append(seconds)
+
+    def observe_deserialization(self, labels, seconds) -> None:
+        pass
+
+
+def run_scenario(
+    scenario: str,
+    size: int,
+    kubeconfig: Path,
+    min_seconds: float,
+    bundle_size: int,
+) -> List[Dict[str, Any]]:
+    sink = _LatencySink()
+    client = KubernetesApiClient(
+        config_file_path=kubeconfig, pool_maxsize=16, metrics=sink
+    )
+
+    if scenario.startswith("list_"):
+        raw = scenario == "list_pods_raw"
+        if scenario in ("list_pods", "list_pods_raw"):
+            api = resources_apis.Pod(client)
+        elif scenario == "list_deployments":
+            api = resources_apis.Deployment(client)
+        else:
+            api = resources_apis.CustomResource(
+                client, "bench.kubeclient.io", "v1", "widgets"
+            )
+
+        def list_objects() -> int:
+            objects = api.list(NAMESPACE, raw=raw)
+            items = objects["items"] if isinstance(objects, dict) else objects.items
+            return len(items)
+
+        return [summarize(scenario, size, *repeat(list_objects, min_seconds))]
+
+    if scenario in ("get_pods", "wait_for_ready"):
+        pod_api = resources_apis.Pod(client)
+        names = [f"pod-{index:06d}" for index in range(size)]
+
+        def get_pod() -> int:
+            return int(pod_api.get(NAMESPACE, random.choice(names)) is not None)
+
+        def wait_for_pod() -> int:
+            return int(
+                pod_api.wait_for_ready(NAMESPACE, random.choice(names), 10, 0.01)
+            )
+
+        operation = get_pod if scenario == "get_pods" else wait_for_pod
+        return [summarize(scenario, size, *repeat(operation, min_seconds, 20))]
+
+    if scenario == "deployer":
+        with tempfile.TemporaryDirectory() as directory:
+            bundle = Path(directory) / "bundle.yaml"
+            with bundle.open("w") as stream:
+                yaml.safe_dump_all(manifest(NAMESPACE, bundle_size), stream)
+
+            deployer = Deployer(client)
+            results = []
+            for name, operation in (
+                ("create_from_yaml", lambda: len(deployer.create_from_yaml(bundle))),
+                ("delete_from_yaml", lambda: len(deployer.delete_from_yaml(bundle))),
+            ):
+                sink.latencies.clear()
+                start = time.perf_counter()
+                objects = operation()
+                seconds = time.perf_counter() - start
+                result = summarize(name, size, sink.latencies, seconds, objects)
+                result["operations_per_second"] = round(
+                    len(sink.latencies) / seconds, 2
+                )
+                results.append(result)
+            return results
+
+    raise ValueError(f"Unknown scenario {scenario}")
+
+
+def _serve(size: int, ready) -> None:
+    server = StandInApiServer()
+    seed(server.cluster, NAMESPACE, size)
+    ready.put(server.url)
+    server.serve_forever()
+
+
+def run(
+    sizes: List[int],
+    scenarios: List[str],
+    min_seconds: float,
+    bundle_size: Optional[int],
+) -> Dict[str, Any]:
+    results = []
+    for size in sizes:
+        ready = multiprocessing.Queue()
+        server = multiprocessing.Process(target=_serve, args=(size, ready), daemon=True)
+        server.start()
+        try:
+            url = ready.get(timeout=600)
+            with tempfile.NamedTemporaryFile("w", suffix=".yaml") as kubeconfig:
+                kubeconfig.write(KUBECONFIG.format(server=url))
+                kubeconfig.flush()
+                for scenario in scenarios:
+                    print(f"Running {scenario} with {size} objects", file=sys.stderr)
+                    output = subprocess.run(
+                        [
+                            sys.executable,
+                            "-m",
+                            "benchmarks.run",
+                            "--worker",
+                            scenario,
+                            "--sizes",
+                            str(size),
+                            "--kubeconfig",
+                            kubeconfig.name,
+                            "--min-seconds",
+                            str(min_seconds),
+                            "--bundle-size",
+                            str(bundle_size or max(1, size // 10)),
+                        ],
+                        check=True,
+                        stdout=subprocess.PIPE,
+                        cwd=Path(__file__).resolve().parent.parent,
+                    ).stdout
+                    results.extend(json.loads(output))
+        finally:
+            server.terminate()
+            server.join()
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """
+    Return the regressions of a run against a baseline: a p50 or p99
+    latency, or a peak RSS, higher than the baseline by more than the
+    tolerance, or a throughput lower by more than the tolerance.
+    """
+    previous = {(r["scenario"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        before = previous.get((result["scenario"], result["size"]))
+        if before is None:
+            continue
+        for metric in ("p50_ms", "p99_ms", "peak_rss_mb"):
+            if result[metric] > before[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{result['scenario']}[{result['size']}] {metric}: "
+                    f"{before[metric]} -> {result[metric]}"
+                )
+        metric = "objects_per_second"
+        if result[metric] < before[metric] * (1 - tolerance):
+            regressions.append(
+                f"{result['scenario']}[{result['size']}] {metric}: "
+                f"{before[metric]} -> {result[metric]}"
+            )
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--min-seconds", type=float, default=2.0)
+    parser.add_argument(
+        "--bundle-size",
+        type=int,
+        help="The deployments in the Deployer bundle, a tenth of the size by default",
+    )
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--kubeconfig", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    if args.worker:
+        results = run_scenario(
+            args.worker, sizes[0], args.kubeconfig, args.min_seconds, args.bundle_size
+        )
+        print(json.dumps(results))
+        return 0
+
+    report = run(sizes, args.scenarios.split(","), args.min_seconds, args.bundle_size)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        regressions = compare(
+            report, json.loads(args.baseline.read_text()), args.tolerance
+        )
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+"""
+A local HTTP stand-in for the Kubernetes API, serving the objects of a
+kubeclient.fake.FakeCluster over the network, so benchmarks measure the
+whole client including its connections.
+"""
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from kubeclient._raw import _dumps
+from kubeclient.fake import FakeCluster
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    cluster: FakeCluster
+
+    def setup(self) -> None:
+        super().setup()
+        # Headers and body are written separately, so without TCP_NODELAY
+        # every response waits for the delayed ACK of the client.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _serve(self) -> None:
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        status, payload = self.cluster.handle(
+            self.command,
+            url.path,
+            dict(parse_qsl(url.query)),
+            body,
+            self.headers.get("Content-Type"),
+        )
+        data = _dumps(payload)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _serve
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class StandInApiServer:
+    """
+    Serve a FakeCluster over HTTP on a local port from a daemon thread.
+    Watches are not served.
+    """
+
+    def __init__(self, cluster: Optional[FakeCluster] = None, port: int = 0) -> None:
+        self.cluster = cluster or FakeCluster()
+        handler = type("Handler", (_Handler,), {"cluster": self.cluster})
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self._server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> "StandInApiServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def seed(cluster: FakeCluster, namespace: str, size: int) -> None:
+    """
+    Fill a cluster with size synthetic pods, deployments and custom resources.
+    """
+    cluster.add("", "namespaces", _namespace(namespace))
+    cluster.add(
+        "apiextensions.k8s.io",
+        "customresourcedefinitions",
+        {
+            "apiVersion": "apiextensions.k8s.io/v1",
+            "kind": "CustomResourceDefinition",
+            "metadata": {"name": "widgets.bench.kubeclient.io"},
+            "spec": {
+                "group": "bench.kubeclient.io",
+                "names": {"kind": "Widget", "plural": "widgets"},
+                "scope": "Namespaced",
+            },
+            "status": {"conditions": [{"type": "Established", "status": "True"}]},
+        },
+    )
+    for index in range(size):
+        cluster.add("", "pods", synthetic_pod(namespace, index))
+        cluster.add("apps", "deployments", synthetic_deployment(namespace, index))
+        cluster.add(
+            "bench.kubeclient.io", "widgets", synthetic_widget(namespace, index)
+        )
+
+
+def _namespace(name: str) -> Dict[str, Any]:
+    return {
+        "apiVersion": "v1",
+        "kind": "Namespace",
+        "metadata": {"name": name},
+        "status": {"phase": "Active"},
+    }
+
+
+def _labels(index: int) -> Dict[str, str]:
+    return {
+        "app": f"app-{index % 50}",
+        "tier": ("frontend", "backend", "cache")[index % 3],
+        "pod-template-hash": f"{index % 97:08x}",
+    }
+
+
+def synthetic_pod(namespace: str, index: int) -> Dict[str, Any]:
+    name = f"pod-{index:06d}"
+    return {
+        "apiVersion": "v1",
+        "kind": "Pod",
+        "metadata": {
+            "name": name,
+            "namespace": namespace,
+            "labels": _labels(index),
+            "annotations": {"kubeclient.io/benchmark": "true"},
+            "ownerReferences": [
+                {
+                    "apiVersion": "apps/v1",
+                    "kind": "ReplicaSet",
+                    "name": f"app-{index % 50}-{index % 97:08x}",
+                    "uid": f"00000000-0000-0000-0000-{index % 50:012d}",
+                    "controller": True,
+                }
+            ],
+        },
+        "spec": {
+            "nodeName": f"node-{index % 20}",
+            "serviceAccountName": "default",
+            "containers": [
+                {
+                    "name": "app",
+                    "image": f"registry.example.com/app-{index % 50}:1.{index % 7}",
+                    "ports": [{"containerPort": 8080, "protocol": "TCP"}],
+                    "resources": {
+                        "requests": {"cpu": "100m", "memory": "128Mi"},
+                        "limits": {"cpu": "500m", "memory": "256Mi"},
+                    },
+                    "env": [{"name": "INDEX", "value": str(index)}],
+                },
+                {"name": "proxy", "image": "registry.example.com/envoy:1.28"},
+            ],
+        },
+        "status": {
+            "phase": "Running",
+            "podIP": f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}",
+            "hostIP": f"192.168.0.{index % 20}",
+            "conditions": [
+                {"type": "Ready", "status": "True"},
+                {"type": "ContainersReady", "status": "True"},
+            ],
+            "containerStatuses": [
+                {
+                    "name": "app",
+                    "image": f"registry.example.com/app-{index % 50}:1.{index % 7}",
+                    "imageID": f"registry.example.com/app@sha256:{index % 50:064x}",
+                    "ready": True,
+                    "restartCount": 0,
+                },
+                {
+                    "name": "proxy",
+                    "image": "registry.example.com/envoy:1.28",
+                    "imageID": f"registry.example.com/envoy@sha256:{0:064x}",
+                    "ready": True,
+                    "restartCount": 0,
+                },
+            ],
+        },
+    }
+
+
+def synthetic_deployment(namespace: str, index: int) -> Dict[str, Any]:
+    labels = _labels(index)
+    return {
+        "apiVersion": "apps/v1",
+        "kind": "Deployment",
+        "metadata": {
+            "name": f"deployment-{index:06d}",
+            "namespace": namespace,
+            "labels": labels,
+        },
+        "spec": {
+            "replicas": 2,
+            "selector": {"matchLabels": {"app": labels["app"]}},
+            "template": {
+                "metadata": {"labels": labels},
+                "spec": {
+                    "containers": [
+                        {"name": "app", "image": f"registry.example.com/app:{index}"}
+                    ]
+                },
+            },
+        },
+        "status": {"replicas": 2, "readyReplicas": 2, "availableReplicas": 2},
+    }
+
+
+def synthetic_widget(namespace: str, index: int) -> Dict[str, Any]:
+    return {
+        "apiVersion": "bench.kubeclient.io/v1",
+        "kind": "Widget",
+        "metadata": {
+            "name": f"widget-{index:06d}",
+            "namespace": namespace,
+            "labels": _labels(index),
+        },
+        "spec": {"size": index % 10, "color": ("red", "green", "blue")[index % 3]},
+    }
+
+
+def manifest(namespace: str, size: int) -> Iterable[Dict[str, Any]]:
+    """
+    Yield the documents of a bundle of size deployments and services, plus
+    a CustomResourceDefinition and size custom resources.
+    """
+    yield {
+        "apiVersion": "apiextensions.k8s.io/v1",
+        "kind": "CustomResourceDefinition",
+        "metadata": {"name": "gadgets.bench.kubeclient.io"},
+        "spec": {
+            "group": "bench.kubeclient.io",
+            "names": {"kind": "Gadget", "plural": "gadgets"},
+            "scope": "Namespaced",
+            "versions": [{"name": "v1", "served": True, "storage": True}],
+        },
+    }
+    for index in range(size):
+        deployment = synthetic_deployment(namespace, index)
+        deployment["metadata"]["name"] = f"bundle-{index:06d}"
+        del deployment["status"]
+        yield deployment
+        yield {
+            "apiVersion": "v1",
+            "kind": "Service",
+            "metadata": {"name": f"bundle-{index:06d}", "namespace": namespace},
+            "spec": {"selector": {"app": f"app-{index % 50}"}, "ports": [{"port": 80}]},
+        }
+        yield {
+            "apiVersion": "bench.kubeclient.io/v1",
+            "kind": "Gadget",
+            "metadata": {"name": f"bundle-{index:06d}", "namespace": namespace},
+            "spec": {"size": index % 10},
+        }
@@ -1,2 +1,23 @@
-from .client import KubernetesApiClient  # noqa: F401
-from .deployer import Deployer  # noqa: F401
+from typing import TYPE_CHECKING
+
+from ._lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from . import metrics, resources_apis  # noqa: F401
+    from .client import KubernetesApiClient  # noqa: F401
+    from .cluster_set import ClusterSet  # noqa: F401
+    from .deployer import Deployer  # noqa: F401
+
+# Importing kubeclient does not load the Kubernetes client and its hundreds of
+# generated models until one of these is used.
+__getattr__, __dir__ = lazy_attributes(
+    globals(),
+    {
+        "KubernetesApiClient": ".client",
+        "Deployer": ".deployer",
+        "ClusterSet": ".cluster_set",
+        "metrics": ".metrics",
+        "resources_apis": ".resources_apis",
+    },
+)
+__all__ = ["KubernetesApiClient", "Deployer", "ClusterSet"]
@@ -0,0 +1,18 @@
+from contextlib import contextmanager
+
+from kubernetes.client import ApiClient
+
+from ._headers import override_header
+
+APPLY_PATCH_CONTENT_TYPE = "application/apply-patch+yaml"
+DEFAULT_FIELD_MANAGER = "kubeclient"
+
+
+@contextmanager
+def server_side_apply(api_client: ApiClient):
+    """
+    Send the patch requests made by the current thread on an ApiClient as
+    server-side apply (application/apply-patch+yaml) patches.
+    """
+    with override_header(api_client, "Content-Type", APPLY_PATCH_CONTENT_TYPE):
+        yield
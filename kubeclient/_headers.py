@@ -0,0 +1,65 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+from kubernetes.client import ApiClient
+
+# The generated API methods pick their Accept and Content-Type headers
+# themselves and take no header arguments, so the choice is overridden per
+# thread on the ApiClient for the duration of a request. The overrides are
+# keyed by the id of their ApiClient, so the other clients used by the thread
+# keep their headers.
+_overrides = threading.local()
+_hook_lock = threading.Lock()
+
+_SELECTORS = {
+    "Accept": "select_header_accept",
+    "Content-Type": "select_header_content_type",
+}
+
+
+def _install_hook(api_client: ApiClient, header: str) -> None:
+    selector_name = _SELECTORS[header]
+    with _hook_lock:
+        hooks = api_client.__dict__.setdefault("_header_hooks", set())
+        if header in hooks:
+            return
+
+        select_header = getattr(api_client, selector_name)
+        key = (id(api_client), header)
+
+        def select(values):
+            override = _thread_overrides().get(key)
+            if override is not None:
+                return override
+            return select_header(values)
+
+        setattr(api_client, selector_name, select)
+        hooks.add(header)
+
+
+def _thread_overrides() -> Dict[Tuple[int, str], str]:
+    overrides = getattr(_overrides, "headers", None)
+    if overrides is None:
+        overrides = _overrides.headers = {}
+    return overrides
+
+
+@contextmanager
+def override_header(api_client: ApiClient, header: str, value: str):
+    """
+    Send the requests made by the current thread on an ApiClient with the
+    given Accept or Content-Type header.
+    """
+    _install_hook(api_client, header)
+    overrides = _thread_overrides()
+    key = (id(api_client), header)
+    previous = overrides.get(key)
+    overrides[key] = value
+    try:
+        yield
+    finally:
+        if previous is None:
+            del overrides[key]
+        else:
+            overrides[key] = previous
@@ -0,0 +1,28 @@
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_attributes(
+    namespace: Dict[str, Any], attributes: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Return the module __getattr__ and __dir__ of a package whose public
+    attributes are imported from their module on first access, given by
+    relative module name. An attribute named like its module is the module.
+    """
+    package = namespace["__name__"]
+
+    def __getattr__(name: str) -> Any:
+        module_name = attributes.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        module = importlib.import_module(module_name, package)
+        value = module if module_name == f".{name}" else getattr(module, name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(attributes))
+
+    return __getattr__, __dir__
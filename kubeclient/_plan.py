@@ -0,0 +1,207 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from kubernetes import client
+from kubernetes.client import ApiClient, CustomObjectsApi
+
+# Kinds are created layer by layer, in the spirit of Helm's install order:
+# objects in a layer only depend on objects from the layers before it.
+# Kinds that are not listed, custom resources included, go in a last layer.
+LAYERS = [
+    {
+        "Namespace",
+        "CustomResourceDefinition",
+        "PriorityClass",
+        "StorageClass",
+    },
+    {
+        "ServiceAccount",
+        "Secret",
+        "ConfigMap",
+        "Role",
+        "ClusterRole",
+        "RoleBinding",
+        "ClusterRoleBinding",
+        "ResourceQuota",
+        "LimitRange",
+        "NetworkPolicy",
+        "PersistentVolume",
+        "PersistentVolumeClaim",
+        "PodDisruptionBudget",
+        "Service",
+        "IngressClass",
+    },
+    {
+        "Pod",
+        "ReplicationController",
+        "ReplicaSet",
+        "Deployment",
+        "StatefulSet",
+        "DaemonSet",
+        "Job",
+        "CronJob",
+        "HorizontalPodAutoscaler",
+        "Ingress",
+    },
+]
+
+_UPPER_FOLLOWED_BY_LOWER_RE = re.compile("(.)([A-Z][a-z]+)")
+_LOWER_OR_NUM_FOLLOWED_BY_UPPER_RE = re.compile("([a-z0-9])([A-Z])")
+
+
+def flatten(documents: Iterable[Optional[dict]]) -> List[dict]:
+    """
+    Drop empty documents and expand the items of List kinds.
+    """
+    objects = []
+    for document in documents:
+        if not document:
+            continue
+        if document.get("kind", "").endswith("List") and "items" in document:
+            objects.extend(flatten(document["items"]))
+            continue
+        objects.append(document)
+
+    return objects
+
+
+def layer_of(obj: dict) -> int:
+    for index, kinds in enumerate(LAYERS):
+        if obj.get("kind") in kinds:
+            return index
+
+    return len(LAYERS)
+
+
+def plan_layers(documents: Iterable[Optional[dict]]) -> List[List[dict]]:
+    """
+    Sort manifests into dependency layers, keeping the file order inside a
+    layer. Empty layers are dropped.
+    """
+    layers = [[] for _ in range(len(LAYERS) + 1)]
+    for obj in flatten(documents):
+        layers[layer_of(obj)].append(obj)
+
+    return [layer for layer in layers if layer]
+
+
+def split_api_version(api_version: str) -> Tuple[str, str]:
+    group, _, version = api_version.partition("/")
+    if not version:
+        return "", group
+
+    return group, version
+
+
+def snake_case_kind(kind: str) -> str:
+    kind = _UPPER_FOLLOWED_BY_LOWER_RE.sub(r"\1_\2", kind)
+    return _LOWER_OR_NUM_FOLLOWED_BY_UPPER_RE.sub(r"\1_\2", kind).lower()
+
+
+def typed_api(api_client: ApiClient, api_version: str):
+    """
+    Return the generated API class instance serving an apiVersion, or None
+    when there is none, which is the case of custom resources.
+    """
+    group, version = split_api_version(api_version)
+    group = "".join(group.rsplit(".k8s.io", 1)) or "core"
+    group = "".join(word.capitalize() for word in group.split("."))
+    api_type = getattr(client, f"{group}{version.capitalize()}Api", None)
+    if api_type is None:
+        return None
+
+    return api_type(api_client)
+
+
+def guess_plural(kind: str) -> str:
+    """
+    Guess the resource name of a kind the way kubectl does when discovery
+    is not available.
+    """
+    plural = kind.lower()
+    if plural.endswith("s"):
+        return plural + "es"
+    if plural.endswith("y"):
+        return plural[:-1] + "ies"
+
+    return plural + "s"
+
+
+class CustomResourceDefinitions:
+    """
+    The CustomResourceDefinitions found in a set of manifests, used to find
+    the plural and scope of their custom resources.
+    """
+
+    def __init__(self, objects: Iterable[dict]) -> None:
+        self._definitions: Dict[Tuple[str, str], dict] = {}
+        for obj in objects:
+            if obj.get("kind") != "CustomResourceDefinition":
+                continue
+            spec = obj.get("spec", {})
+            self._definitions[(spec.get("group"), spec["names"]["kind"])] = obj
+
+    def find(self, obj: dict) -> Optional[dict]:
+        group, _ = split_api_version(obj.get("apiVersion", ""))
+        return self._definitions.get((group, obj.get("kind")))
+
+    def plural(self, obj: dict) -> str:
+        definition = self.find(obj)
+        if definition is None:
+            return guess_plural(obj["kind"])
+
+        return definition["spec"]["names"]["plural"]
+
+    def is_namespaced(self, obj: dict) -> bool:
+        definition = self.find(obj)
+        if definition is None:
+            return True
+
+        return definition["spec"].get("scope", "Namespaced") == "Namespaced"
+
+    def required_by(self, objects: Iterable[dict]) -> List[str]:
+        """
+        Return the names of the definitions the given objects are instances of.
+        """
+        names = []
+        for obj in objects:
+            definition = self.find(obj)
+            if definition is not None and definition["metadata"]["name"] not in names:
+                names.append(definition["metadata"]["name"])
+
+        return names
+
+
+def object_namespace(obj: dict, namespace: Optional[str]) -> Optional[str]:
+    return obj.get("metadata", {}).get("namespace", namespace)
+
+
+def call_for_object(
+    api_client: ApiClient,
+    verb: str,
+    obj: dict,
+    namespace: Optional[str],
+    definitions: CustomResourceDefinitions,
+    **kwargs,
+):
+    """
+    Call the API method of a verb (read, create, patch, delete...) for the
+    kind of a manifest object. Kinds without a generated API are treated as
+    custom resources and go through CustomObjectsApi.
+    """
+    namespace = object_namespace(obj, namespace)
+    api = typed_api(api_client, obj["apiVersion"])
+    if api is None:
+        group, version = split_api_version(obj["apiVersion"])
+        kwargs.update(group=group, version=version, plural=definitions.plural(obj))
+        verb = "get" if verb == "read" else verb
+        custom_objects = CustomObjectsApi(api_client)
+        if definitions.is_namespaced(obj):
+            method = getattr(custom_objects, f"{verb}_namespaced_custom_object")
+            return method(namespace=namespace, **kwargs)
+        return getattr(custom_objects, f"{verb}_cluster_custom_object")(**kwargs)
+
+    kind = snake_case_kind(obj["kind"])
+    if hasattr(api, f"{verb}_namespaced_{kind}"):
+        return getattr(api, f"{verb}_namespaced_{kind}")(namespace=namespace, **kwargs)
+    return getattr(api, f"{verb}_{kind}")(**kwargs)
@@ -0,0 +1,106 @@
+import inspect
+import json
+from typing import Any, Dict, Optional
+
+from kubernetes.client import models
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:  # orjson is an optional speedup
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
+RAW_REQUEST_OPTIONS = {"_preload_content": False}
+
+_attribute_names: Optional[Dict[str, str]] = None
+
+
+def json_key(attribute: str) -> str:
+    """
+    Map a snake_case model attribute to its JSON key, using the attribute
+    maps of the generated models so acronyms such as podIP are kept.
+    """
+    global _attribute_names
+    if _attribute_names is None:
+        names = {}
+        for _, model in inspect.getmembers(models, inspect.isclass):
+            for name, key in getattr(model, "attribute_map", {}).items():
+                names.setdefault(name, key)
+        _attribute_names = names
+
+    key = _attribute_names.get(attribute)
+    if key is not None:
+        return key
+
+    first, *rest = attribute.lstrip("_").split("_")
+    return first + "".join(word.capitalize() for word in rest)
+
+
+def _wrap(value):
+    if isinstance(value, dict):
+        return RawObject(value)
+    if isinstance(value, list):
+        return [_wrap(item) for item in value]
+
+    return value
+
+
+class RawObject:
+    """
+    A lightweight read-only view over a decoded JSON object.
+    Attributes use the snake_case names of the generated models, so code
+    written for V1* models keeps working, and missing fields read as None.
+    Items use the JSON keys and return the plain decoded values.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self._data = data
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        data = self._data
+        if name in data:
+            return _wrap(data[name])
+
+        return _wrap(data.get(json_key(name)))
+
+    def __getitem__(self, key: str):
+        return self._data[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, RawObject):
+            return self._data == other._data
+        return self._data == other
+
+    def __repr__(self) -> str:
+        return f"RawObject({self._data!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._data
+
+
+def decode(response) -> Optional[RawObject]:
+    """
+    Decode the body of a response requested with _preload_content=False.
+    """
+    if response is None:
+        return None
+
+    try:
+        data = response.data
+    finally:
+        response.release_conn()
+
+    return _wrap(_loads(data))
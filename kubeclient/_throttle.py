@@ -0,0 +1,179 @@
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from kubernetes.client import exceptions
+
+_logger = logging.getLogger(__name__)
+
+HTTP_STATUS_TOO_MANY_REQUESTS = 429
+_SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class TokenBucket:
+    """
+    A token bucket rate limiter like the one of client-go: the bucket holds
+    up to burst tokens, refilled at qps tokens per second, and every request
+    takes a token, waiting for one when the bucket is empty.
+    Tokens are reserved in arrival order, so concurrent callers are spread
+    at the sustained rate instead of waking up together.
+    """
+
+    def __init__(self, qps: float, burst: int) -> None:
+        if qps <= 0 or burst < 1:
+            raise ValueError("qps must be positive and burst at least 1")
+
+        self._qps = qps
+        self._burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token and return how long to wait before using it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._burst, self._tokens + (now - self._last) * self._qps
+            )
+            self._last = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._qps
+
+    def acquire(self) -> float:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+        return delay
+
+
+def retry_after(error: exceptions.ApiException) -> Optional[float]:
+    """
+    Return the delay in seconds asked by the Retry-After header of an error,
+    given either in seconds or as an HTTP date.
+    """
+    value = (error.headers or {}).get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(date.timestamp() - time.time(), 0.0)
+
+
+class RetryPolicy:
+    """
+    Retry the requests rejected with 429 Too Many Requests, which the
+    apiserver's priority and fairness returns before doing any work, and the
+    5xx errors of reads or of responses carrying a Retry-After header.
+    The delay honors Retry-After and otherwise backs off exponentially with
+    jitter.
+    max_retries:Optional: The number of retries of a request.
+    backoff:Optional: The delay in seconds before the first retry.
+    max_backoff:Optional: The cap of the delay, Retry-After included.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: float = 0.2,
+    ) -> None:
+        self.max_retries = max_retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._jitter = jitter
+
+    def is_retryable(self, method: str, error: exceptions.ApiException) -> bool:
+        if error.status == HTTP_STATUS_TOO_MANY_REQUESTS:
+            return True
+        if error.status is not None and 500 <= error.status <= 599:
+            return method.upper() in _SAFE_METHODS or retry_after(error) is not None
+
+        return False
+
+    def delay(self, attempt: int, error: exceptions.ApiException) -> float:
+        delay = retry_after(error)
+        if delay is None:
+            delay = self._backoff * 2**attempt
+            delay *= random.uniform(1 - self._jitter, 1 + self._jitter)
+
+        return min(delay, self._max_backoff)
+
+
+class RequestThrottle:
+    """
+    Rate limit and retry the requests of a REST client, and count what the
+    throttling costs.
+    """
+
+    def __init__(
+        self, limiter: Optional[TokenBucket], retry_policy: RetryPolicy
+    ) -> None:
+        self._limiter = limiter
+        self._retry_policy = retry_policy
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "throttled": 0,
+            "throttled_seconds": 0.0,
+            "retries": 0,
+            "retry_seconds": 0.0,
+            "retries_exhausted": 0,
+        }
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, **increments) -> None:
+        with self._lock:
+            for key, value in increments.items():
+                self._stats[key] += value
+
+    def wrap(self, request: Callable) -> Callable:
+        def throttled_request(method, url, *args, **kwargs):
+            attempt = 0
+            while True:
+                self._count(requests=1)
+                if self._limiter is not None:
+                    waited = self._limiter.acquire()
+                    if waited:
+                        self._count(throttled=1, throttled_seconds=waited)
+                try:
+                    return request(method, url, *args, **kwargs)
+                except exceptions.ApiException as e:
+                    if not self._retry_policy.is_retryable(method, e):
+                        raise
+                    if attempt >= self._retry_policy.max_retries:
+                        self._count(retries_exhausted=1)
+                        _logger.error(
+                            f"{method} {url} failed with {e.status} after {attempt} retries"
+                        )
+                        raise
+
+                    delay = self._retry_policy.delay(attempt, e)
+                    attempt += 1
+                    self._count(retries=1, retry_seconds=delay)
+                    _logger.warning(
+                        f"{method} {url} failed with {e.status}, retry {attempt}/"
+                        f"{self._retry_policy.max_retries} in {delay:.2f}s"
+                    )
+                    time.sleep(delay)
+
+        return throttled_request
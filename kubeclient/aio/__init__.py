@@ -0,0 +1,2 @@
+from . import resources_apis  # noqa: F401
+from .client import AsyncKubernetesApiClient  # noqa: F401
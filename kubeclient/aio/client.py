@@ -0,0 +1,73 @@
+import logging
+from pathlib import Path
+from typing import Optional
+
+from kubernetes_asyncio import client, config
+
+_logger = logging.getLogger(__name__)
+
+
+class AsyncKubernetesApiClient:
+    """
+    A class to manage the asyncio Kubernetes API client.
+    Every resource API built on one instance shares its aiohttp connection pool.
+    """
+
+    _api_client: Optional[client.ApiClient] = None
+    _config_file_path: Optional[Path] = None
+
+    def __init__(
+        self,
+        config_file_path: Optional[Path] = None,
+        connection_pool_maxsize: int = 100,
+    ):
+        self._config_file_path = config_file_path
+        self._configuration = client.Configuration()
+        self._configuration.connection_pool_maxsize = connection_pool_maxsize
+
+    @classmethod
+    async def create(
+        cls, config_file_path: Optional[Path] = None, **kwargs
+    ) -> "AsyncKubernetesApiClient":
+        return await cls(config_file_path, **kwargs).load()
+
+    async def load(self) -> "AsyncKubernetesApiClient":
+        await self._load_config()
+        self._api_client = client.ApiClient(configuration=self._configuration)
+        return self
+
+    async def _load_config(self) -> None:
+        if self._config_file_path is not None:
+            _logger.info(
+                f"Loading Kubernetes configuration from {self._config_file_path}"
+            )
+            await config.load_kube_config(
+                config_file=str(self._config_file_path),
+                client_configuration=self._configuration,
+            )
+            return None
+
+        _logger.info("Loading Kubernetes configuration from default location")
+        await config.load_kube_config(client_configuration=self._configuration)
+
+    async def __aenter__(self) -> "AsyncKubernetesApiClient":
+        if self._api_client is None:
+            await self.load()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    @property
+    def api_client(self) -> client.ApiClient:
+        if self._api_client is None:
+            raise RuntimeError("AsyncKubernetesApiClient is not loaded")
+        return self._api_client
+
+    @property
+    def get_config(self) -> client.Configuration:
+        return self._configuration
+
+    async def close(self) -> None:
+        if self._api_client is not None:
+            await self._api_client.close()
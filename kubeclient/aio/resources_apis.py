@@ -0,0 +1,371 @@
+import logging
+import math
+import time
+from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+
+from kubernetes_asyncio import utils, watch
+from kubernetes_asyncio.client import (
+    AppsV1Api,
+    CoreV1Api,
+    CustomObjectsApi,
+    RbacAuthorizationV1Api,
+    exceptions,
+)
+
+from .. import resources_apis
+from ..resources_apis._condition import Condition
+from ..resources_apis._informer import HTTP_STATUS_GONE
+from ..resources_apis._objects import list_items, list_resource_version
+from .client import AsyncKubernetesApiClient
+
+T = TypeVar("T")
+
+
+class AsyncResourceApi(Generic[T]):
+    """
+    The asyncio twin of ResourceApi for namespaced resources.
+    The generated API methods follow the {verb}_namespaced_{resource} naming,
+    so subclasses only declare the resource name and readiness predicate.
+    """
+
+    api_client_type: Type[T] = None
+    api_client: T
+    resource: str = None
+    _read_verb = "read"
+    _logger = logging.getLogger(__name__)
+
+    def __init__(self, kubeclient: AsyncKubernetesApiClient):
+        if not getattr(self, "api_client_type", None):
+            raise AttributeError("api_client_type must be set")
+        self.api_client = self.api_client_type(kubeclient.api_client)
+
+    def _method(self, verb: str):
+        return getattr(self.api_client, f"{verb}_namespaced_{self.resource}")
+
+    def _scope(self, namespace: Optional[str]) -> Dict[str, Any]:
+        return {"namespace": namespace}
+
+    def _describe(self, namespace: Optional[str], name: Optional[str] = None) -> str:
+        description = self.resource.replace("_", "")
+        if name is not None:
+            description = f"{description} {name}"
+        return f"{description} in namespace {namespace}"
+
+    async def _call(self, verb: str, action: str, description: str, **kwargs):
+        result = None
+        try:
+            result = await self._method(verb)(**kwargs)
+        except exceptions.ApiException as e:
+            self._logger.error(f"Failed to {action} {description}: {e}")
+
+        return result
+
+    def _is_object_ready(self, obj) -> bool:
+        raise NotImplementedError
+
+    async def get(self, namespace: str, name: str):
+        return await self._read(namespace, name)
+
+    async def _read(self, namespace: Optional[str], name: str):
+        # Takes a namespace whatever the scope, unlike the get of the
+        # cluster scoped subclasses, so the shared helpers read through it.
+        return await self._call(
+            self._read_verb,
+            "get",
+            self._describe(namespace, name),
+            name=name,
+            **self._scope(namespace),
+        )
+
+    async def list(self, namespace: str, **kwargs):
+        return await self._call(
+            "list",
+            "list",
+            self._describe(namespace),
+            **self._scope(namespace),
+            **kwargs,
+        )
+
+    async def create(self, namespace: str, body):
+        return await self._call(
+            "create",
+            "create",
+            self._describe(namespace),
+            body=body,
+            **self._scope(namespace),
+        )
+
+    async def create_from_yaml(
+        self, namespace: str, yaml_file_path: str
+    ) -> Optional[List]:
+        created = None
+        try:
+            created = await utils.create_from_yaml(
+                self.api_client.api_client, str(yaml_file_path), namespace=namespace
+            )
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to create {self._describe(namespace)} from yaml: {e}"
+            )
+
+        return created
+
+    async def delete(self, namespace: str, name: str):
+        return await self._call(
+            "delete",
+            "delete",
+            self._describe(namespace, name),
+            name=name,
+            **self._scope(namespace),
+        )
+
+    async def patch(self, namespace: str, name: str, body):
+        return await self._call(
+            "patch",
+            "patch",
+            self._describe(namespace, name),
+            name=name,
+            body=body,
+            **self._scope(namespace),
+        )
+
+    async def update(self, namespace: str, name: str, body):
+        return await self._call(
+            "replace",
+            "update",
+            self._describe(namespace, name),
+            name=name,
+            body=body,
+            **self._scope(namespace),
+        )
+
+    async def is_ready(self, namespace: str, name: str) -> bool:
+        obj = await self._read(namespace, name)
+        if obj is None:
+            return False
+
+        return self._is_object_ready(obj)
+
+    async def wait_for_ready(
+        self,
+        namespace: str,
+        name: str,
+        timeout: Optional[int],
+        interval: Optional[float],
+        use_watch: bool = False,
+    ) -> bool:
+        if use_watch:
+            return await self.watch_for_ready(namespace, name, timeout)
+
+        return await self.wait_for_condition(
+            Condition(
+                name=f"{self.__class__.__name__} {name} in namespace {namespace} to be ready",
+                fn=lambda: self.is_ready(namespace, name),
+                timeout=timeout,
+                interval=interval,
+            )
+        )
+
+    async def watch_for_ready(
+        self, namespace: str, name: str, timeout: Optional[int]
+    ) -> bool:
+        """
+        Wait for the resource to be ready using a watch instead of polling,
+        like ResourceApi.watch_for_ready.
+        timeout:Optional: The timeout in seconds, None to wait forever.
+        """
+        description = (
+            f"{self.__class__.__name__} {name} in namespace {namespace} to be ready"
+        )
+        self._logger.info(f"Watching for {description}")
+
+        func = self._method("list")
+        kwargs = dict(self._scope(namespace), field_selector=f"metadata.name={name}")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        resource_version = None
+        while True:
+            if resource_version is None:
+                try:
+                    objects = await func(**kwargs)
+                except exceptions.ApiException as e:
+                    self._logger.error(
+                        f"Failed to list while watching for {description}: {e}"
+                    )
+                    return False
+
+                if any(self._is_object_ready(obj) for obj in list_items(objects)):
+                    return True
+                resource_version = list_resource_version(objects)
+
+            watch_kwargs = dict(kwargs, resource_version=resource_version)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._logger.error(f"Timeout watching for {description}")
+                    return False
+                # The apiserver takes whole seconds, the deadline is also
+                # checked on every event.
+                watch_kwargs["timeout_seconds"] = math.ceil(remaining)
+
+            try:
+                async with watch.Watch() as stream:
+                    async for event in stream.stream(func, **watch_kwargs):
+                        if event["type"] in ("ADDED", "MODIFIED") and (
+                            self._is_object_ready(event["object"])
+                        ):
+                            return True
+                        if deadline is not None and time.monotonic() >= deadline:
+                            break
+                    resource_version = stream.resource_version or resource_version
+            except exceptions.ApiException as e:
+                if e.status != HTTP_STATUS_GONE:
+                    self._logger.error(f"Failed to watch for {description}: {e}")
+                    return False
+                resource_version = None
+
+    async def wait_for_condition(self, condition: Condition) -> bool:
+        self._logger.info(f"Waiting for {condition._name}")
+        return await condition.wait_async()
+
+
+class AsyncClusterResourceApi(AsyncResourceApi[T]):
+    """
+    The asyncio twin of the cluster scoped resource APIs, whose methods take
+    no namespace.
+    """
+
+    def _method(self, verb: str):
+        return getattr(self.api_client, f"{verb}_{self.resource}")
+
+    def _scope(self, namespace: Optional[str]) -> Dict[str, Any]:
+        return {}
+
+    def _describe(self, namespace: Optional[str], name: Optional[str] = None) -> str:
+        description = self.resource.replace("_", "")
+        if name is not None:
+            description = f"{description} {name}"
+        return description
+
+    async def get(self, name: str):
+        return await super().get(None, name)
+
+    async def list(self, **kwargs):
+        return await super().list(None, **kwargs)
+
+    async def create(self, body):
+        return await super().create(None, body)
+
+    async def create_from_yaml(self, yaml_file_path: str) -> Optional[List]:
+        return await super().create_from_yaml(None, yaml_file_path)
+
+    async def delete(self, name: str):
+        return await super().delete(None, name)
+
+    async def patch(self, name: str, body):
+        return await super().patch(None, name, body)
+
+    async def update(self, name: str, body):
+        return await super().update(None, name, body)
+
+    async def is_ready(self, name: str) -> bool:
+        return await super().is_ready(None, name)
+
+    async def wait_for_ready(
+        self,
+        name: str,
+        timeout: Optional[int],
+        interval: Optional[float],
+        use_watch: bool = False,
+    ) -> bool:
+        if use_watch:
+            return await self.watch_for_ready(None, name, timeout)
+
+        return await self.wait_for_condition(
+            Condition(
+                name=f"{self.__class__.__name__} {name} to be ready",
+                fn=lambda: self.is_ready(name),
+                timeout=timeout,
+                interval=interval,
+            )
+        )
+
+
+class Pod(AsyncResourceApi[CoreV1Api]):
+    api_client_type = CoreV1Api
+    resource = "pod"
+    _is_object_ready = resources_apis.Pod._is_object_ready
+
+
+class Service(AsyncResourceApi[CoreV1Api]):
+    api_client_type = CoreV1Api
+    resource = "service"
+    _is_object_ready = resources_apis.Service._is_object_ready
+
+
+class Deployment(AsyncResourceApi[AppsV1Api]):
+    api_client_type = AppsV1Api
+    resource = "deployment"
+    _is_object_ready = resources_apis.Deployment._is_object_ready
+
+
+class StatefulSet(AsyncResourceApi[AppsV1Api]):
+    api_client_type = AppsV1Api
+    resource = "stateful_set"
+    _is_object_ready = resources_apis.StatefulSet._is_object_ready
+
+
+class DaemonSet(AsyncResourceApi[AppsV1Api]):
+    api_client_type = AppsV1Api
+    resource = "daemon_set"
+    _is_object_ready = resources_apis.DaemonSet._is_object_ready
+
+
+class ReplicaSet(AsyncResourceApi[AppsV1Api]):
+    api_client_type = AppsV1Api
+    resource = "replica_set"
+    _is_object_ready = resources_apis.ReplicaSet._is_object_ready
+
+
+class Namespace(AsyncClusterResourceApi[CoreV1Api]):
+    api_client_type = CoreV1Api
+    resource = "namespace"
+    _is_object_ready = resources_apis.Namespace._is_object_ready
+
+
+class ClusterRole(AsyncClusterResourceApi[RbacAuthorizationV1Api]):
+    api_client_type = RbacAuthorizationV1Api
+    resource = "cluster_role"
+    _is_object_ready = resources_apis.ClusterRole._is_object_ready
+
+
+class ClusterRoleBinding(AsyncClusterResourceApi[RbacAuthorizationV1Api]):
+    api_client_type = RbacAuthorizationV1Api
+    resource = "cluster_role_binding"
+    _is_object_ready = resources_apis.ClusterRoleBinding._is_object_ready
+
+
+class CustomResource(AsyncResourceApi[CustomObjectsApi]):
+    api_client_type = CustomObjectsApi
+    resource = "custom_object"
+    _read_verb = "get"
+    _is_object_ready = resources_apis.CustomResource._is_object_ready
+
+    def __init__(
+        self,
+        kubeclient: AsyncKubernetesApiClient,
+        group: str,
+        version: str,
+        plural: str,
+    ):
+        super().__init__(kubeclient)
+        self._group = group
+        self._version = version
+        self._plural = plural
+
+    def _scope(self, namespace: Optional[str]) -> Dict[str, Any]:
+        return {
+            "namespace": namespace,
+            "group": self._group,
+            "version": self._version,
+            "plural": self._plural,
+        }
@@ -1,35 +1,170 @@
 import logging
+import socket
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from kubernetes import client, config
+from kubernetes.client.rest import RESTClientObject
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+from ._throttle import RequestThrottle, RetryPolicy, TokenBucket
+from .metrics import MetricsSink, instrument
+from .registry import ClientRegistry, default_registry
+
+if TYPE_CHECKING:
+    from .fake import FakeCluster
 
 _logger = logging.getLogger(__name__)
 
+# Probe idle connections after 30s, then every 10s, and drop them after 3
+# failed probes, so pooled connections survive idle periods behind NATs and
+# load balancers instead of paying a new TLS handshake.
+_TCP_KEEPALIVE_OPTIONS = (
+    ("TCP_KEEPIDLE", 30),
+    ("TCP_KEEPINTVL", 10),
+    ("TCP_KEEPCNT", 3),
+)
+
+
+def _keepalive_socket_options() -> List[Tuple[int, int, int]]:
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    for name, value in _TCP_KEEPALIVE_OPTIONS:
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+
+    return options
+
 
 class KubernetesApiClient:
     """
     A class to manage the Kubernetes API client.
+    num_pools:Optional: The number of hosts a connection pool is kept for.
+    pool_maxsize:Optional: The number of connections kept per host, which
+        bounds the concurrent requests that can reuse a connection.
+    pool_block:Optional: Wait for a free connection when the pool is busy,
+        instead of opening one that is discarded after the request.
+    tcp_keepalive:Optional: Enable TCP keep-alive on the pooled connections.
+    connect_timeout:Optional: The default connect timeout in seconds.
+    read_timeout:Optional: The default read timeout in seconds, not applied
+        to watches.
+    qps:Optional: The sustained requests per second allowed by the token
+        bucket rate limiter shared by every request of the client, None to
+        disable rate limiting.
+    burst:Optional: The requests allowed above qps in a burst.
+    max_retries:Optional: The retries of requests rejected with 429, or
+        with a 5xx error for reads, honoring Retry-After.
+    metrics:Optional: The sink receiving the latency, size, status and
+        deserialization time of every request, like InMemoryMetrics.
+    backend:Optional: An in-process backend serving the requests instead of
+        an apiserver, like kubeclient.fake.FakeCluster. No configuration is
+        loaded and the connection pool options are ignored.
+    context:Optional: The kubeconfig context, the current context by default.
+    in_cluster:Optional: Use the service account of the pod instead of a
+        kubeconfig.
+    registry:Optional: The registry caching the configurations and their
+        credentials, the process-wide one by default.
     """
 
     _api_client: client.ApiClient
     _config_file_path: Optional[Path] = None
 
-    def __init__(self, config_file_path: Optional[Path] = None):
+    def __init__(
+        self,
+        config_file_path: Optional[Path] = None,
+        num_pools: int = 4,
+        pool_maxsize: Optional[int] = None,
+        pool_block: bool = False,
+        tcp_keepalive: bool = True,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        qps: Optional[float] = None,
+        burst: int = 10,
+        max_retries: int = 3,
+        metrics: Optional[MetricsSink] = None,
+        backend: Optional["FakeCluster"] = None,
+        context: Optional[str] = None,
+        in_cluster: bool = False,
+        registry: Optional[ClientRegistry] = None,
+    ):
         self._config_file_path = config_file_path
-        self._load_config()
-        self._api_client = client.ApiClient()
+        self._context = context
+        self._in_cluster = in_cluster
+        self._registry = registry or default_registry
+        if backend is not None:
+            self._api_client = client.ApiClient(client.Configuration())
+            self._replace_rest_client(backend.transport())
+        else:
+            self._api_client = client.ApiClient(self._load_config())
+            self._configure_pool(num_pools, pool_maxsize, pool_block, tcp_keepalive)
+        if connect_timeout is not None or read_timeout is not None:
+            self._set_default_timeout((connect_timeout, read_timeout))
+        self._metrics = metrics
+        if metrics is not None:
+            instrument(self._api_client, metrics)
+        self._throttle = RequestThrottle(
+            TokenBucket(qps, burst) if qps is not None else None,
+            RetryPolicy(max_retries=max_retries),
+        )
+        rest_client = self._api_client.rest_client
+        rest_client.request = self._throttle.wrap(rest_client.request)
 
-    def _load_config(self) -> None:
-        if self._config_file_path is not None:
+    def _load_config(self) -> client.Configuration:
+        if self._in_cluster:
+            _logger.info("Loading in-cluster Kubernetes configuration")
+        elif self._config_file_path is not None:
             _logger.info(
                 f"Loading Kubernetes configuration from {self._config_file_path}"
             )
-            config.load_kube_config(config_file=self._config_file_path)
-            return None
+        else:
+            _logger.info("Loading Kubernetes configuration from default location")
+
+        return self._registry.configuration(
+            self._config_file_path, self._context, self._in_cluster
+        )
+
+    def _configure_pool(
+        self,
+        num_pools: int,
+        pool_maxsize: Optional[int],
+        pool_block: bool,
+        tcp_keepalive: bool,
+    ) -> None:
+        rest_client = RESTClientObject(
+            self._api_client.configuration, pools_size=num_pools, maxsize=pool_maxsize
+        )
+        pool_kw = rest_client.pool_manager.connection_pool_kw
+        pool_kw["block"] = pool_block
+        # urllib3 retries 429 and 503 responses carrying Retry-After on its
+        # own, invisibly and without a cap on the delay, so those are left to
+        # the RetryPolicy of the client.
+        pool_kw["retries"] = Retry.from_int(self._api_client.configuration.retries).new(
+            respect_retry_after_header=False
+        )
+        if tcp_keepalive:
+            pool_kw["socket_options"] = _keepalive_socket_options()
+        self._replace_rest_client(rest_client)
+
+    def _replace_rest_client(self, rest_client) -> None:
+        # The ApiClient built its own pool manager, closed so its connections
+        # are not left open.
+        self._api_client.rest_client.pool_manager.clear()
+        self._api_client.rest_client = rest_client
 
-        _logger.info("Loading Kubernetes configuration from default location")
-        config.load_kube_config()
+    def _set_default_timeout(
+        self, timeout: Tuple[Optional[float], Optional[float]]
+    ) -> None:
+        rest_client = self._api_client.rest_client
+        request = rest_client.request
+
+        def request_with_timeout(method, url, query_params=None, *args, **kwargs):
+            is_watch = any(key == "watch" for key, _ in query_params or ())
+            if not is_watch and kwargs.get("_request_timeout") is None:
+                kwargs["_request_timeout"] = timeout
+            return request(method, url, query_params, *args, **kwargs)
+
+        rest_client.request = request_with_timeout
 
     @property
     def api_client(self) -> client.ApiClient:
@@ -39,5 +174,42 @@ class KubernetesApiClient:
     def get_config(self) -> config:
         return self._api_client.configuration
 
+    def pool_stats(self) -> Dict[str, int]:
+        """
+        Return the connection pool usage: requests served, connections opened
+        (misses) and requests that reused a pooled connection (hits).
+        """
+        pool_manager = self._api_client.rest_client.pool_manager
+        if pool_manager is None:
+            return {"pools": 0, "requests": 0, "hits": 0, "misses": 0}
+
+        pools = pool_manager.pools
+        requests = connections = 0
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests += pool.num_requests
+            connections += pool.num_connections
+
+        return {
+            "pools": len(pools),
+            "requests": requests,
+            "hits": max(requests - connections, 0),
+            "misses": connections,
+        }
+
+    @property
+    def metrics(self) -> Optional[MetricsSink]:
+        return self._metrics
+
+    def throttle_stats(self) -> Dict[str, float]:
+        """
+        Return the cost of the rate limiting and retries: requests sent,
+        requests delayed by the rate limiter and for how long, retries and
+        their delay, and requests that failed after exhausting their retries.
+        """
+        return self._throttle.stats()
+
     def close(self) -> None:
         self._api_client.close()
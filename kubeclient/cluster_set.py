@@ -0,0 +1,294 @@
+import logging
+import threading
+import time
+from concurrent import futures
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from kubernetes import config
+
+from .client import KubernetesApiClient
+from .resources_apis.resource_api import ResourceApi
+
+_logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ResourceApiError(RuntimeError):
+    """
+    A resource API method returned None: it failed, and logged why, or
+    found nothing.
+    """
+
+
+class ClusterResult(Generic[T]):
+    """
+    The outcome of an operation on one cluster.
+    """
+
+    def __init__(
+        self,
+        context: str,
+        value: Optional[T] = None,
+        error: Optional[BaseException] = None,
+        seconds: float = 0.0,
+    ) -> None:
+        self.context = context
+        self.value = value
+        self.error = error
+        self.seconds = seconds
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        status = "ok" if self.ok else f"failed ({type(self.error).__name__})"
+        return f"<ClusterResult {self.context}: {status} in {self.seconds:.3f}s>"
+
+
+class ClusterResults(Mapping[str, ClusterResult[T]]):
+    """
+    The per-cluster outcomes of an operation, by context, truthy when all of
+    them succeeded.
+    """
+
+    def __init__(self, results: Dict[str, ClusterResult[T]]) -> None:
+        self._results = results
+
+    def __getitem__(self, context: str) -> ClusterResult[T]:
+        return self._results[context]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._results)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __bool__(self) -> bool:
+        return all(result.ok for result in self._results.values())
+
+    @property
+    def succeeded(self) -> Dict[str, T]:
+        return {
+            context: result.value
+            for context, result in self._results.items()
+            if result.ok
+        }
+
+    @property
+    def failed(self) -> Dict[str, BaseException]:
+        return {
+            context: result.error
+            for context, result in self._results.items()
+            if not result.ok
+        }
+
+
+class ClusterSet:
+    """
+    One KubernetesApiClient per kubeconfig context, running operations on
+    every cluster concurrently. Each cluster has its own timeout, so a slow
+    or unreachable cluster fails alone instead of stalling the others.
+    contexts:Optional: The contexts to use, all the contexts of the
+        kubeconfig by default.
+    config_file_path:Optional: The kubeconfig, the default one if not given.
+    timeout:Optional: The timeout in seconds of an operation on a cluster,
+        None to wait for every cluster. Unless given in client_options, it
+        is also the connect and read timeout of the requests.
+    timeouts:Optional: The timeouts of some clusters, by context.
+    clients:Optional: The clients by context, instead of loading them from
+        the kubeconfig.
+    client_options:Optional: The options of the KubernetesApiClients.
+    """
+
+    def __init__(
+        self,
+        contexts: Optional[Iterable[str]] = None,
+        config_file_path: Optional[Path] = None,
+        timeout: Optional[float] = 30,
+        timeouts: Optional[Mapping[str, Optional[float]]] = None,
+        clients: Optional[Mapping[str, KubernetesApiClient]] = None,
+        **client_options,
+    ) -> None:
+        self._config_file_path = config_file_path
+        self._clients: Dict[str, KubernetesApiClient] = dict(clients or {})
+        if contexts is None:
+            contexts = self._clients or self._kubeconfig_contexts()
+        self._contexts = list(contexts)
+        self._timeout = timeout
+        self._timeouts = dict(timeouts or {})
+        self._client_options = client_options
+        self._apis: Dict[Tuple[str, Type[ResourceApi], tuple], ResourceApi] = {}
+        self._lock = threading.Lock()
+
+    def _kubeconfig_contexts(self) -> List[str]:
+        config_file = (
+            str(self._config_file_path) if self._config_file_path is not None else None
+        )
+        contexts, _ = config.list_kube_config_contexts(config_file)
+        return [context["name"] for context in contexts]
+
+    @property
+    def contexts(self) -> List[str]:
+        return list(self._contexts)
+
+    def client(self, context: str) -> KubernetesApiClient:
+        """
+        Return the client of a cluster, loading it on first use.
+        """
+        with self._lock:
+            kubeclient = self._clients.get(context)
+        if kubeclient is not None:
+            return kubeclient
+
+        options = dict(self._client_options)
+        timeout = self._timeout_of(context, None)
+        if timeout is not None:
+            options.setdefault("connect_timeout", timeout)
+            options.setdefault("read_timeout", timeout)
+        # Loading runs the credential plugins of the context, so it is done
+        # outside of the lock, concurrently for every cluster.
+        kubeclient = KubernetesApiClient(
+            self._config_file_path, context=context, **options
+        )
+        with self._lock:
+            return self._clients.setdefault(context, kubeclient)
+
+    def resource_api(
+        self, context: str, api_type: Type[ResourceApi], *api_args
+    ) -> ResourceApi:
+        """
+        Return the resource API of a cluster, created with the client and
+        api_args on first use, like:
+            clusters.resource_api("east", resources_apis.GenericResource, "widgets.example.com")
+        """
+        key = (context, api_type, api_args)
+        with self._lock:
+            api = self._apis.get(key)
+        if api is None:
+            api = api_type(self.client(context), *api_args)
+            with self._lock:
+                api = self._apis.setdefault(key, api)
+
+        return api
+
+    def map(
+        self,
+        operation: Callable[[KubernetesApiClient], T],
+        timeout: Optional[float] = None,
+    ) -> ClusterResults[T]:
+        """
+        Run an operation on the client of every cluster concurrently and
+        return its results by context, like:
+            clusters.map(lambda client: Deployer(client).create_from_yaml(path))
+        timeout:Optional: The timeout of every cluster, the ones of the set by
+            default.
+        """
+        return self._run(lambda context: operation(self.client(context)), timeout)
+
+    def run(
+        self,
+        api_type: Type[ResourceApi],
+        method: str,
+        *args,
+        api_args: Tuple[Any, ...] = (),
+        **kwargs,
+    ) -> ClusterResults[Any]:
+        """
+        Call a method of a resource API on every cluster concurrently and
+        return its results by context, like:
+            clusters.run(resources_apis.Pod, "list", "default")
+            clusters.run(resources_apis.CustomResource, "list", "default", api_args=("example.com", "v1", "widgets"))
+        The methods of the resource APIs log their errors and return None,
+        so a None result is a failure of the cluster.
+        api_args:Optional: The arguments of the resource API after the client.
+        """
+
+        def call(context: str) -> Any:
+            api = self.resource_api(context, api_type, *api_args)
+            value = getattr(api, method)(*args, **kwargs)
+            if value is None:
+                raise ResourceApiError(
+                    f"{api_type.__name__}.{method} failed on cluster {context}"
+                )
+            return value
+
+        return self._run(call, None)
+
+    def _timeout_of(self, context: str, timeout: Optional[float]) -> Optional[float]:
+        if timeout is not None:
+            return timeout
+        return self._timeouts.get(context, self._timeout)
+
+    def _run(
+        self, call: Callable[[str], T], timeout: Optional[float]
+    ) -> ClusterResults[T]:
+        start = time.monotonic()
+        results: Dict[str, ClusterResult[T]] = {}
+
+        def run_on(context: str) -> ClusterResult[T]:
+            try:
+                value = call(context)
+            except Exception as e:
+                _logger.error(f"Operation failed on cluster {context}: {e}")
+                return ClusterResult(context, error=e, seconds=time.monotonic() - start)
+            return ClusterResult(context, value, seconds=time.monotonic() - start)
+
+        # The threads of the clusters that time out keep running until their
+        # requests time out, so the executor is not waited for.
+        executor = futures.ThreadPoolExecutor(
+            max_workers=max(len(self._contexts), 1),
+            thread_name_prefix="kubeclient-cluster",
+        )
+        pending = {
+            executor.submit(run_on, context): context for context in self._contexts
+        }
+        executor.shutdown(wait=False)
+        deadlines = {}
+        for future, context in pending.items():
+            context_timeout = self._timeout_of(context, timeout)
+            if context_timeout is not None:
+                deadlines[future] = start + context_timeout
+
+        while pending:
+            remaining = [
+                deadlines[f] - time.monotonic() for f in pending if f in deadlines
+            ]
+            done, _ = futures.wait(
+                pending,
+                timeout=max(min(remaining), 0) if remaining else None,
+                return_when=futures.FIRST_COMPLETED,
+            )
+            for future in done:
+                context = pending.pop(future)
+                results[context] = future.result()
+            now = time.monotonic()
+            for future in [f for f in pending if deadlines.get(f, now + 1) <= now]:
+                context = pending.pop(future)
+                _logger.error(f"Operation timed out on cluster {context}")
+                results[context] = ClusterResult(
+                    context,
+                    error=futures.TimeoutError(f"Timeout on cluster {context}"),
+                    seconds=now - start,
+                )
+
+        return ClusterResults({context: results[context] for context in self._contexts})
+
+    def close(self) -> None:
+        for kubeclient in self._clients.values():
+            kubeclient.close()
@@ -1,38 +1,372 @@
 import logging
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Iterator, List, Optional, Tuple
 
-from kubernetes.client import ApiClient
-from kubernetes.utils import create_from_yaml
+from kubernetes.client import ApiClient, ApiextensionsV1Api, exceptions
+from kubernetes.utils import FailToCreateError
 
+from ._apply import DEFAULT_FIELD_MANAGER, server_side_apply
+from ._plan import (
+    CustomResourceDefinitions,
+    call_for_object,
+    flatten,
+    object_namespace,
+    plan_layers,
+)
+from ._raw import RAW_REQUEST_OPTIONS, decode
 from .client import KubernetesApiClient
+from .manifests import load_manifests
+from .resources_apis._condition import Condition
 
 _logger = logging.getLogger(__name__)
 
+HTTP_STATUS_NOT_FOUND = 404
+
 
 class Deployer:
     _api_client: ApiClient
 
-    def __init__(self, api_client: KubernetesApiClient) -> None:
+    def __init__(
+        self,
+        api_client: KubernetesApiClient,
+        max_workers: int = 8,
+        crd_timeout: int = 60,
+    ) -> None:
         self._api_client = api_client.api_client
+        self._max_workers = max_workers
+        self._crd_timeout = crd_timeout
 
-    def create_from_yaml(self, yaml_file_path: str, namespace: str = "default") -> list:
+    def create_from_yaml(
+        self, yaml_file_path: str, namespace: str = "default", raw: bool = False
+    ) -> list:
+        """
+        Create all resources defined in a yaml file.
+        The objects are sorted into dependency layers (namespaces and CRDs,
+        then RBAC, service accounts and configuration, then workloads, then
+        everything else) and each layer is created concurrently. Custom
+        resources are only created once their CRDs are established.
+        Like kubernetes.utils.create_from_yaml, every object is attempted and
+        a FailToCreateError is raised at the end if any of them failed, and
+        the responses are returned in the order of the documents.
+        raw:Optional: Return RawObject views of the responses instead of models.
+        """
         _logger.info(f"Creating from yaml file {yaml_file_path}")
-        return create_from_yaml(self._api_client, yaml_file_path, namespace=namespace)
+        objects, layers, definitions = self._plan(yaml_file_path)
+        results = self._run_layers(
+            layers, definitions, namespace, partial(self._create_object, raw=raw)
+        )
+        if results.failed:
+            raise FailToCreateError(
+                [_as_api_exception(result.error) for result in results.failed]
+            )
+
+        # The layers reorder the objects, the responses keep the file order.
+        position = {id(obj): index for index, obj in enumerate(objects)}
+        return [
+            [result.response]
+            for result in sorted(results, key=lambda r: position[id(r.object)])
+        ]
 
-    def delete_from_yaml(self, yaml_file_path: str, namespace: str = "default") -> bool:
+    def apply(
+        self,
+        yaml_file_path: str,
+        namespace: str = "default",
+        field_manager: str = DEFAULT_FIELD_MANAGER,
+        force: bool = False,
+        raw: bool = False,
+    ) -> "ObjectResults":
+        """
+        Create or update all resources defined in a yaml file with
+        server-side apply, one request per object, in the same layers as
+        create_from_yaml. Applying a bundle again is idempotent.
+        field_manager:Optional: The field manager owning the applied fields.
+        force:Optional: Take ownership of fields managed by someone else.
+        raw:Optional: Return RawObject views of the responses instead of models.
+        """
+        _logger.info(f"Applying yaml file {yaml_file_path}")
+        _, layers, definitions = self._plan(yaml_file_path)
+
+        def apply_object(obj: dict, namespace: str, definitions):
+            with server_side_apply(self._api_client):
+                response = call_for_object(
+                    self._api_client,
+                    "patch",
+                    obj,
+                    namespace,
+                    definitions,
+                    name=obj["metadata"]["name"],
+                    body=obj,
+                    field_manager=field_manager,
+                    force=force,
+                    **(RAW_REQUEST_OPTIONS if raw else {}),
+                )
+            return decode(response) if raw else response
+
+        return self._run_layers(layers, definitions, namespace, apply_object)
+
+    def delete_from_yaml(
+        self,
+        yaml_file_path: str,
+        namespace: str = "default",
+        wait: bool = False,
+        timeout: int = 60,
+        ignore_not_found: bool = False,
+    ) -> "ObjectResults":
         """
         Delete all resources defined in a yaml file.
-        TODO: Change this to not use kubectl.
+        The objects are deleted concurrently in the reverse order of
+        create_from_yaml, so workloads go before the namespaces and CRDs they
+        live in. The returned results are truthy when every delete succeeded.
+        wait:Optional: Wait for the deleted objects to disappear.
+        timeout:Optional: The timeout in seconds of the wait.
+        ignore_not_found:Optional: Count objects that do not exist as deleted.
         """
         _logger.info(f"Deleting from yaml file {yaml_file_path}")
-        kubectl = subprocess.run(
-            ["kubectl", "delete", "-f", yaml_file_path, "-n", namespace],
-            capture_output=True,
+        _, layers, definitions = self._plan(yaml_file_path)
+        results = self._run_layers(
+            list(reversed(layers)),
+            definitions,
+            namespace,
+            self._delete_object,
+            ignore_not_found=ignore_not_found,
+            wait_for_crds=False,
         )
-        if kubectl.returncode != 0:
+        if wait and not self._wait_for_deleted(results.succeeded, definitions, timeout):
             _logger.error(
-                f"Failed to delete from yaml file {yaml_file_path}: {kubectl.stderr}"
+                f"Timeout waiting for objects from {yaml_file_path} to be deleted"
+            )
+
+        return results
+
+    def _plan(
+        self, yaml_file_path: str
+    ) -> Tuple[List[dict], List[List[dict]], CustomResourceDefinitions]:
+        """
+        Return the objects of a yaml file in document order, their dependency
+        layers and their CustomResourceDefinitions.
+        """
+        objects = flatten(load_manifests(yaml_file_path))
+        return objects, plan_layers(objects), CustomResourceDefinitions(objects)
+
+    def _run_layers(
+        self,
+        layers: List[List[dict]],
+        definitions: CustomResourceDefinitions,
+        namespace: str,
+        action: Callable,
+        ignore_not_found: bool = False,
+        wait_for_crds: bool = True,
+    ) -> "ObjectResults":
+        """
+        Run an action on every object, one layer after the other, with the
+        objects of a layer handled concurrently on a bounded thread pool.
+        """
+        results = []
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            for layer in layers:
+                required = definitions.required_by(layer)
+                unestablished = set()
+                if (
+                    wait_for_crds
+                    and required
+                    and not self._wait_for_established(required)
+                ):
+                    _logger.error(
+                        f"CustomResourceDefinitions {required} are not established"
+                    )
+                    unestablished = set(required)
+
+                futures = []
+                for obj in layer:
+                    definition = definitions.find(obj)
+                    if (
+                        definition is not None
+                        and definition["metadata"]["name"] in unestablished
+                    ):
+                        # The apiserver would only answer 404 for these.
+                        results.append(
+                            ObjectResult(
+                                obj,
+                                namespace,
+                                error=exceptions.ApiException(
+                                    reason=f"CustomResourceDefinition "
+                                    f"{definition['metadata']['name']} is not established"
+                                ),
+                            )
+                        )
+                        continue
+                    futures.append(
+                        (obj, executor.submit(action, obj, namespace, definitions))
+                    )
+
+                for obj, future in futures:
+                    try:
+                        results.append(ObjectResult(obj, namespace, future.result()))
+                    except Exception as e:
+                        if (
+                            ignore_not_found
+                            and isinstance(e, exceptions.ApiException)
+                            and e.status == HTTP_STATUS_NOT_FOUND
+                        ):
+                            results.append(ObjectResult(obj, namespace))
+                            continue
+                        result = ObjectResult(obj, namespace, error=e)
+                        _logger.error(f"Failed on {result.kind} {result.name}: {e}")
+                        results.append(result)
+
+        return ObjectResults(results)
+
+    def _create_object(
+        self,
+        obj: dict,
+        namespace: str,
+        definitions: CustomResourceDefinitions,
+        raw: bool = False,
+    ):
+        response = call_for_object(
+            self._api_client,
+            "create",
+            obj,
+            namespace,
+            definitions,
+            body=obj,
+            **(RAW_REQUEST_OPTIONS if raw else {}),
+        )
+        return decode(response) if raw else response
+
+    def _delete_object(
+        self, obj: dict, namespace: str, definitions: CustomResourceDefinitions
+    ):
+        return call_for_object(
+            self._api_client,
+            "delete",
+            obj,
+            namespace,
+            definitions,
+            name=obj["metadata"]["name"],
+        )
+
+    def _wait_for_established(self, names: List[str]) -> bool:
+        api = ApiextensionsV1Api(self._api_client)
+
+        def established() -> bool:
+            for name in names:
+                try:
+                    definition = api.read_custom_resource_definition(name)
+                except exceptions.ApiException:
+                    return False
+                conditions = (definition.status and definition.status.conditions) or []
+                if not any(
+                    c.type == "Established" and c.status == "True" for c in conditions
+                ):
+                    return False
+            return True
+
+        return Condition(
+            name=f"CustomResourceDefinitions {names} to be established",
+            fn=established,
+            timeout=self._crd_timeout,
+            interval=0.5,
+        ).wait()
+
+    def _wait_for_deleted(
+        self,
+        results: List["ObjectResult"],
+        definitions: CustomResourceDefinitions,
+        timeout: int,
+    ) -> bool:
+        pending = list(results)
+
+        def deleted() -> bool:
+            for result in list(pending):
+                try:
+                    call_for_object(
+                        self._api_client,
+                        "read",
+                        result.object,
+                        result.namespace,
+                        definitions,
+                        name=result.name,
+                    )
+                except exceptions.ApiException as e:
+                    if e.status == HTTP_STATUS_NOT_FOUND:
+                        pending.remove(result)
+            return not pending
+
+        return Condition(
+            name=f"{len(pending)} objects to be deleted",
+            fn=deleted,
+            timeout=timeout,
+            interval=0.5,
+        ).wait()
+
+
+def _as_api_exception(error: Exception) -> exceptions.ApiException:
+    """
+    Wrap the errors that are not ApiExceptions, like a connection error, for
+    FailToCreateError which prints the reason and body of each.
+    """
+    if isinstance(error, exceptions.ApiException):
+        return error
+    return exceptions.ApiException(reason=f"{type(error).__name__}: {error}")
+
+
+class ObjectResult:
+    """
+    The outcome of an operation on one object of a manifest.
+    """
+
+    def __init__(
+        self,
+        obj: dict,
+        namespace: Optional[str],
+        response=None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        self.object = obj
+        self.kind = obj.get("kind")
+        self.name = (obj.get("metadata") or {}).get("name")
+        self.namespace = object_namespace(obj, namespace)
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        if self.ok:
+            status = "ok"
+        else:
+            status = (
+                f"failed ({getattr(self.error, 'status', type(self.error).__name__)})"
             )
-            return False
+        return f"<ObjectResult {self.kind} {self.namespace}/{self.name}: {status}>"
+
+
+class ObjectResults:
+    """
+    The per-object outcomes of an operation on a manifest, truthy when all
+    of them succeeded.
+    """
+
+    def __init__(self, results: List[ObjectResult]) -> None:
+        self._results = results
+
+    def __iter__(self) -> Iterator[ObjectResult]:
+        return iter(self._results)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __bool__(self) -> bool:
+        return all(result.ok for result in self._results)
+
+    @property
+    def succeeded(self) -> List[ObjectResult]:
+        return [result for result in self._results if result.ok]
 
-        return True
+    @property
+    def failed(self) -> List[ObjectResult]:
+        return [result for result in self._results if not result.ok]
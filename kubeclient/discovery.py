@@ -0,0 +1,317 @@
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from kubernetes.client import ApiClient, exceptions
+
+from ._raw import _dumps, _loads
+from .client import KubernetesApiClient
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path("~/.kube/cache/discovery")
+# The time to live of kubectl's discovery cache.
+DEFAULT_TTL = 6 * 60 * 60.0
+# The shortest delay between two discoveries run for names that were not
+# found, so repeated misses like a typo do not rediscover every time.
+MIN_REFRESH_INTERVAL = 30.0
+
+_SERVER_GROUPS = "servergroups.json"
+_SERVER_RESOURCES = "serverresources.json"
+
+
+class APIResource(NamedTuple):
+    """
+    A resource served by the apiserver, as listed by API discovery.
+    """
+
+    group: str
+    version: str
+    name: str
+    kind: str
+    namespaced: bool
+    singular_name: str = ""
+    short_names: Tuple[str, ...] = ()
+    verbs: Tuple[str, ...] = ()
+
+    @property
+    def api_version(self) -> str:
+        return f"{self.group}/{self.version}" if self.group else self.version
+
+    @property
+    def group_version_path(self) -> str:
+        if self.group:
+            return f"/apis/{self.group}/{self.version}"
+        return f"/api/{self.version}"
+
+    def path(self, namespace: Optional[str] = None, name: Optional[str] = None) -> str:
+        """
+        Return the API path of the collection of the resource, in every
+        namespace when namespace is None, or of one of its objects.
+        """
+        path = self.group_version_path
+        if self.namespaced and namespace:
+            path += f"/namespaces/{namespace}"
+        path += f"/{self.name}"
+        if name:
+            path += f"/{name}"
+        return path
+
+
+class UnknownResourceError(LookupError):
+    pass
+
+
+def _host_directory(host: str) -> str:
+    """
+    Return the cache directory name of an apiserver, like kubectl:
+    https://10.0.0.1:6443 is cached in 10.0.0.1_6443.
+    """
+    netloc = urlsplit(host).netloc or host
+    return re.sub(r"[^\w.-]", "_", netloc)
+
+
+class Discovery:
+    """
+    The API resources served by a cluster, read from its discovery endpoints
+    and cached on disk like kubectl's ~/.kube/cache/discovery, so a process
+    only runs the discovery requests when the cache is older than its time
+    to live. The group versions are discovered concurrently.
+    cache_dir:Optional: The root of the disk cache, None to keep the
+        documents in memory only.
+    ttl:Optional: The time to live in seconds of the cached documents.
+    max_workers:Optional: The maximum number of concurrent discovery requests.
+    """
+
+    def __init__(
+        self,
+        kubeclient: KubernetesApiClient,
+        cache_dir: Union[str, Path, None] = DEFAULT_CACHE_DIR,
+        ttl: float = DEFAULT_TTL,
+        max_workers: int = 8,
+    ) -> None:
+        self._api_client = kubeclient.api_client
+        self._cache_dir = None
+        if cache_dir is not None:
+            self._cache_dir = Path(cache_dir).expanduser() / _host_directory(
+                self._api_client.configuration.host
+            )
+        self._ttl = ttl
+        self._max_workers = max_workers
+        self._resources: Optional[List[APIResource]] = None
+        self._loaded_at = 0.0
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def resources(self) -> List[APIResource]:
+        """
+        Return every resource of the cluster, the preferred version of each
+        group first, without the subresources.
+        """
+        with self._lock:
+            if (
+                self._resources is None
+                or time.monotonic() - self._loaded_at > self._ttl
+            ):
+                self._resources = self._load()
+                self._loaded_at = time.monotonic()
+            return self._resources
+
+    def resolve(self, resource: str, api_version: Optional[str] = None) -> APIResource:
+        """
+        Return the API resource of a kind, plural, singular or short name,
+        like "Deployment", "deployments", "deploy" or "deployments.apps", in
+        the preferred version of its group unless api_version is given.
+        A name that is not found runs the discovery again, at most once per
+        MIN_REFRESH_INTERVAL, in case it is a custom resource defined after
+        the cache was written.
+        """
+        found = self._find(resource, api_version)
+        if found is None and self._refresh_allowed():
+            self.refresh()
+            found = self._find(resource, api_version)
+        if found is None:
+            raise UnknownResourceError(
+                f"The server doesn't have a resource type {resource}"
+                + (f" in {api_version}" if api_version else "")
+            )
+
+        return found
+
+    def refresh(self) -> None:
+        """
+        Run the discovery again whatever the age of the cache, and overwrite
+        the cached documents.
+        """
+        with self._lock:
+            self._refreshed_at = time.monotonic()
+            self._resources = self._load(fresh=True)
+            self._loaded_at = time.monotonic()
+
+    def _refresh_allowed(self) -> bool:
+        with self._lock:
+            return (
+                self._refreshed_at is None
+                or time.monotonic() - self._refreshed_at >= MIN_REFRESH_INTERVAL
+            )
+
+    def _find(self, resource: str, api_version: Optional[str]) -> Optional[APIResource]:
+        name, group = resource.lower(), None
+        if api_version is None and "." in name:
+            name, group = name.split(".", 1)
+        for candidate in self.resources():
+            if api_version is not None and candidate.api_version != api_version:
+                continue
+            if group is not None and candidate.group != group:
+                continue
+            if name in (
+                candidate.kind.lower(),
+                candidate.name,
+                candidate.singular_name,
+                *candidate.short_names,
+            ):
+                return candidate
+
+        return None
+
+    def _load(self, fresh: bool = False) -> List[APIResource]:
+        groups = self._cached(_SERVER_GROUPS, self._server_groups, fresh)["groups"]
+        group_versions = [
+            (group["name"], version)
+            for group in groups
+            for version in self._versions(group)
+        ]
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            documents = list(
+                executor.map(
+                    lambda group_version: self._server_resources(group_version, fresh),
+                    group_versions,
+                )
+            )
+
+        resources = []
+        for (group, version), document in zip(group_versions, documents):
+            for resource in document.get("resources") or []:
+                if "/" in resource["name"]:
+                    continue
+                resources.append(
+                    APIResource(
+                        group=group,
+                        version=version,
+                        name=resource["name"],
+                        kind=resource["kind"],
+                        namespaced=resource["namespaced"],
+                        singular_name=resource.get("singularName") or "",
+                        short_names=tuple(resource.get("shortNames") or ()),
+                        verbs=tuple(resource.get("verbs") or ()),
+                    )
+                )
+
+        return resources
+
+    @staticmethod
+    def _versions(group: Dict[str, Any]) -> List[str]:
+        preferred = (group.get("preferredVersion") or {}).get("version")
+        versions = [version["version"] for version in group.get("versions") or []]
+        return sorted(versions, key=lambda version: version != preferred)
+
+    def _server_groups(self) -> Dict[str, Any]:
+        """
+        Return the API groups with the legacy core group first, like the
+        servergroups.json of kubectl.
+        """
+        versions = self._get("/api").get("versions") or []
+        core = {
+            "name": "",
+            "versions": [{"groupVersion": v, "version": v} for v in versions],
+            "preferredVersion": {"groupVersion": versions[0], "version": versions[0]}
+            if versions
+            else None,
+        }
+        groups = self._get("/apis").get("groups") or []
+        return {"kind": "APIGroupList", "apiVersion": "v1", "groups": [core] + groups}
+
+    def _server_resources(
+        self, group_version: Tuple[str, str], fresh: bool
+    ) -> Dict[str, Any]:
+        group, version = group_version
+        path = f"/apis/{group}/{version}" if group else f"/api/{version}"
+        name = os.path.join(group, version, _SERVER_RESOURCES)
+        try:
+            return self._cached(name, lambda: self._get(path), fresh)
+        except exceptions.ApiException as e:
+            # An aggregated API that is down fails its own discovery only,
+            # like kubectl, the other groups are still usable.
+            _logger.warning(f"Failed to discover the resources of {path}: {e}")
+            return {}
+
+    def _get(self, path: str) -> Dict[str, Any]:
+        response = self._api_client.call_api(
+            path,
+            "GET",
+            header_params={"Accept": "application/json"},
+            auth_settings=["BearerToken"],
+            _return_http_data_only=True,
+            _preload_content=False,
+        )
+        try:
+            return _loads(response.data)
+        finally:
+            response.release_conn()
+
+    def _cached(self, name: str, fetch, fresh: bool) -> Dict[str, Any]:
+        path = self._cache_dir / name if self._cache_dir is not None else None
+        if path is not None and not fresh:
+            try:
+                if time.time() - path.stat().st_mtime < self._ttl:
+                    return _loads(path.read_bytes())
+            except (OSError, ValueError):
+                pass
+
+        document = fetch()
+        if path is not None:
+            self._write(path, document)
+        return document
+
+    def _write(self, path: Path, document: Dict[str, Any]) -> None:
+        # Written to a temporary file and renamed, so concurrent processes
+        # never read a partial document.
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    file.write(_dumps(document))
+                os.replace(temporary, path)
+            except OSError:
+                os.unlink(temporary)
+                raise
+        except OSError as e:
+            _logger.warning(f"Failed to write the discovery cache {path}: {e}")
+
+
+_discoveries: "weakref.WeakKeyDictionary[ApiClient, Discovery]" = (
+    weakref.WeakKeyDictionary()
+)
+_discoveries_lock = threading.Lock()
+
+
+def get_discovery(kubeclient: KubernetesApiClient, **options) -> Discovery:
+    """
+    Return the Discovery shared by the resource APIs of a client, created
+    with the given options on first use.
+    """
+    with _discoveries_lock:
+        discovery = _discoveries.get(kubeclient.api_client)
+        if discovery is None:
+            discovery = Discovery(kubeclient, **options)
+            _discoveries[kubeclient.api_client] = discovery
+        return discovery
@@ -0,0 +1,945 @@
+"""
+An in-process fake of the Kubernetes API, to run kubeclient without a
+cluster:
+
+    cluster = FakeCluster(ready_after=0.5)
+    client = KubernetesApiClient(backend=cluster)
+
+The fake serves get, list with limit, continue and selectors, watch, create,
+replace, patch and delete of any resource, with resourceVersions, and the
+discovery documents of the built-in resources and of the stored CRDs, behind
+the same transport interface as the HTTP client, so rate limiting, retries and
+metrics work as usual. The status of the built-in kinds is owned by the fake,
+which makes pods, workloads and load balancers ready on a schedule.
+"""
+import base64
+import copy
+import http
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from kubernetes.client import exceptions
+from kubernetes.client.rest import RESTClientObject, RESTResponse
+
+from ._apply import APPLY_PATCH_CONTENT_TYPE
+from ._raw import _dumps, _loads
+from .resources_apis._selector import LabelSelector
+
+KINDS = {
+    "namespaces": "Namespace",
+    "pods": "Pod",
+    "services": "Service",
+    "configmaps": "ConfigMap",
+    "secrets": "Secret",
+    "serviceaccounts": "ServiceAccount",
+    "deployments": "Deployment",
+    "statefulsets": "StatefulSet",
+    "daemonsets": "DaemonSet",
+    "replicasets": "ReplicaSet",
+    "clusterroles": "ClusterRole",
+    "clusterrolebindings": "ClusterRoleBinding",
+    "customresourcedefinitions": "CustomResourceDefinition",
+}
+
+# The built-in resources served by the discovery endpoints, by group and
+# version, with whether they are namespaced.
+API_RESOURCES = {
+    ("", "v1"): {
+        "namespaces": False,
+        "pods": True,
+        "services": True,
+        "configmaps": True,
+        "secrets": True,
+        "serviceaccounts": True,
+    },
+    ("apps", "v1"): {
+        "deployments": True,
+        "statefulsets": True,
+        "daemonsets": True,
+        "replicasets": True,
+    },
+    ("rbac.authorization.k8s.io", "v1"): {
+        "clusterroles": False,
+        "clusterrolebindings": False,
+    },
+    ("apiextensions.k8s.io", "v1"): {"customresourcedefinitions": False},
+}
+
+SHORT_NAMES = {
+    "namespaces": ["ns"],
+    "pods": ["po"],
+    "services": ["svc"],
+    "configmaps": ["cm"],
+    "serviceaccounts": ["sa"],
+    "deployments": ["deploy"],
+    "statefulsets": ["sts"],
+    "daemonsets": ["ds"],
+    "replicasets": ["rs"],
+    "customresourcedefinitions": ["crd", "crds"],
+}
+
+Key = Tuple[str, str]
+Response = Tuple[int, Dict[str, Any]]
+
+
+def _status(code: int, reason: str, message: str) -> Response:
+    return code, {
+        "kind": "Status",
+        "apiVersion": "v1",
+        "status": "Failure",
+        "reason": reason,
+        "message": message,
+        "code": code,
+    }
+
+
+def _parse_path(path: str) -> Optional[Tuple[str, str, str, str, str, str]]:
+    """
+    Return the (group, version, resource, namespace, name, subresource) of an
+    API path.
+    """
+    segments = [segment for segment in path.split("/") if segment]
+    if segments[:1] == ["api"] and len(segments) >= 3:
+        group, version, segments = "", segments[1], segments[2:]
+    elif segments[:1] == ["apis"] and len(segments) >= 4:
+        group, version, segments = segments[1], segments[2], segments[3:]
+    else:
+        return None
+
+    namespace = ""
+    if len(segments) > 2 and segments[0] == "namespaces":
+        namespace, segments = segments[1], segments[2:]
+    segments += [""] * (3 - len(segments))
+
+    return group, version, segments[0], namespace, segments[1], segments[2]
+
+
+def _merge(target: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        elif isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+    return target
+
+
+def _json_patch(target: Dict[str, Any], operations: List[Dict[str, Any]]) -> None:
+    """
+    Apply the add, replace, remove and test operations of a JSON patch.
+    """
+    for operation in operations:
+        path = operation["path"].split("/")[1:]
+        *parents, last = [p.replace("~1", "/").replace("~0", "~") for p in path]
+        parent = target
+        for segment in parents:
+            parent = (
+                parent[int(segment)] if isinstance(parent, list) else parent[segment]
+            )
+        key = last
+        if isinstance(parent, list):
+            key = len(parent) if last == "-" else int(last)
+
+        op = operation["op"]
+        if op == "add" and isinstance(parent, list):
+            parent.insert(key, operation["value"])
+        elif op == "add" or (
+            op == "replace" and (isinstance(parent, list) or key in parent)
+        ):
+            parent[key] = operation["value"]
+        elif op == "remove":
+            del parent[key]
+        elif op != "test" or parent[key] != operation["value"]:
+            raise ValueError(f"Cannot apply {op} to {operation['path']}")
+
+
+def _field_matches(obj: Dict[str, Any], selector: str) -> bool:
+    for requirement in filter(None, selector.split(",")):
+        negated = "!=" in requirement
+        key, value = requirement.replace("!=", "=").replace("==", "=").split("=", 1)
+        actual = obj
+        for segment in key.split("."):
+            actual = actual.get(segment) if isinstance(actual, dict) else None
+        matches = ("" if actual is None else str(actual)) == value
+        if matches == negated:
+            return False
+
+    return True
+
+
+def _replicas(obj: Dict[str, Any]) -> int:
+    return (obj.get("spec") or {}).get("replicas", 1)
+
+
+def _daemonset_status(ready: int) -> Dict[str, Any]:
+    return {
+        "currentNumberScheduled": ready,
+        "desiredNumberScheduled": 1,
+        "numberMisscheduled": 0,
+        "numberReady": ready,
+        "numberAvailable": ready,
+    }
+
+
+# The status the apiserver and the controllers give to a new object of the
+# kinds whose status is owned by the cluster.
+_INITIAL_STATUS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "namespaces": lambda obj: {"phase": "Active"},
+    "customresourcedefinitions": lambda obj: {
+        "conditions": [{"type": "Established", "status": "True"}]
+    },
+    "pods": lambda obj: {"phase": "Pending"},
+    "services": lambda obj: {"loadBalancer": {}},
+    "deployments": lambda obj: {"replicas": _replicas(obj)},
+    "statefulsets": lambda obj: {"replicas": _replicas(obj)},
+    "replicasets": lambda obj: {"replicas": _replicas(obj)},
+    "daemonsets": lambda obj: _daemonset_status(0),
+}
+
+# The status of an object once ready, None when it never gets one.
+_READY_STATUS: Dict[str, Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = {
+    "pods": lambda obj: {
+        "phase": "Running",
+        "conditions": [
+            {"type": "Ready", "status": "True"},
+            {"type": "ContainersReady", "status": "True"},
+        ],
+    },
+    "services": lambda obj: (
+        {"loadBalancer": {"ingress": [{"ip": "127.0.0.1"}]}}
+        if (obj.get("spec") or {}).get("type") == "LoadBalancer"
+        else None
+    ),
+    "deployments": lambda obj: {
+        "replicas": _replicas(obj),
+        "readyReplicas": _replicas(obj),
+        "availableReplicas": _replicas(obj),
+        "updatedReplicas": _replicas(obj),
+    },
+    "statefulsets": lambda obj: {
+        "replicas": _replicas(obj),
+        "readyReplicas": _replicas(obj),
+        "currentReplicas": _replicas(obj),
+    },
+    "replicasets": lambda obj: {
+        "replicas": _replicas(obj),
+        "readyReplicas": _replicas(obj),
+        "availableReplicas": _replicas(obj),
+    },
+    "daemonsets": lambda obj: _daemonset_status(1),
+}
+
+
+class _Event:
+    __slots__ = ("resource_version", "group", "resource", "type", "object")
+
+    def __init__(
+        self, resource_version: int, group: str, resource: str, type: str, obj: Dict
+    ) -> None:
+        self.resource_version = resource_version
+        self.group = group
+        self.resource = resource
+        self.type = type
+        self.object = obj
+
+
+class FakeCluster:
+    """
+    The objects of a fake cluster, by resource and (namespace, name). Stored
+    objects are never modified in place: every change stores a new object
+    and records a watch event.
+    ready_after:Optional: The delay in seconds before the pods, workloads
+        and load balancers created or updated through the API become ready,
+        0 for at once and None for never, leaving it to schedule().
+    history:Optional: The events kept for watches. Watching from an older
+        resourceVersion fails with 410 Gone, like after a compaction.
+    """
+
+    def __init__(
+        self, ready_after: Optional[float] = 0.0, history: int = 10000
+    ) -> None:
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._objects: Dict[Tuple[str, str], Dict[Key, Dict]] = {}
+        # Watching from resourceVersion 0 means from any state, so even an
+        # empty cluster lists a later one.
+        self._resource_version = 1
+        self._events: deque = deque(maxlen=history)
+        self._compacted = 0
+        self._ready_after = ready_after
+        self._timers: Set[threading.Timer] = set()
+        self._closed = False
+
+    def transport(self) -> "FakeTransport":
+        return FakeTransport(self)
+
+    def add(self, group: str, resource: str, obj: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store an object as is, like a create without the API checks. The
+        cluster takes ownership of the object.
+        """
+        with self._lock:
+            metadata = obj.setdefault("metadata", {})
+            key = (metadata.get("namespace", ""), metadata["name"])
+            exists = key in self._objects_of(group, resource)
+            return self._put(group, resource, obj, "MODIFIED" if exists else "ADDED")
+
+    def schedule(
+        self,
+        delay: float,
+        group: str,
+        resource: str,
+        namespace: str,
+        name: str,
+        patch: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Merge a patch into an object after a delay, like a controller would,
+        by default the ready status of its kind.
+        """
+
+        def fire() -> None:
+            self._timers.discard(timer)
+            self._apply_scheduled(group, resource, namespace, name, patch)
+
+        timer = threading.Timer(delay, fire)
+        timer.daemon = True
+        self._timers.add(timer)
+        timer.start()
+
+    def _apply_scheduled(
+        self,
+        group: str,
+        resource: str,
+        namespace: str,
+        name: str,
+        patch: Optional[Dict[str, Any]],
+    ) -> None:
+        with self._lock:
+            obj = self._objects_of(group, resource).get((namespace, name))
+            if obj is None:
+                return
+            if patch is None:
+                if resource not in _READY_STATUS:
+                    return
+                status = _READY_STATUS[resource](obj)
+                if status is None:
+                    return
+                patch = {"status": status}
+            self._put(group, resource, _merge(copy.deepcopy(obj), patch), "MODIFIED")
+
+    def close(self) -> None:
+        """
+        Cancel the scheduled changes and end the open watches.
+        """
+        for timer in list(self._timers):
+            timer.cancel()
+        self._timers.clear()
+        with self._lock:
+            self._closed = True
+            self._changed.notify_all()
+
+    def _next_resource_version(self) -> str:
+        self._resource_version += 1
+        return str(self._resource_version)
+
+    def _put(
+        self, group: str, resource: str, obj: Dict[str, Any], event_type: str
+    ) -> Dict[str, Any]:
+        metadata = obj.setdefault("metadata", {})
+        metadata.setdefault("uid", str(uuid.uuid4()))
+        metadata.setdefault(
+            "creationTimestamp",
+            datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        )
+        metadata["resourceVersion"] = self._next_resource_version()
+        key = (metadata.get("namespace", ""), metadata["name"])
+        self._objects.setdefault((group, resource), {})[key] = obj
+        self._record(group, resource, event_type, obj)
+        return obj
+
+    def _record(self, group: str, resource: str, event_type: str, obj: Dict) -> None:
+        if len(self._events) == self._events.maxlen:
+            self._compacted = self._events[0].resource_version
+        self._events.append(
+            _Event(self._resource_version, group, resource, event_type, obj)
+        )
+        self._changed.notify_all()
+
+    def _objects_of(self, group: str, resource: str) -> Dict[Key, Dict]:
+        return self._objects.get((group, resource), {})
+
+    def _kind(self, group: str, resource: str) -> str:
+        if resource in KINDS:
+            return KINDS[resource]
+        for definition in self._objects_of(
+            "apiextensions.k8s.io", "customresourcedefinitions"
+        ).values():
+            spec = definition.get("spec") or {}
+            names = spec.get("names") or {}
+            if spec.get("group") == group and names.get("plural") == resource:
+                return names.get("kind", resource)
+
+        return resource.capitalize()
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        query: Dict[str, str],
+        body: Optional[Any],
+        content_type: Optional[str] = None,
+    ) -> Response:
+        """
+        Serve one API request, except watches, and return its status code and
+        JSON body.
+        """
+        parsed = _parse_path(path)
+        if parsed is None:
+            if path.rstrip("/") == "/version":
+                return 200, {"major": "1", "minor": "28", "gitVersion": "v1.28.0"}
+            with self._lock:
+                discovered = self._discover(path)
+            if discovered is not None:
+                return 200, discovered
+            return _status(404, "NotFound", f"the server could not find {path}")
+
+        group, version, resource, namespace, name, subresource = parsed
+        with self._lock:
+            if method == "GET" and not name:
+                return self._list(group, resource, namespace, query)
+            if method == "GET":
+                return self._get(group, resource, namespace, name)
+            if method == "POST":
+                return self._create(group, version, resource, namespace, body or {})
+            if method == "PUT":
+                return self._replace(
+                    group, resource, namespace, name, subresource, body or {}
+                )
+            if method == "PATCH":
+                return self._patch(
+                    group,
+                    version,
+                    resource,
+                    namespace,
+                    name,
+                    subresource,
+                    body or {},
+                    content_type,
+                )
+            if method == "DELETE" and name:
+                return self._delete(group, resource, namespace, name)
+
+        return _status(405, "MethodNotAllowed", f"{method} {path} is not supported")
+
+    def _api_resources(self) -> Dict[Tuple[str, str], Dict[str, Dict[str, Any]]]:
+        """
+        The API resources of the cluster, built-in and defined by the stored
+        CRDs, by group and version.
+        """
+        served = {
+            group_version: {
+                resource: {
+                    "name": resource,
+                    "singularName": KINDS[resource].lower(),
+                    "shortNames": SHORT_NAMES.get(resource, []),
+                    "kind": KINDS[resource],
+                    "namespaced": namespaced,
+                    "verbs": ["create", "delete", "get", "list", "patch", "watch"],
+                }
+                for resource, namespaced in resources.items()
+            }
+            for group_version, resources in API_RESOURCES.items()
+        }
+        for definition in self._objects_of(
+            "apiextensions.k8s.io", "customresourcedefinitions"
+        ).values():
+            spec = definition.get("spec") or {}
+            names = spec.get("names") or {}
+            for version in spec.get("versions") or []:
+                if not version.get("served", True):
+                    continue
+                served.setdefault((spec.get("group"), version["name"]), {})[
+                    names.get("plural")
+                ] = {
+                    "name": names.get("plural"),
+                    "singularName": names.get("singular", ""),
+                    "shortNames": names.get("shortNames", []),
+                    "kind": names.get("kind"),
+                    "namespaced": spec.get("scope") == "Namespaced",
+                    "verbs": ["create", "delete", "get", "list", "patch", "watch"],
+                }
+
+        return served
+
+    def _discover(self, path: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the discovery document of a path: /api, /apis, or the
+        resources of a group version.
+        """
+        segments = [segment for segment in path.split("/") if segment]
+        served = self._api_resources()
+        if segments == ["api"]:
+            return {"kind": "APIVersions", "versions": ["v1"]}
+        if segments == ["apis"]:
+            groups: Dict[str, List[str]] = {}
+            for group, version in served:
+                if group:
+                    groups.setdefault(group, []).append(version)
+            return {
+                "kind": "APIGroupList",
+                "apiVersion": "v1",
+                "groups": [
+                    {
+                        "name": group,
+                        "versions": [
+                            {"groupVersion": f"{group}/{v}", "version": v}
+                            for v in versions
+                        ],
+                        "preferredVersion": {
+                            "groupVersion": f"{group}/{versions[0]}",
+                            "version": versions[0],
+                        },
+                    }
+                    for group, versions in groups.items()
+                ],
+            }
+        if segments[:1] == ["api"] and len(segments) == 2:
+            group, version = "", segments[1]
+        elif segments[:1] == ["apis"] and len(segments) == 3:
+            group, version = segments[1], segments[2]
+        else:
+            return None
+        if (group, version) not in served:
+            return None
+
+        return {
+            "kind": "APIResourceList",
+            "apiVersion": "v1",
+            "groupVersion": f"{group}/{version}" if group else version,
+            "resources": list(served[(group, version)].values()),
+        }
+
+    def _get(self, group: str, resource: str, namespace: str, name: str) -> Response:
+        obj = self._objects_of(group, resource).get((namespace, name))
+        if obj is None:
+            return _status(404, "NotFound", f'{resource} "{name}" not found')
+
+        return 200, obj
+
+    def _list(
+        self, group: str, resource: str, namespace: str, query: Dict[str, str]
+    ) -> Response:
+        objects = self._objects_of(group, resource)
+        keys = sorted(key for key in objects if not namespace or key[0] == namespace)
+        token = query.get("continue")
+        if token:
+            start = tuple(json.loads(base64.b64decode(token)))
+            keys = [key for key in keys if key > start]
+
+        matches = _matcher(query)
+        limit = int(query.get("limit") or 0)
+        items: List[Dict[str, Any]] = []
+        last_key = None
+        truncated = False
+        for index, key in enumerate(keys):
+            obj = objects[key]
+            if not matches(obj):
+                continue
+            items.append(obj)
+            last_key = key
+            if limit and len(items) == limit:
+                truncated = index + 1 < len(keys)
+                break
+
+        metadata = {"resourceVersion": str(self._resource_version)}
+        if truncated:
+            token = json.dumps(list(last_key)).encode()
+            metadata["continue"] = base64.b64encode(token).decode()
+
+        return 200, {
+            "kind": f"{self._kind(group, resource)}List",
+            "apiVersion": "v1",
+            "metadata": metadata,
+            "items": items,
+        }
+
+    def _create(
+        self,
+        group: str,
+        version: str,
+        resource: str,
+        namespace: str,
+        body: Dict[str, Any],
+    ) -> Response:
+        metadata = body.setdefault("metadata", {})
+        if namespace:
+            metadata["namespace"] = namespace
+        name = metadata.get("name")
+        if not name and metadata.get("generateName"):
+            name = metadata["name"] = metadata["generateName"] + uuid.uuid4().hex[:5]
+        if not name:
+            return _status(422, "Invalid", "metadata.name is required")
+        if (namespace, name) in self._objects_of(group, resource):
+            return _status(409, "AlreadyExists", f'{resource} "{name}" already exists')
+
+        body.setdefault("apiVersion", f"{group}/{version}" if group else version)
+        body.setdefault("kind", self._kind(group, resource))
+        metadata.pop("resourceVersion", None)
+        metadata["generation"] = 1
+        if resource in _INITIAL_STATUS:
+            body["status"] = _INITIAL_STATUS[resource](body)
+            self._settle(group, resource, body)
+        return 201, self._put(group, resource, body, "ADDED")
+
+    def _settle(self, group: str, resource: str, obj: Dict[str, Any]) -> None:
+        """
+        Make an object with a new spec ready, at once or on schedule.
+        """
+        if self._ready_after is None or resource not in _READY_STATUS:
+            return
+        if self._ready_after > 0:
+            metadata = obj["metadata"]
+            self.schedule(
+                self._ready_after,
+                group,
+                resource,
+                metadata.get("namespace", ""),
+                metadata["name"],
+            )
+            return
+
+        status = _READY_STATUS[resource](obj)
+        if status is not None:
+            obj["status"] = status
+
+    def _update(
+        self,
+        group: str,
+        resource: str,
+        current: Dict[str, Any],
+        obj: Dict[str, Any],
+        subresource: str,
+    ) -> Response:
+        """
+        Store a new version of an object, keeping its status when the cluster
+        owns it, unless updating the status subresource.
+        """
+        if subresource == "status":
+            obj = dict(current, status=obj.get("status"))
+            obj["metadata"] = dict(current["metadata"])
+        elif subresource:
+            return _status(
+                404, "NotFound", f"{resource}/{subresource} is not supported"
+            )
+
+        metadata = obj.setdefault("metadata", {})
+        for key in ("name", "namespace", "uid", "creationTimestamp"):
+            if key in current["metadata"]:
+                metadata[key] = current["metadata"][key]
+        generation = current["metadata"].get("generation", 1)
+        metadata["generation"] = generation
+        if not subresource and obj.get("spec") != current.get("spec"):
+            metadata["generation"] = generation + 1
+            if resource in _INITIAL_STATUS:
+                obj["status"] = _INITIAL_STATUS[resource](obj)
+                self._settle(group, resource, obj)
+        elif not subresource and resource in _INITIAL_STATUS:
+            obj["status"] = current.get("status")
+
+        return 200, self._put(group, resource, obj, "MODIFIED")
+
+    def _replace(
+        self,
+        group: str,
+        resource: str,
+        namespace: str,
+        name: str,
+        subresource: str,
+        body: Dict[str, Any],
+    ) -> Response:
+        current = self._objects_of(group, resource).get((namespace, name))
+        if current is None:
+            return _status(404, "NotFound", f'{resource} "{name}" not found')
+        resource_version = (body.get("metadata") or {}).get("resourceVersion")
+        if resource_version and resource_version != current["metadata"].get(
+            "resourceVersion"
+        ):
+            return _status(
+                409,
+                "Conflict",
+                f'Operation cannot be fulfilled on {resource} "{name}": the object '
+                "has been modified; please apply your changes to the latest version "
+                "and try again",
+            )
+
+        return self._update(group, resource, current, body, subresource)
+
+    def _patch(
+        self,
+        group: str,
+        version: str,
+        resource: str,
+        namespace: str,
+        name: str,
+        subresource: str,
+        body: Any,
+        content_type: Optional[str],
+    ) -> Response:
+        current = self._objects_of(group, resource).get((namespace, name))
+        if current is None:
+            if content_type == APPLY_PATCH_CONTENT_TYPE and not subresource:
+                # Server-side apply creates missing objects.
+                return self._create(group, version, resource, namespace, body)
+            return _status(404, "NotFound", f'{resource} "{name}" not found')
+
+        patched = copy.deepcopy(current)
+        try:
+            if isinstance(body, list):
+                _json_patch(patched, body)
+            else:
+                _merge(patched, body)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            return _status(422, "Invalid", f"Invalid patch: {e}")
+
+        return self._update(group, resource, current, patched, subresource)
+
+    def _delete(self, group: str, resource: str, namespace: str, name: str) -> Response:
+        obj = self._objects_of(group, resource).pop((namespace, name), None)
+        if obj is None:
+            return _status(404, "NotFound", f'{resource} "{name}" not found')
+
+        deleted = dict(obj, metadata=dict(obj["metadata"]))
+        deleted["metadata"]["resourceVersion"] = self._next_resource_version()
+        self._record(group, resource, "DELETED", deleted)
+        return 200, deleted
+
+    def watch(self, path: str, query: Dict[str, str]) -> "_WatchStream":
+        """
+        Open a watch on the collection of an API path, streaming its events
+        as JSON lines from the resourceVersion of the query.
+        """
+        return _WatchStream(self, path, query)
+
+
+def _matcher(query: Dict[str, str]) -> Callable[[Dict[str, Any]], bool]:
+    label_selector = query.get("labelSelector")
+    field_selector = query.get("fieldSelector")
+    selector = LabelSelector.parse(label_selector) if label_selector else None
+
+    def matches(obj: Dict[str, Any]) -> bool:
+        if selector is not None and not selector.matches(obj["metadata"].get("labels")):
+            return False
+
+        return not field_selector or _field_matches(obj, field_selector)
+
+    return matches
+
+
+class _Expired(Exception):
+    pass
+
+
+class _WatchStream:
+    """
+    The events of a watch. Objects matching the selectors are only reported
+    while they match, without the DELETED event the apiserver sends when an
+    object stops matching.
+    """
+
+    def __init__(self, cluster: FakeCluster, path: str, query: Dict[str, str]) -> None:
+        self._cluster = cluster
+        self._closed = False
+        self._matches = _matcher(query)
+        timeout = query.get("timeoutSeconds")
+        self._deadline = time.monotonic() + float(timeout) if timeout else None
+        parsed = _parse_path(path)
+        self._initial: List[Tuple[str, Dict]] = []
+        if parsed is None:
+            self._resource = None
+            return
+
+        group, _, resource, namespace, _, _ = parsed
+        self._resource = (group, resource, namespace)
+        resource_version = query.get("resourceVersion")
+        with cluster._lock:
+            if resource_version and resource_version != "0":
+                self._resource_version = int(resource_version)
+                return
+            # Without a resourceVersion, a watch starts with the current objects.
+            self._resource_version = cluster._resource_version
+            for key, obj in sorted(cluster._objects_of(group, resource).items()):
+                if not namespace or key[0] == namespace:
+                    self._initial.append(("ADDED", obj))
+
+    def _relevant(self, event: _Event) -> bool:
+        group, resource, namespace = self._resource
+        return (
+            event.group == group
+            and event.resource == resource
+            and (
+                not namespace or event.object["metadata"].get("namespace") == namespace
+            )
+            and self._matches(event.object)
+        )
+
+    def _pending(self) -> Optional[List[_Event]]:
+        """
+        Wait for the events after the last one sent, None when the watch ends.
+        """
+        cluster = self._cluster
+        with cluster._lock:
+            while True:
+                if self._resource_version < cluster._compacted:
+                    raise _Expired()
+                events = []
+                for event in reversed(cluster._events):
+                    if event.resource_version <= self._resource_version:
+                        break
+                    events.append(event)
+                if events:
+                    events.reverse()
+                    return events
+
+                remaining = None
+                if self._deadline is not None:
+                    remaining = self._deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                if self._closed or cluster._closed:
+                    return None
+                cluster._changed.wait(remaining)
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self._resource is None:
+            yield _event_line("ERROR", _status(404, "NotFound", "not found")[1])
+            return
+
+        for event_type, obj in self._initial:
+            if self._matches(obj):
+                yield _event_line(event_type, obj)
+        while True:
+            try:
+                events = self._pending()
+            except _Expired:
+                message = f"too old resource version: {self._resource_version}"
+                yield _event_line("ERROR", _status(410, "Expired", message)[1])
+                return
+            if events is None:
+                return
+            for event in events:
+                self._resource_version = event.resource_version
+                if self._relevant(event):
+                    yield _event_line(event.type, event.object)
+
+    def close(self) -> None:
+        with self._cluster._lock:
+            self._closed = True
+            self._cluster._changed.notify_all()
+
+
+def _event_line(event_type: str, obj: Dict[str, Any]) -> bytes:
+    return _dumps({"type": event_type, "object": obj}) + b"\n"
+
+
+class FakeResponse:
+    """
+    The part of urllib3's HTTPResponse the Kubernetes client uses, over a
+    body or a stream of watch events.
+    """
+
+    def __init__(
+        self,
+        status: int,
+        body: bytes = b"",
+        stream: Optional[_WatchStream] = None,
+    ) -> None:
+        self.status = status
+        self.reason = http.HTTPStatus(status).phrase
+        self._body = body
+        self._stream = stream
+        self.headers = {"Content-Type": "application/json"}
+        if stream is None:
+            self.headers["Content-Length"] = str(len(body))
+
+    @property
+    def data(self) -> bytes:
+        if self._stream is not None:
+            self._body, self._stream = b"".join(self._stream), None
+        return self._body
+
+    def getheaders(self) -> Dict[str, str]:
+        return self.headers
+
+    def getheader(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.headers.get(name, default)
+
+    def stream(self, amt: Optional[int] = None, decode_content: bool = True):
+        if self._stream is not None:
+            yield from self._stream
+        elif self._body:
+            yield self._body
+
+    def read(self, *args, **kwargs) -> bytes:
+        return self.data
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+
+    def release_conn(self) -> None:
+        self.close()
+
+
+class FakeTransport(RESTClientObject):
+    """
+    The REST client of an ApiClient, serving its requests from a FakeCluster
+    instead of an apiserver.
+    """
+
+    def __init__(self, cluster: FakeCluster) -> None:
+        # There is no connection pool to set up.
+        self.cluster = cluster
+        self.pool_manager = None
+
+    def request(
+        self,
+        method,
+        url,
+        query_params=None,
+        headers=None,
+        body=None,
+        post_params=None,
+        _preload_content=True,
+        _request_timeout=None,
+    ):
+        path = urlsplit(url).path
+        query = {key: str(value) for key, value in query_params or ()}
+        if method == "GET" and query.get("watch", "").lower() == "true":
+            response = FakeResponse(200, stream=self.cluster.watch(path, query))
+        else:
+            # Round-trip the body through JSON like the wire does, so the
+            # cluster never shares objects with the caller.
+            if body is not None:
+                body = _loads(_dumps(body))
+            content_type = (headers or {}).get("Content-Type")
+            status, payload = self.cluster.handle(
+                method, path, query, body, content_type
+            )
+            response = FakeResponse(status, _dumps(payload))
+
+        if _preload_content:
+            response = RESTResponse(response)
+            response.data = response.data.decode("utf8")
+        if not 200 <= response.status <= 299:
+            raise exceptions.ApiException(http_resp=response)
+
+        return response
@@ -0,0 +1,98 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterator, List, Tuple, Union
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
+
+class ManifestYamlLoader(_SafeLoader):
+    """
+    The libyaml safe loader when available, without the '=' value resolver,
+    like the loader of kubernetes.utils.create_from_yaml.
+    """
+
+    yaml_implicit_resolvers = _SafeLoader.yaml_implicit_resolvers.copy()
+    yaml_implicit_resolvers.pop("=", None)
+
+
+class ManifestLoader:
+    """
+    Parse yaml manifests and memoize the parsed documents.
+    Entries are keyed by path, modification time and content hash, so an
+    edited file is parsed again, and the least recently used entries are
+    evicted beyond max_entries. Cached documents are shared between callers
+    and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int = 64) -> None:
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple[str, int, str], Tuple[dict, ...]]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def iter_documents(self, path: Union[str, Path]) -> Iterator[dict]:
+        """
+        Yield the non-empty documents of a manifest. On a cache miss every
+        document is yielded as soon as it is parsed, so callers can start
+        working before the whole file is parsed.
+        """
+        path = Path(path).resolve()
+        mtime = path.stat().st_mtime_ns
+        content = path.read_bytes()
+        key = (str(path), mtime, hashlib.sha256(content).hexdigest())
+        with self._lock:
+            documents = self._cache.get(key)
+            if documents is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if documents is not None:
+            yield from documents
+            return
+
+        parsed = []
+        for document in yaml.load_all(content, Loader=ManifestYamlLoader):
+            if document is None:
+                continue
+            parsed.append(document)
+            yield document
+
+        self._store(key, tuple(parsed))
+
+    def load(self, path: Union[str, Path]) -> List[dict]:
+        return list(self.iter_documents(path))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _store(self, key: Tuple[str, int, str], documents: Tuple[dict, ...]) -> None:
+        with self._lock:
+            for stale in [k for k in self._cache if k[0] == key[0] and k != key]:
+                del self._cache[stale]
+            self._cache[key] = documents
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._max_entries:
+                self._cache.popitem(last=False)
+
+
+_default_loader = ManifestLoader()
+
+
+def load_manifests(path: Union[str, Path]) -> Iterator[dict]:
+    """
+    Stream the documents of a manifest through the process-wide loader.
+    """
+    return _default_loader.iter_documents(path)
@@ -0,0 +1,335 @@
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from kubernetes.client import ApiClient, exceptions
+
+from ._apply import APPLY_PATCH_CONTENT_TYPE
+
+# The latency buckets of client-go's rest_client_request_duration_seconds.
+LATENCY_BUCKETS = (0.005, 0.025, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+Labels = Tuple[str, str, str]
+
+
+def request_labels(
+    method: str, url: str, query_params=None, headers=None
+) -> Tuple[str, str, str]:
+    """
+    Return the (verb, resource, namespace) of a request from its method and
+    URL, the way the apiserver names them in its own metrics. The resource
+    is the plural name, with the subresource if any, like "pods/log".
+    """
+    segments = [segment for segment in urlsplit(url).path.split("/") if segment]
+    if segments[:1] == ["api"]:
+        segments = segments[2:]
+    elif segments[:1] == ["apis"]:
+        segments = segments[3:]
+    else:
+        segments = []
+
+    namespace = ""
+    if len(segments) > 2 and segments[0] == "namespaces":
+        namespace, segments = segments[1], segments[2:]
+    resource = "/".join(segments[:1] + segments[2:3])
+    has_name = len(segments) > 1
+
+    method = method.upper()
+    if method == "GET":
+        watch = any(
+            key == "watch" and str(value).lower() == "true"
+            for key, value in query_params or ()
+        )
+        verb = "watch" if watch else "get" if has_name else "list"
+    elif method == "POST":
+        verb = "create"
+    elif method == "PUT":
+        verb = "update"
+    elif method == "PATCH":
+        content_type = (headers or {}).get("Content-Type", "")
+        verb = "apply" if content_type == APPLY_PATCH_CONTENT_TYPE else "patch"
+    elif method == "DELETE":
+        verb = "delete" if has_name else "deletecollection"
+    else:
+        verb = method.lower()
+
+    return verb, resource, namespace
+
+
+class MetricsSink:
+    """
+    The interface of the receivers of the client metrics. Implement it to
+    forward the measurements to another metrics system.
+    """
+
+    def observe_request(
+        self,
+        labels: Labels,
+        code: str,
+        seconds: float,
+        response_bytes: Optional[int],
+    ) -> None:
+        raise NotImplementedError
+
+    def observe_deserialization(self, labels: Labels, seconds: float) -> None:
+        raise NotImplementedError
+
+
+class Histogram:
+    """
+    A cumulative histogram in the Prometheus sense.
+    """
+
+    def __init__(self, buckets: Iterable[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> List[int]:
+        counts = []
+        total = 0
+        for count in self.counts:
+            total += count
+            counts.append(total)
+
+        return counts
+
+
+def _histogram(
+    histograms: Dict[Labels, Histogram], labels: Labels, buckets: Tuple
+) -> Histogram:
+    histogram = histograms.get(labels)
+    if histogram is None:
+        histogram = histograms[labels] = Histogram(buckets)
+
+    return histogram
+
+
+class InMemoryMetrics(MetricsSink):
+    """
+    Aggregate the client metrics in memory, labeled by verb, resource and
+    namespace: request latency and response size histograms, request and
+    error counts by status code, and deserialization time histograms.
+    """
+
+    def __init__(
+        self,
+        latency_buckets: Iterable[float] = LATENCY_BUCKETS,
+        size_buckets: Iterable[float] = SIZE_BUCKETS,
+    ) -> None:
+        self._latency_buckets = tuple(latency_buckets)
+        self._size_buckets = tuple(size_buckets)
+        self._lock = threading.Lock()
+        self.request_duration: Dict[Labels, Histogram] = {}
+        self.response_size: Dict[Labels, Histogram] = {}
+        self.deserialization_duration: Dict[Labels, Histogram] = {}
+        self.requests: Dict[Tuple[str, str, str, str], int] = {}
+        self.errors: Dict[Tuple[str, str, str, str], int] = {}
+
+    def observe_request(
+        self,
+        labels: Labels,
+        code: str,
+        seconds: float,
+        response_bytes: Optional[int],
+    ) -> None:
+        with self._lock:
+            _histogram(self.request_duration, labels, self._latency_buckets).observe(
+                seconds
+            )
+            if response_bytes is not None:
+                _histogram(self.response_size, labels, self._size_buckets).observe(
+                    response_bytes
+                )
+            key = labels + (code,)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            if not code.startswith("2"):
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+    def observe_deserialization(self, labels: Labels, seconds: float) -> None:
+        with self._lock:
+            _histogram(
+                self.deserialization_duration, labels, self._latency_buckets
+            ).observe(seconds)
+
+    def to_prometheus(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        with self._lock:
+            _render_histograms(
+                lines,
+                "kubeclient_request_duration_seconds",
+                "Latency of the requests to the apiserver.",
+                self.request_duration,
+            )
+            _render_counters(
+                lines,
+                "kubeclient_requests_total",
+                "Requests to the apiserver by status code.",
+                self.requests,
+            )
+            _render_counters(
+                lines,
+                "kubeclient_request_errors_total",
+                "Failed requests to the apiserver by status code.",
+                self.errors,
+            )
+            _render_histograms(
+                lines,
+                "kubeclient_response_size_bytes",
+                "Size of the responses of the apiserver.",
+                self.response_size,
+            )
+            _render_histograms(
+                lines,
+                "kubeclient_deserialization_duration_seconds",
+                "Time spent deserializing responses into models.",
+                self.deserialization_duration,
+            )
+
+        return "\n".join(lines) + "\n"
+
+
+_LABEL_NAMES = ("verb", "resource", "namespace", "code")
+
+
+def _format_labels(values: Iterable[str], extra: str = "") -> str:
+    labels = [f'{name}="{_escape(value)}"' for name, value in zip(_LABEL_NAMES, values)]
+    if extra:
+        labels.append(extra)
+
+    return "{" + ",".join(labels) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_bound(bound: float) -> str:
+    return str(int(bound)) if float(bound).is_integer() else str(bound)
+
+
+def _render_histograms(
+    lines: List[str], name: str, description: str, histograms: Dict[Labels, Histogram]
+) -> None:
+    lines.append(f"# HELP {name} {description}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, histogram in sorted(histograms.items()):
+        bounds = [_format_bound(bound) for bound in histogram.buckets] + ["+Inf"]
+        for bound, count in zip(bounds, histogram.cumulative_counts()):
+            le = f'le="{bound}"'
+            lines.append(f"{name}_bucket{_format_labels(labels, le)} {count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+
+def _render_counters(
+    lines: List[str], name: str, description: str, counters: Dict[Tuple, int]
+) -> None:
+    lines.append(f"# HELP {name} {description}")
+    lines.append(f"# TYPE {name} counter")
+    for labels, count in sorted(counters.items()):
+        lines.append(f"{name}{_format_labels(labels)} {count}")
+
+
+def start_metrics_server(
+    metrics: InMemoryMetrics, port: int, addr: str = "0.0.0.0"
+) -> ThreadingHTTPServer:
+    """
+    Serve the metrics in the Prometheus text format on /metrics from a
+    daemon thread. Call shutdown() on the returned server to stop it.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.to_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((addr, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _response_bytes(response, preloaded: bool) -> Optional[int]:
+    length = response.getheader("Content-Length")
+    if length is not None:
+        return int(length)
+    if not preloaded:
+        # Reading the data of a streamed response, like a watch, would
+        # consume it before the caller.
+        return None
+    data = getattr(response, "data", None)
+    if isinstance(data, (str, bytes)):
+        return len(data)
+
+    return None
+
+
+def instrument(api_client: ApiClient, sink: MetricsSink) -> None:
+    """
+    Record the metrics of every request and deserialization of an ApiClient.
+    """
+    current = threading.local()
+    rest_client = api_client.rest_client
+    request = rest_client.request
+
+    def measured_request(method, url, *args, **kwargs):
+        labels = request_labels(
+            method, url, kwargs.get("query_params"), kwargs.get("headers")
+        )
+        current.labels = labels
+        start = time.perf_counter()
+        try:
+            response = request(method, url, *args, **kwargs)
+        except exceptions.ApiException as e:
+            sink.observe_request(
+                labels, str(e.status), time.perf_counter() - start, None
+            )
+            raise
+        except Exception:
+            sink.observe_request(labels, "error", time.perf_counter() - start, None)
+            raise
+
+        sink.observe_request(
+            labels,
+            str(response.status),
+            time.perf_counter() - start,
+            _response_bytes(response, kwargs.get("_preload_content", True)),
+        )
+        return response
+
+    deserialize = api_client.deserialize
+
+    def measured_deserialize(response, response_type):
+        start = time.perf_counter()
+        try:
+            return deserialize(response, response_type)
+        finally:
+            labels = getattr(current, "labels", None)
+            if labels is not None:
+                sink.observe_deserialization(labels, time.perf_counter() - start)
+
+    rest_client.request = measured_request
+    api_client.deserialize = measured_deserialize
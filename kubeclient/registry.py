@@ -0,0 +1,286 @@
+import logging
+import os
+import threading
+import time
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from kubernetes import client, config
+from kubernetes.config.config_exception import ConfigException
+from kubernetes.config.kube_config import (
+    ENV_KUBECONFIG_PATH_SEPARATOR,
+    KubeConfigLoader,
+    KubeConfigMerger,
+)
+
+_logger = logging.getLogger(__name__)
+
+IN_CLUSTER = "in-cluster"
+# Refresh ahead of the five minutes before expiry at which the Kubernetes
+# client would refresh expired credentials on the request path.
+DEFAULT_REFRESH_MARGIN = 360.0
+# The shortest delay between two refreshes of the same credentials, which
+# also spaces the retries of a failing credential plugin.
+_MIN_REFRESH_INTERVAL = 10.0
+
+Key = Tuple[str, Optional[str]]
+
+
+def _config_paths(config_file: Union[str, Path, None]) -> List[str]:
+    if config_file is None:
+        config_file = os.environ.get("KUBECONFIG", "~/.kube/config")
+    return [
+        os.path.expanduser(path)
+        for path in str(config_file).split(ENV_KUBECONFIG_PATH_SEPARATOR)
+        if path
+    ]
+
+
+def _modification_times(paths: List[str]) -> Tuple[Optional[float], ...]:
+    times = []
+    for path in paths:
+        try:
+            times.append(os.stat(path).st_mtime)
+        except OSError:
+            times.append(None)
+
+    return tuple(times)
+
+
+class _Credentials:
+    """
+    The configuration of one (kubeconfig, context), and the loader which
+    refreshes its credentials.
+    """
+
+    def __init__(
+        self, paths: List[str], context: Optional[str], persist_config: bool = True
+    ) -> None:
+        self.paths = paths
+        self.context = context
+        self.persist_config = persist_config
+        self.modification_times = _modification_times(paths)
+        self.configuration = client.Configuration()
+        self.api_client: Optional[client.ApiClient] = None
+        self.refresh_at: Optional[float] = None
+        self._expires_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._loader: Optional[KubeConfigLoader] = None
+
+    def load(self) -> None:
+        if not self.paths:
+            # Load the service account of the pod, whose refresh hook
+            # re-reads the projected token file.
+            config.load_incluster_config(client_configuration=self.configuration)
+            return
+
+        merger = KubeConfigMerger(ENV_KUBECONFIG_PATH_SEPARATOR.join(self.paths))
+        if merger.config is None:
+            raise ConfigException(
+                f"Invalid kube-config file {', '.join(self.paths)}. "
+                "No configuration found."
+            )
+        self._loader = KubeConfigLoader(
+            config_dict=merger.config,
+            active_context=self.context,
+            config_base_path=None,
+            config_persister=partial(self._persist, merger)
+            if self.persist_config
+            else None,
+        )
+        self.refresh()
+
+    def _persist(self, merger: KubeConfigMerger) -> None:
+        """
+        Write the refreshed tokens, like those of an OIDC provider, back to
+        the kubeconfig, like config.load_kube_config. The write is not taken
+        for a change of the kubeconfig requiring a reload.
+        """
+        merger.save_changes()
+        self.modification_times = _modification_times(self.paths)
+
+    def refresh(self) -> None:
+        """
+        Run the authentication of the kubeconfig user again, like its exec
+        plugin, and schedule the next refresh ahead of the expiry.
+        """
+        with self._lock:
+            self._loader.load_and_set(self.configuration)
+            if self.configuration.refresh_api_key_hook is not None:
+                self.configuration.refresh_api_key_hook = self._refresh_if_expired
+            expiry = self._loader.__dict__.get("expiry")
+            self._expires_at = expiry.timestamp() if expiry is not None else None
+
+    def schedule(self, margin: float) -> None:
+        if self._expires_at is None:
+            self.refresh_at = None
+        else:
+            self.refresh_at = max(
+                self._expires_at - margin, time.time() + _MIN_REFRESH_INTERVAL
+            )
+
+    def _refresh_if_expired(self, configuration: client.Configuration) -> None:
+        # The background refresh normally runs well before, this only covers
+        # a refresh that failed or has not run yet.
+        if self._expires_at is not None and time.time() >= self._expires_at:
+            self.refresh()
+
+
+class ClientRegistry:
+    """
+    A process-wide cache of the Kubernetes configurations and ApiClients, by
+    kubeconfig path and context. A kubeconfig is parsed, and its credential
+    plugins run, once per context instead of once per client; it is reloaded
+    when the file changes. Credentials with an expiry, like the tokens of
+    exec plugins, are refreshed in the background before they expire.
+    The global default configuration of the Kubernetes client is never set.
+    refresh_margin:Optional: How long in seconds before their expiry the
+        credentials are refreshed.
+    persist_config:Optional: Write the refreshed tokens of the auth providers
+        back to the kubeconfig, like config.load_kube_config.
+    """
+
+    def __init__(
+        self,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        persist_config: bool = True,
+    ) -> None:
+        self._refresh_margin = refresh_margin
+        self._persist_config = persist_config
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._credentials: Dict[Key, _Credentials] = {}
+        self._refresher: Optional[threading.Thread] = None
+        self._closed = False
+
+    def configuration(
+        self,
+        config_file: Union[str, Path, None] = None,
+        context: Optional[str] = None,
+        in_cluster: bool = False,
+    ) -> client.Configuration:
+        """
+        Return the shared configuration of a kubeconfig and context, or of
+        the service account of the pod with in_cluster.
+        config_file:Optional: The kubeconfig, KUBECONFIG or ~/.kube/config by
+            default.
+        context:Optional: The context, the current context by default.
+        """
+        return self._get(config_file, context, in_cluster).configuration
+
+    def api_client(
+        self,
+        config_file: Union[str, Path, None] = None,
+        context: Optional[str] = None,
+        in_cluster: bool = False,
+    ) -> client.ApiClient:
+        """
+        Return the shared ApiClient of a kubeconfig and context, whose
+        connection pool is reused by every caller.
+        """
+        credentials = self._get(config_file, context, in_cluster)
+        with self._lock:
+            if credentials.api_client is None:
+                credentials.api_client = client.ApiClient(credentials.configuration)
+            return credentials.api_client
+
+    def _get(
+        self,
+        config_file: Union[str, Path, None],
+        context: Optional[str],
+        in_cluster: bool,
+    ) -> _Credentials:
+        paths = [] if in_cluster else _config_paths(config_file)
+        key = (ENV_KUBECONFIG_PATH_SEPARATOR.join(paths) or IN_CLUSTER, context)
+        with self._lock:
+            credentials = self._credentials.get(key)
+            if (
+                credentials is not None
+                and credentials.modification_times == _modification_times(paths)
+            ):
+                return credentials
+
+        # Loading runs the credential plugins, which can take a while, so it
+        # is done outside of the lock; concurrent first loads of the same key
+        # keep the first one stored.
+        credentials = _Credentials(paths, context, self._persist_config)
+        credentials.load()
+        credentials.schedule(self._refresh_margin)
+        with self._lock:
+            current = self._credentials.get(key)
+            if (
+                current is not None
+                and current.modification_times == credentials.modification_times
+            ):
+                return current
+            self._credentials[key] = credentials
+            if credentials.refresh_at is not None:
+                self._start_refresher()
+                self._changed.notify_all()
+
+        return credentials
+
+    def invalidate(
+        self,
+        config_file: Union[str, Path, None] = None,
+        context: Optional[str] = None,
+        in_cluster: bool = False,
+    ) -> None:
+        """
+        Forget a configuration, so the next client loads it again.
+        """
+        paths = [] if in_cluster else _config_paths(config_file)
+        key = (ENV_KUBECONFIG_PATH_SEPARATOR.join(paths) or IN_CLUSTER, context)
+        with self._lock:
+            self._credentials.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._credentials.clear()
+
+    def close(self) -> None:
+        """
+        Stop the background refresh and forget every configuration.
+        """
+        with self._lock:
+            self._closed = True
+            self._credentials.clear()
+            self._changed.notify_all()
+
+    def _start_refresher(self) -> None:
+        if self._refresher is None or not self._refresher.is_alive():
+            self._closed = False
+            self._refresher = threading.Thread(
+                target=self._refresh_forever, name="kubeclient-credentials", daemon=True
+            )
+            self._refresher.start()
+
+    def _refresh_forever(self) -> None:
+        while True:
+            with self._lock:
+                if self._closed:
+                    return
+                now = time.time()
+                scheduled = [
+                    credentials
+                    for credentials in self._credentials.values()
+                    if credentials.refresh_at is not None
+                ]
+                due = [c for c in scheduled if c.refresh_at <= now]
+                if not due:
+                    next_refresh = min((c.refresh_at for c in scheduled), default=None)
+                    self._changed.wait(
+                        None if next_refresh is None else next_refresh - now
+                    )
+                    continue
+
+            for credentials in due:
+                try:
+                    credentials.refresh()
+                except Exception as e:
+                    _logger.error(f"Failed to refresh Kubernetes credentials: {e}")
+                credentials.schedule(self._refresh_margin)
+
+
+default_registry = ClientRegistry()
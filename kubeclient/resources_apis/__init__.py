@@ -1,13 +1,20 @@
-from .cluster_role_api import ClusterRole  # noqa: F401
-from .cluster_role_binding_api import ClusterRoleBinding  # noqa: F401
-from .custom_resource_api import CustomResource  # noqa: F401
-from .daemonset_api import DaemonSet  # noqa: F401
-from .deployment_api import Deployment  # noqa: F401
-from .namespace_api import Namespace  # noqa: F401
-from .pod_api import Pod  # noqa: F401
-from .replicaset_api import ReplicaSet  # noqa: F401
-from .resource_api import ResourceApi  # noqa: F401
-from .service_api import Service  # noqa: F401
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from .cluster_role_api import ClusterRole  # noqa: F401
+    from .cluster_role_binding_api import ClusterRoleBinding  # noqa: F401
+    from .custom_resource_api import CustomResource  # noqa: F401
+    from .daemonset_api import DaemonSet  # noqa: F401
+    from .deployment_api import Deployment  # noqa: F401
+    from .generic_resource_api import GenericResource  # noqa: F401
+    from .namespace_api import Namespace  # noqa: F401
+    from .pod_api import Pod  # noqa: F401
+    from .replicaset_api import ReplicaSet  # noqa: F401
+    from .resource_api import ResourceApi  # noqa: F401
+    from .service_api import Service  # noqa: F401
+    from .statefulset_api import StatefulSet  # noqa: F401
 
 # from .secret_api import Secret
 # from .config_map_api import ConfigMap
@@ -15,4 +22,35 @@ from .service_api import Service  # noqa: F401
 # from .persistent_volume_api import PersistentVolume
 # from .job_api import Job
 # from .cron_job_api import CronJob
-from .statefulset_api import StatefulSet  # noqa: F401
+
+__getattr__, __dir__ = lazy_attributes(
+    globals(),
+    {
+        "ClusterRole": ".cluster_role_api",
+        "ClusterRoleBinding": ".cluster_role_binding_api",
+        "CustomResource": ".custom_resource_api",
+        "DaemonSet": ".daemonset_api",
+        "Deployment": ".deployment_api",
+        "GenericResource": ".generic_resource_api",
+        "Namespace": ".namespace_api",
+        "Pod": ".pod_api",
+        "ReplicaSet": ".replicaset_api",
+        "ResourceApi": ".resource_api",
+        "Service": ".service_api",
+        "StatefulSet": ".statefulset_api",
+    },
+)
+__all__ = [
+    "ClusterRole",
+    "ClusterRoleBinding",
+    "CustomResource",
+    "DaemonSet",
+    "Deployment",
+    "GenericResource",
+    "Namespace",
+    "Pod",
+    "ReplicaSet",
+    "ResourceApi",
+    "Service",
+    "StatefulSet",
+]
@@ -0,0 +1,173 @@
+import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent import futures
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+_logger = logging.getLogger(__name__)
+
+# The size of the worker pool shared by every batch of the process, which
+# bounds the number of concurrent batch requests whatever the number of
+# batches running at the same time.
+BATCH_WORKERS = 32
+DEFAULT_CONCURRENCY = 16
+
+_executor: Optional[futures.ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _shared_executor() -> futures.ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = futures.ThreadPoolExecutor(
+                max_workers=BATCH_WORKERS, thread_name_prefix="kubeclient-batch"
+            )
+        return _executor
+
+
+class BatchResult:
+    """
+    The outcome of an operation on one item of a batch. The error is the
+    exception the request raised, like the ApiException with its status and
+    body. An item skipped after a failure with fail_fast has neither a
+    response nor an error.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        name: Optional[str],
+        response=None,
+        error: Optional[Exception] = None,
+        skipped: bool = False,
+    ) -> None:
+        self.index = index
+        self.name = name
+        self.response = response
+        self.error = error
+        self.skipped = skipped
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.skipped
+
+    def __repr__(self) -> str:
+        if self.skipped:
+            status = "skipped"
+        elif self.ok:
+            status = "ok"
+        else:
+            status = (
+                f"failed ({getattr(self.error, 'status', type(self.error).__name__)})"
+            )
+        return f"<BatchResult {self.index} {self.name}: {status}>"
+
+
+class BatchResults:
+    """
+    The per-item outcomes of a batch, in the order of the items, truthy when
+    all of them succeeded.
+    """
+
+    def __init__(self, results: List[BatchResult]) -> None:
+        self._results = results
+
+    def __iter__(self) -> Iterator[BatchResult]:
+        return iter(self._results)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __getitem__(self, index: int) -> BatchResult:
+        return self._results[index]
+
+    def __bool__(self) -> bool:
+        return all(result.ok for result in self._results)
+
+    @property
+    def succeeded(self) -> List[BatchResult]:
+        return [result for result in self._results if result.ok]
+
+    @property
+    def failed(self) -> List[BatchResult]:
+        return [
+            result
+            for result in self._results
+            if result.error is not None and not result.skipped
+        ]
+
+    @property
+    def skipped(self) -> List[BatchResult]:
+        return [result for result in self._results if result.skipped]
+
+
+def run_batch(
+    call: Callable[[Any], Any],
+    items: Iterable[Any],
+    name_of: Callable[[Any], Optional[str]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    fail_fast: bool = False,
+    ordering_key: Optional[Callable[[Any], Hashable]] = None,
+) -> BatchResults:
+    """
+    Run a call on every item over the shared worker pool, with at most
+    concurrency calls of this batch in flight.
+    Items with the same ordering key run one after the other in their order,
+    items with different keys run concurrently. With fail_fast, no item is
+    started after the first failure and the remaining ones are skipped.
+    """
+    items = list(items)
+    chains: Dict[Hashable, Deque[Tuple[int, Any]]] = OrderedDict()
+    for index, item in enumerate(items):
+        key = ordering_key(item) if ordering_key is not None else index
+        chains.setdefault(key, deque()).append((index, item))
+
+    def run(index: int, item) -> BatchResult:
+        try:
+            return BatchResult(index, name_of(item), call(item))
+        except Exception as e:
+            _logger.error(f"Batch item {index} {name_of(item)} failed: {e}")
+            return BatchResult(index, name_of(item), error=e)
+
+    executor = _shared_executor()
+    ready = deque(chains.values())
+    in_flight: Dict[futures.Future, Deque[Tuple[int, Any]]] = {}
+    results: List[Optional[BatchResult]] = [None] * len(items)
+    failed = False
+    while ready or in_flight:
+        while ready and len(in_flight) < max(concurrency, 1) and not failed:
+            chain = ready.popleft()
+            index, item = chain.popleft()
+            in_flight[executor.submit(run, index, item)] = chain
+        if not in_flight:
+            break
+
+        done, _ = futures.wait(in_flight, return_when=futures.FIRST_COMPLETED)
+        for future in done:
+            chain = in_flight.pop(future)
+            result = future.result()
+            results[result.index] = result
+            failed = failed or (fail_fast and not result.ok)
+            if chain:
+                ready.append(chain)
+
+    return BatchResults(
+        [
+            result
+            if result is not None
+            else BatchResult(index, name_of(items[index]), skipped=True)
+            for index, result in enumerate(results)
+        ]
+    )
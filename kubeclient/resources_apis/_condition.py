@@ -1,6 +1,13 @@
+import asyncio
+import heapq
+import inspect
+import itertools
 import logging
+import random
+import threading
 import time
-from typing import Callable, Optional
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
 
 _logger = logging.getLogger(__name__)
 
@@ -8,6 +15,11 @@ _logger = logging.getLogger(__name__)
 class Condition:
     """
     This class is used to represent a condition in a Kubernetes resource.
+    backoff:Optional: The factor the interval is multiplied by after every
+        failed check.
+    max_interval:Optional: The cap of the interval growing with backoff.
+    jitter:Optional: The fraction by which each interval is randomly shortened
+        or lengthened, so concurrent waiters do not check in lockstep.
     """
 
     def __init__(
@@ -17,6 +29,9 @@ class Condition:
         timeout: Optional[int] = 0,
         interval: Optional[float] = 0.5,
         *args,
+        backoff: float = 1.0,
+        max_interval: Optional[float] = None,
+        jitter: float = 0.0,
         **kwargs,
     ) -> None:
         if not callable(fn):
@@ -26,6 +41,9 @@ class Condition:
         self._fn = fn
         self._timeout = timeout
         self._interval = interval
+        self._backoff = backoff
+        self._max_interval = max_interval
+        self._jitter = jitter
         self._args = args
         self._kwargs = kwargs
 
@@ -39,6 +57,29 @@ class Condition:
         self._last_check_result = self._fn(*self._args, **self._kwargs)
         return self._last_check_result
 
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def timeout(self) -> Optional[float]:
+        return self._timeout
+
+    def delay(self, attempt: int) -> float:
+        """
+        Return the time to wait after the given number of failed checks.
+        """
+        delay = self._interval * self._backoff**attempt
+        if self._max_interval is not None:
+            delay = min(delay, self._max_interval)
+        if self._jitter:
+            delay *= random.uniform(1 - self._jitter, 1 + self._jitter)
+
+        return max(delay, 0)
+
+    def _deadline(self, start: float) -> Optional[float]:
+        return None if self._timeout is None else start + self._timeout
+
     def wait(self) -> bool:
         """
         Wait for the condition to be true.
@@ -46,13 +87,241 @@ class Condition:
         interval:Optional: The interval in seconds between checks.
         """
         _logger.info(f"Waiting for condition {self._name} to be true")
-        start_time = time.time()
-        while True:
+        deadline = self._deadline(time.monotonic())
+        for attempt in itertools.count():
             if self._check():
                 return True
 
-            if time.time() - start_time > self._timeout:
+            if deadline is not None and time.monotonic() > deadline:
                 _logger.error(f"Timeout waiting for condition {self._name} to be true")
                 return False
 
-            time.sleep(self._interval)
+            time.sleep(self.delay(attempt))
+
+    async def wait_async(self) -> bool:
+        """
+        Wait for the condition to be true without blocking the event loop.
+        The condition function may be a coroutine function.
+        """
+        _logger.info(f"Waiting for condition {self._name} to be true")
+        deadline = self._deadline(time.monotonic())
+        for attempt in itertools.count():
+            result = self._fn(*self._args, **self._kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            self._last_check_result = result
+            if result:
+                return True
+
+            if deadline is not None and time.monotonic() > deadline:
+                _logger.error(f"Timeout waiting for condition {self._name} to be true")
+                return False
+
+            await asyncio.sleep(self.delay(attempt))
+
+
+def _resolve(future: Future, result: bool) -> None:
+    try:
+        future.set_result(result)
+    except InvalidStateError:  # cancelled or already resolved
+        pass
+
+
+class _Scheduled:
+    __slots__ = ("condition", "future", "deadline", "attempt")
+
+    def __init__(
+        self, condition: Condition, future: Future, deadline: Optional[float]
+    ) -> None:
+        self.condition = condition
+        self.future = future
+        self.deadline = deadline
+        self.attempt = 0
+
+
+class ConditionScheduler:
+    """
+    Wait for many conditions from a single timer thread instead of one
+    sleeping thread per condition. Checks run on a small thread pool when
+    they are due, on a monotonic clock, and every condition is rescheduled
+    with its own backoff and jitter, so the checks of concurrent waits are
+    spread over time. Waits return futures resolving to True when the
+    condition is met or False on timeout.
+    max_workers:Optional: The number of checks run concurrently.
+    """
+
+    def __init__(self, max_workers: int = 4) -> None:
+        self._queue: List = []
+        self._sequence = itertools.count()
+        self._wakeup = threading.Condition()
+        self._stopped = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="condition-check"
+        )
+        self._thread = threading.Thread(
+            target=self._run, name="condition-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> "ConditionScheduler":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    def submit(
+        self, condition: Condition, deadline: Optional[float] = None
+    ) -> "Future[bool]":
+        """
+        Start waiting for a condition and return a future of the result.
+        deadline:Optional: A time.monotonic() deadline shared with other
+            conditions, applied on top of the timeout of the condition.
+        """
+        now = time.monotonic()
+        own_deadline = condition._deadline(now)
+        if own_deadline is None or (deadline is not None and deadline < own_deadline):
+            own_deadline = deadline
+
+        future = Future()
+        _logger.info(f"Waiting for condition {condition.name} to be true")
+        self._schedule(_Scheduled(condition, future, own_deadline), now)
+        return future
+
+    def all_of(
+        self, conditions: Iterable[Condition], timeout: Optional[float] = None
+    ) -> "Future[bool]":
+        """
+        Wait for all the conditions, resolving to False as soon as one of
+        them times out.
+        timeout:Optional: A deadline in seconds shared by all the conditions.
+        """
+        return self._compose(conditions, timeout, short_circuit_on=False)
+
+    def any_of(
+        self, conditions: Iterable[Condition], timeout: Optional[float] = None
+    ) -> "Future[bool]":
+        """
+        Wait for any of the conditions, resolving to False once all of them
+        timed out.
+        timeout:Optional: A deadline in seconds shared by all the conditions.
+        """
+        return self._compose(conditions, timeout, short_circuit_on=True)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the scheduler and cancel the pending waits.
+        """
+        with self._wakeup:
+            self._stopped = True
+            pending, self._queue = self._queue, []
+            self._wakeup.notify()
+        for _, _, scheduled in pending:
+            scheduled.future.cancel()
+        self._executor.shutdown(wait=wait)
+        if wait:
+            self._thread.join()
+
+    def _compose(
+        self,
+        conditions: Iterable[Condition],
+        timeout: Optional[float],
+        short_circuit_on: bool,
+    ) -> "Future[bool]":
+        """
+        Resolve a future with the first child result equal to short_circuit_on,
+        or with the opposite once every child resolved.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        children = [self.submit(condition, deadline) for condition in conditions]
+        result = Future()
+        if not children:
+            result.set_result(not short_circuit_on)
+            return result
+
+        remaining = [len(children)]
+        lock = threading.Lock()
+
+        def on_child_done(child: Future) -> None:
+            if child.cancelled():
+                value = False
+            elif child.exception() is not None:
+                try:
+                    result.set_exception(child.exception())
+                except InvalidStateError:
+                    pass
+                return
+            else:
+                value = child.result()
+
+            with lock:
+                remaining[0] -= 1
+                done = remaining[0] == 0
+            if value == short_circuit_on:
+                _resolve(result, value)
+            elif done:
+                _resolve(result, not short_circuit_on)
+
+        def on_done(_: Future) -> None:
+            for child in children:
+                child.cancel()
+
+        result.add_done_callback(on_done)
+        for child in children:
+            child.add_done_callback(on_child_done)
+
+        return result
+
+    def _schedule(self, scheduled: _Scheduled, due: float) -> None:
+        with self._wakeup:
+            if self._stopped:
+                scheduled.future.cancel()
+                return
+            heapq.heappush(self._queue, (due, next(self._sequence), scheduled))
+            self._wakeup.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                while not self._stopped:
+                    now = time.monotonic()
+                    if self._queue and self._queue[0][0] <= now:
+                        break
+                    self._wakeup.wait(self._queue[0][0] - now if self._queue else None)
+                if self._stopped:
+                    return
+                _, _, scheduled = heapq.heappop(self._queue)
+
+            if scheduled.future.done():
+                continue
+            try:
+                self._executor.submit(self._check, scheduled)
+            except RuntimeError:  # the executor is shutting down
+                scheduled.future.cancel()
+
+    def _check(self, scheduled: _Scheduled) -> None:
+        condition = scheduled.condition
+        try:
+            met = condition._check()
+        except Exception as e:
+            try:
+                scheduled.future.set_exception(e)
+            except InvalidStateError:
+                pass
+            return
+
+        if met:
+            _resolve(scheduled.future, True)
+            return
+
+        now = time.monotonic()
+        if scheduled.deadline is not None and now >= scheduled.deadline:
+            _logger.error(f"Timeout waiting for condition {condition.name} to be true")
+            _resolve(scheduled.future, False)
+            return
+
+        due = now + condition.delay(scheduled.attempt)
+        scheduled.attempt += 1
+        if scheduled.deadline is not None:
+            # Check one last time at the deadline rather than sleeping past it.
+            due = min(due, scheduled.deadline)
+        self._schedule(scheduled, due)
@@ -0,0 +1,271 @@
+import copy
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+from weakref import WeakKeyDictionary
+
+from kubernetes import watch
+from kubernetes.client import ApiClient, V1ListMeta, exceptions
+
+from ._objects import (
+    list_items,
+    list_resource_version,
+    object_key,
+    object_labels,
+    object_owner_uids,
+)
+from ._selector import LabelSelector
+
+_logger = logging.getLogger(__name__)
+
+HTTP_STATUS_GONE = 410
+
+
+class Store:
+    """
+    A thread-safe local store of objects keyed by namespace/name, with
+    secondary indexes by label and by owner uid.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._objects: Dict[Tuple[str, str], Any] = {}
+        self._label_index: Dict[Tuple[str, str], Set[Tuple[str, str]]] = defaultdict(
+            set
+        )
+        self._owner_index: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)
+
+    def _index(self, key: Tuple[str, str], obj) -> None:
+        for label in object_labels(obj).items():
+            self._label_index[label].add(key)
+        for uid in object_owner_uids(obj):
+            self._owner_index[uid].add(key)
+
+    def _unindex(self, key: Tuple[str, str], obj) -> None:
+        for label in object_labels(obj).items():
+            self._label_index[label].discard(key)
+            if not self._label_index[label]:
+                del self._label_index[label]
+        for uid in object_owner_uids(obj):
+            self._owner_index[uid].discard(key)
+            if not self._owner_index[uid]:
+                del self._owner_index[uid]
+
+    def add(self, obj) -> None:
+        key = object_key(obj)
+        with self._lock:
+            previous = self._objects.get(key)
+            if previous is not None:
+                self._unindex(key, previous)
+            self._objects[key] = obj
+            self._index(key, obj)
+
+    def delete(self, obj) -> None:
+        key = object_key(obj)
+        with self._lock:
+            previous = self._objects.pop(key, None)
+            if previous is not None:
+                self._unindex(key, previous)
+
+    def replace(self, objects: List[Any]) -> None:
+        with self._lock:
+            self._objects.clear()
+            self._label_index.clear()
+            self._owner_index.clear()
+            for obj in objects:
+                self.add(obj)
+
+    def get(self, namespace: Optional[str], name: str) -> Optional[Any]:
+        with self._lock:
+            return self._objects.get((namespace or "", name))
+
+    def list(self) -> List[Any]:
+        with self._lock:
+            return list(self._objects.values())
+
+    def by_label(self, key: str, value: str) -> List[Any]:
+        with self._lock:
+            return [self._objects[k] for k in self._label_index.get((key, value), ())]
+
+    def by_owner(self, uid: str) -> List[Any]:
+        with self._lock:
+            return [self._objects[k] for k in self._owner_index.get(uid, ())]
+
+    def select(self, selector: LabelSelector) -> List[Any]:
+        """
+        Return the objects whose labels match a selector. The candidates of
+        its = and in requirements come from the label index, only the other
+        requirements are evaluated on each candidate.
+        """
+        with self._lock:
+            keys = None
+            for key, operator, values in selector.requirements:
+                if operator not in ("=", "in"):
+                    continue
+                matching = set()
+                for value in values:
+                    matching.update(self._label_index.get((key, value), ()))
+                keys = matching if keys is None else keys & matching
+            if keys is None:
+                candidates = list(self._objects.values())
+            else:
+                candidates = [self._objects[k] for k in sorted(keys)]
+
+        return [obj for obj in candidates if selector.matches(object_labels(obj))]
+
+
+class Informer:
+    """
+    Keep a Store in sync with one resource in one namespace using a single
+    list followed by a watch from the listed resourceVersion. The watch runs
+    in a daemon thread and relists whenever the resourceVersion expires.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        kwargs: Dict[str, Any],
+        watch_timeout: int = 60,
+        retry_interval: float = 1.0,
+    ) -> None:
+        self.store = Store()
+        self._func = func
+        self._kwargs = kwargs
+        self._watch_timeout = watch_timeout
+        self._retry_interval = retry_interval
+        self._list_type = None
+        self._resource_version: Optional[str] = None
+        self._watch: Optional[watch.Watch] = None
+        self._synced = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"informer-{func.__name__}", daemon=True
+        )
+
+    @property
+    def has_synced(self) -> bool:
+        return self._synced.is_set()
+
+    @property
+    def resource_version(self) -> Optional[str]:
+        return self._resource_version
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def wait_for_sync(self, timeout: Optional[float] = None) -> bool:
+        return self._synced.wait(timeout)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._watch is not None:
+            self._watch.stop()
+
+    def get(self, namespace: Optional[str], name: str) -> Optional[Any]:
+        """
+        Return a copy of a cached object, which the caller may modify.
+        """
+        return copy.deepcopy(self.store.get(namespace, name))
+
+    def list(self, selector: Optional[LabelSelector] = None, copies: bool = True):
+        """
+        Return the cached objects in the same shape as the list call.
+        selector:Optional: Only return the objects whose labels match.
+        copies:Optional: Return copies of the objects. Without copies, the
+            objects are the ones of the store, shared with every reader, and
+            must not be modified.
+        """
+        items = self.store.list() if selector is None else self.store.select(selector)
+        if copies:
+            items = copy.deepcopy(items)
+        if self._list_type is dict:
+            return {
+                "items": items,
+                "metadata": {"resourceVersion": self._resource_version},
+            }
+
+        return self._list_type(
+            items=items, metadata=V1ListMeta(resource_version=self._resource_version)
+        )
+
+    def _relist(self) -> None:
+        objects = self._func(**self._kwargs)
+        self._list_type = type(objects)
+        self.store.replace(list_items(objects))
+        self._resource_version = list_resource_version(objects)
+        self._synced.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                if self._resource_version is None:
+                    self._relist()
+
+                self._watch = watch.Watch()
+                for event in self._watch.stream(
+                    self._func,
+                    resource_version=self._resource_version,
+                    timeout_seconds=self._watch_timeout,
+                    **self._kwargs,
+                ):
+                    if event["type"] in ("ADDED", "MODIFIED"):
+                        self.store.add(event["object"])
+                    elif event["type"] == "DELETED":
+                        self.store.delete(event["object"])
+                    self._resource_version = self._watch.resource_version
+            except exceptions.ApiException as e:
+                if e.status == HTTP_STATUS_GONE:
+                    self._resource_version = None
+                    continue
+                _logger.error(f"Informer {self._func.__name__} failed: {e}")
+                self._stopped.wait(self._retry_interval)
+            except Exception as e:
+                _logger.error(f"Informer {self._func.__name__} lost its watch: {e}")
+                self._stopped.wait(self._retry_interval)
+
+
+# Informers are shared by every ResourceApi built on the same ApiClient, so
+# there is at most one list+watch per (kind, namespace) and client.
+_shared_informers: "WeakKeyDictionary[ApiClient, Dict[Hashable, Informer]]" = (
+    WeakKeyDictionary()
+)
+_shared_informers_lock = threading.Lock()
+
+
+def _informer_key(func: Callable, kwargs: Dict[str, Any]) -> Hashable:
+    return func.__name__, tuple(sorted(kwargs.items()))
+
+
+def start_shared_informer(
+    api_client: ApiClient, func: Callable, kwargs: Dict[str, Any], **options
+) -> Informer:
+    key = _informer_key(func, kwargs)
+    with _shared_informers_lock:
+        informers = _shared_informers.setdefault(api_client, {})
+        informer = informers.get(key)
+        if informer is None:
+            informer = Informer(func, kwargs, **options)
+            informers[key] = informer
+            informer.start()
+
+    return informer
+
+
+def get_shared_informer(
+    api_client: ApiClient, func: Callable, kwargs: Dict[str, Any]
+) -> Optional[Informer]:
+    with _shared_informers_lock:
+        return _shared_informers.get(api_client, {}).get(_informer_key(func, kwargs))
+
+
+def stop_shared_informer(
+    api_client: ApiClient, func: Callable, kwargs: Dict[str, Any]
+) -> None:
+    with _shared_informers_lock:
+        informer = _shared_informers.get(api_client, {}).pop(
+            _informer_key(func, kwargs), None
+        )
+
+    if informer is not None:
+        informer.stop()
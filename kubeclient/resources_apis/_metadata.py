@@ -0,0 +1,46 @@
+from typing import Any, Dict, Optional
+
+from .._raw import RawObject
+
+PARTIAL_OBJECT_METADATA_LIST_ACCEPT = (
+    "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1,"
+    "application/json"
+)
+
+
+class ObjectMetadata:
+    """
+    The metadata of an object, as returned by a metadata-only list.
+    Timestamps are kept as the RFC 3339 strings of the apiserver and owner
+    references are RawObject views.
+    """
+
+    __slots__ = (
+        "name",
+        "namespace",
+        "uid",
+        "resource_version",
+        "generation",
+        "labels",
+        "annotations",
+        "owner_references",
+        "creation_timestamp",
+        "deletion_timestamp",
+    )
+
+    def __init__(self, metadata: Dict[str, Any]) -> None:
+        self.name: Optional[str] = metadata.get("name")
+        self.namespace: Optional[str] = metadata.get("namespace")
+        self.uid: Optional[str] = metadata.get("uid")
+        self.resource_version: Optional[str] = metadata.get("resourceVersion")
+        self.generation: Optional[int] = metadata.get("generation")
+        self.labels: Dict[str, str] = metadata.get("labels") or {}
+        self.annotations: Dict[str, str] = metadata.get("annotations") or {}
+        self.owner_references = [
+            RawObject(owner) for owner in metadata.get("ownerReferences") or []
+        ]
+        self.creation_timestamp: Optional[str] = metadata.get("creationTimestamp")
+        self.deletion_timestamp: Optional[str] = metadata.get("deletionTimestamp")
+
+    def __repr__(self) -> str:
+        return f"<ObjectMetadata {self.namespace or ''}/{self.name} rv={self.resource_version}>"
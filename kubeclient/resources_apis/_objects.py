@@ -0,0 +1,46 @@
+from typing import Dict, List, Optional, Tuple
+
+# Typed API methods return generated models while CustomObjectsApi returns
+# plain dicts, so these helpers read the common fields from either shape.
+
+
+def list_items(objects) -> list:
+    if isinstance(objects, dict):
+        return objects.get("items") or []
+    return objects.items or []
+
+
+def list_resource_version(objects) -> Optional[str]:
+    if isinstance(objects, dict):
+        return (objects.get("metadata") or {}).get("resourceVersion")
+    return objects.metadata.resource_version if objects.metadata else None
+
+
+def list_continue(objects) -> Optional[str]:
+    if isinstance(objects, dict):
+        return (objects.get("metadata") or {}).get("continue")
+    return objects.metadata._continue if objects.metadata else None
+
+
+def object_key(obj) -> Tuple[str, str]:
+    """
+    Return the (namespace, name) of an object, with an empty namespace for
+    cluster scoped resources.
+    """
+    if isinstance(obj, dict):
+        metadata = obj.get("metadata") or {}
+        return metadata.get("namespace") or "", metadata.get("name")
+    return obj.metadata.namespace or "", obj.metadata.name
+
+
+def object_labels(obj) -> Dict[str, str]:
+    if isinstance(obj, dict):
+        return (obj.get("metadata") or {}).get("labels") or {}
+    return obj.metadata.labels or {}
+
+
+def object_owner_uids(obj) -> List[str]:
+    if isinstance(obj, dict):
+        owners = (obj.get("metadata") or {}).get("ownerReferences") or []
+        return [owner["uid"] for owner in owners]
+    return [owner.uid for owner in obj.metadata.owner_references or []]
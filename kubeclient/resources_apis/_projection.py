@@ -0,0 +1,57 @@
+import sys
+from collections import namedtuple
+from typing import Any, Dict, List, Mapping, Sequence, Tuple, Union
+
+from .._raw import json_key
+
+Fields = Union[Sequence[str], Mapping[str, str]]
+
+
+def _extract(value, keys: Tuple[str, ...]):
+    for index, key in enumerate(keys):
+        if isinstance(value, list):
+            return tuple(_extract(item, keys[index:]) for item in value)
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+
+    if isinstance(value, str):
+        # Namespaces, node names and images repeat across thousands of
+        # objects, so every record shares a single copy of them.
+        return sys.intern(value)
+    if isinstance(value, list):
+        return tuple(value)
+
+    return value
+
+
+class Projection:
+    """
+    Build compact records holding only some fields of the decoded JSON of
+    objects, so the full model graph is never allocated.
+    Fields are dotted paths using either the snake_case attribute names of
+    the models or the JSON keys, like "status.pod_ip". A path crossing a list
+    yields a tuple with the value of every item, like "spec.containers.image".
+    Records are named tuples named after the last segment of each path, or
+    after the keys of the fields when they are given as a mapping.
+    """
+
+    def __init__(self, fields: Fields, typename: str = "Record") -> None:
+        if isinstance(fields, Mapping):
+            names, paths = list(fields.keys()), list(fields.values())
+        else:
+            paths = list(fields)
+            names = [path.rsplit(".", 1)[-1] for path in paths]
+        duplicates = {name for name in names if names.count(name) > 1}
+        if duplicates:
+            raise ValueError(
+                f"Fields {sorted(duplicates)} are ambiguous, name them with a mapping"
+            )
+
+        self._paths: List[Tuple[str, ...]] = [
+            tuple(json_key(segment) for segment in path.split(".")) for path in paths
+        ]
+        self.record_type = namedtuple(typename, names)
+
+    def __call__(self, obj: Dict[str, Any]):
+        return self.record_type._make(_extract(obj, keys) for keys in self._paths)
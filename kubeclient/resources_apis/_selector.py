@@ -0,0 +1,179 @@
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+# A selector is either the apiserver string syntax, a mapping of keys to a
+# value (equality) or to several values (set membership), or an iterable of
+# requirements in the string syntax, which are ANDed.
+Selector = Union[str, Mapping[str, Union[str, Iterable[str]]], Iterable[str]]
+
+_LABEL_NAME_RE = re.compile(r"^[A-Za-z0-9]([-A-Za-z0-9_.]*[A-Za-z0-9])?$")
+_DNS_SUBDOMAIN_RE = re.compile(
+    r"^[a-z0-9]([-a-z0-9]*[a-z0-9])?(\.[a-z0-9]([-a-z0-9]*[a-z0-9])?)*$"
+)
+_FIELD_KEY_RE = re.compile(r"^[A-Za-z][A-Za-z0-9_.]*$")
+_SET_REQUIREMENT_RE = re.compile(r"^(\S+)\s+(in|notin)\s*\((.*)\)$")
+_EQUALITY_REQUIREMENT_RE = re.compile(r"^([^=!\s]+)\s*(==|=|!=)\s*(.*)$")
+_EXISTS_REQUIREMENT_RE = re.compile(r"^(!?)\s*([^=!\s(),]+)$")
+
+
+def _validate_label_key(key: str) -> None:
+    prefix, _, name = key.rpartition("/")
+    if prefix and (len(prefix) > 253 or not _DNS_SUBDOMAIN_RE.match(prefix)):
+        raise ValueError(f"Invalid label key prefix in selector: {key!r}")
+    if len(name) > 63 or not _LABEL_NAME_RE.match(name):
+        raise ValueError(f"Invalid label key in selector: {key!r}")
+
+
+def _validate_label_value(value: str) -> None:
+    if value and (len(value) > 63 or not _LABEL_NAME_RE.match(value)):
+        raise ValueError(f"Invalid label value in selector: {value!r}")
+
+
+def _split_requirements(selector: str) -> List[str]:
+    """
+    Split a selector on the commas that are not inside a set of values.
+    """
+    requirements = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(selector):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            requirements.append(selector[start:index])
+            start = index + 1
+    requirements.append(selector[start:])
+
+    return [requirement.strip() for requirement in requirements if requirement.strip()]
+
+
+def _requirements(selector: Selector) -> List[str]:
+    if isinstance(selector, str):
+        return _split_requirements(selector)
+    if isinstance(selector, Mapping):
+        requirements = []
+        for key, value in selector.items():
+            if isinstance(value, str):
+                requirements.append(f"{key}={value}")
+            else:
+                requirements.append(f"{key} in ({','.join(value)})")
+        return requirements
+
+    return [
+        requirement for part in selector for requirement in _split_requirements(part)
+    ]
+
+
+class LabelSelector:
+    """
+    A parsed and validated label selector, which can be sent to the apiserver
+    and evaluated on the labels of cached objects.
+    """
+
+    def __init__(self, requirements: List[Tuple[str, str, Tuple[str, ...]]]) -> None:
+        self.requirements = requirements
+
+    @classmethod
+    def parse(cls, selector: Selector) -> "LabelSelector":
+        requirements = []
+        for requirement in _requirements(selector):
+            match = _SET_REQUIREMENT_RE.match(requirement)
+            if match:
+                key, operator, values = match.groups()
+                values = tuple(value.strip() for value in values.split(","))
+            else:
+                match = _EQUALITY_REQUIREMENT_RE.match(requirement)
+                if match:
+                    key, operator, value = match.groups()
+                    operator, values = operator.replace("==", "="), (value.strip(),)
+                else:
+                    match = _EXISTS_REQUIREMENT_RE.match(requirement)
+                    if not match:
+                        raise ValueError(f"Invalid label selector: {requirement!r}")
+                    negated, key = match.groups()
+                    operator, values = ("!" if negated else "exists"), ()
+
+            _validate_label_key(key)
+            for value in values:
+                _validate_label_value(value)
+            requirements.append((key, operator, values))
+
+        return cls(requirements)
+
+    def matches(self, labels: Optional[Mapping[str, str]]) -> bool:
+        labels = labels or {}
+        for key, operator, values in self.requirements:
+            if operator == "exists" and key not in labels:
+                return False
+            if operator == "!" and key in labels:
+                return False
+            if operator in ("=", "in") and labels.get(key) not in values:
+                return False
+            if operator in ("!=", "notin") and labels.get(key) in values:
+                return False
+
+        return True
+
+    def __str__(self) -> str:
+        requirements = []
+        for key, operator, values in self.requirements:
+            if operator == "exists":
+                requirements.append(key)
+            elif operator == "!":
+                requirements.append(f"!{key}")
+            elif operator in ("in", "notin"):
+                requirements.append(f"{key} {operator} ({','.join(values)})")
+            else:
+                requirements.append(f"{key}{operator}{values[0]}")
+
+        return ",".join(requirements)
+
+
+def parse_label_selector(selector: Optional[Selector]) -> Optional[LabelSelector]:
+    if selector is None:
+        return None
+    if isinstance(selector, LabelSelector):
+        return selector
+
+    parsed = LabelSelector.parse(selector)
+    return parsed if parsed.requirements else None
+
+
+def format_field_selector(selector: Optional[Selector]) -> Optional[str]:
+    """
+    Validate a field selector, which only supports the =, == and !=
+    operators, and return it in the apiserver syntax.
+    """
+    if selector is None:
+        return None
+
+    requirements = []
+    for requirement in _requirements(selector):
+        match = _EQUALITY_REQUIREMENT_RE.match(requirement)
+        if not match or not _FIELD_KEY_RE.match(match.group(1)):
+            raise ValueError(f"Invalid field selector: {requirement!r}")
+        key, operator, value = match.groups()
+        requirements.append(f"{key}{operator.replace('==', '=')}{value.strip()}")
+
+    return ",".join(requirements) or None
+
+
+def selector_options(
+    label_selector: Optional[Selector] = None,
+    field_selector: Optional[Selector] = None,
+) -> Dict[str, str]:
+    """
+    Return the list or watch keyword arguments pushing the selectors down to
+    the apiserver.
+    """
+    options = {}
+    label_selector = parse_label_selector(label_selector)
+    if label_selector is not None:
+        options["label_selector"] = str(label_selector)
+    field_selector = format_field_selector(field_selector)
+    if field_selector is not None:
+        options["field_selector"] = field_selector
+
+    return options
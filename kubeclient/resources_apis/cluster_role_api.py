@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from kubernetes.client import (
     RbacAuthorizationV1Api,
@@ -8,6 +8,10 @@ from kubernetes.client import (
 )
 from kubernetes.utils import create_from_yaml
 
+from .._apply import DEFAULT_FIELD_MANAGER, server_side_apply
+from ..manifests import load_manifests
+from ._objects import object_key
+from ._selector import Selector, parse_label_selector
 from .resource_api import ResourceApi
 
 
@@ -18,23 +22,40 @@ class ClusterRole(ResourceApi[RbacAuthorizationV1Api]):
 
     api_client_type = RbacAuthorizationV1Api
 
-    def get(self, name: str) -> Optional[V1ClusterRole]:
+    def get(self, name: str, raw: bool = False) -> Optional[V1ClusterRole]:
+        informer = self._informer(None)
+        if informer is not None and not raw:
+            return informer.get(None, name)
+
         clusterrole = None
         try:
-            clusterrole = self.api_client.read_cluster_role(name=name)
+            clusterrole = self.api_client.read_cluster_role(
+                name=name, **self._request_options(raw)
+            )
         except exceptions.ApiException as e:
             self._logger.error(f"Failed to get clusterrole {name}: {e}")
 
-        return clusterrole
+        return self._decode(clusterrole, raw)
+
+    def list(
+        self,
+        raw: bool = False,
+        label_selector: Optional[Selector] = None,
+        field_selector: Optional[Selector] = None,
+    ) -> Optional[V1ClusterRoleList]:
+        informer = self._informer(None)
+        if informer is not None and not raw and field_selector is None:
+            return informer.list(parse_label_selector(label_selector))
 
-    def list(self) -> Optional[V1ClusterRoleList]:
         clusterroles = None
         try:
-            clusterroles = self.api_client.list_cluster_role()
+            clusterroles = self.api_client.list_cluster_role(
+                **self._list_options(raw, label_selector, field_selector)
+            )
         except exceptions.ApiException as e:
             self._logger.error(f"Failed to list clusterroles: {e}")
 
-        return clusterroles
+        return self._decode(clusterroles, raw)
 
     def create(self, body: V1ClusterRole) -> Optional[V1ClusterRole]:
         created_clusterrole = None
@@ -67,6 +88,24 @@ class ClusterRole(ResourceApi[RbacAuthorizationV1Api]):
 
         return patched_clusterrole
 
+    def apply(
+        self,
+        body: V1ClusterRole,
+        field_manager: str = DEFAULT_FIELD_MANAGER,
+        force: bool = False,
+    ) -> Optional[V1ClusterRole]:
+        _, name = object_key(body)
+        applied_clusterrole = None
+        try:
+            with server_side_apply(self.api_client.api_client):
+                applied_clusterrole = self.api_client.patch_cluster_role(
+                    name=name, body=body, field_manager=field_manager, force=force
+                )
+        except exceptions.ApiException as e:
+            self._logger.error(f"Failed to apply clusterrole {name}: {e}")
+
+        return applied_clusterrole
+
     def update(self, name: str, body: V1ClusterRole) -> Optional[V1ClusterRole]:
         updated_clusterrole = None
         try:
@@ -81,7 +120,9 @@ class ClusterRole(ResourceApi[RbacAuthorizationV1Api]):
     def create_from_yaml(self, yaml_file: str) -> Optional[List[V1ClusterRole]]:
         created_clusterrole = None
         try:
-            created_clusterrole = create_from_yaml(self.api_client, yaml_file)
+            created_clusterrole = create_from_yaml(
+                self.api_client.api_client, yaml_objects=load_manifests(yaml_file)
+            )
         except exceptions.ApiException as e:
             self._logger.error(f"Failed to create clusterrole from yaml: {e}")
 
@@ -90,3 +131,9 @@ class ClusterRole(ResourceApi[RbacAuthorizationV1Api]):
     def is_ready(self, name: str) -> bool:
         clusterrole = self.get(name)
         return clusterrole is not None
+
+    def _is_object_ready(self, clusterrole: V1ClusterRole) -> bool:
+        return True
+
+    def _list_call(self, namespace: Optional[str]) -> Tuple[Callable, Dict[str, Any]]:
+        return self.api_client.list_cluster_role, {}
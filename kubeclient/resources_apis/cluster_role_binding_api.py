@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from kubernetes.client import (
     RbacAuthorizationV1Api,
@@ -8,6 +8,10 @@ from kubernetes.client import (
 )
 from kubernetes.utils import create_from_yaml
 
+from .._apply import DEFAULT_FIELD_MANAGER, server_side_apply
+from ..manifests import load_manifests
+from ._objects import object_key
+from ._selector import Selector, parse_label_selector
 from .resource_api import ResourceApi
 
 
@@ -18,23 +22,40 @@ class ClusterRoleBinding(ResourceApi[RbacAuthorizationV1Api]):
 
     api_client_type = RbacAuthorizationV1Api
 
-    def get(self, name: str) -> Optional[V1ClusterRoleBinding]:
+    def get(self, name: str, raw: bool = False) -> Optional[V1ClusterRoleBinding]:
+        informer = self._informer(None)
+        if informer is not None and not raw:
+            return informer.get(None, name)
+
         clusterrolebinding = None
         try:
-            clusterrolebinding = self.api_client.read_cluster_role_binding(name=name)
+            clusterrolebinding = self.api_client.read_cluster_role_binding(
+                name=name, **self._request_options(raw)
+            )
         except exceptions.ApiException as e:
             self._logger.error(f"Failed to get clusterrolebinding {name}: {e}")
 
-        return clusterrolebinding
+        return self._decode(clusterrolebinding, raw)
+
+    def list(
+        self,
+        raw: bool = False,
+        label_selector: Optional[Selector] = None,
+        field_selector: Optional[Selector] = None,
+    ) -> Optional[V1ClusterRoleBindingList]:
+        informer = self._informer(None)
+        if informer is not None and not raw and field_selector is None:
+            return informer.list(parse_label_selector(label_selector))
 
-    def list(self) -> Optional[V1ClusterRoleBindingList]:
         clusterrolebindings = None
         try:
-            clusterrolebindings = self.api_client.list_cluster_role_binding()
+            clusterrolebindings = self.api_client.list_cluster_role_binding(
+                **self._list_options(raw, label_selector, field_selector)
+            )
         except exceptions.ApiException as e:
             self._logger.error(f"Failed to list clusterrolebindings: {e}")
 
-        return clusterrolebindings
+        return self._decode(clusterrolebindings, raw)
 
     def create(self, body: V1ClusterRoleBinding) -> Optional[V1ClusterRoleBinding]:
         created_clusterrolebinding = None
@@ -73,6 +94,24 @@ class ClusterRoleBinding(ResourceApi[RbacAuthorizationV1Api]):
 
         return patched_clusterrolebinding
 
+    def apply(
+        self,
+        body: V1ClusterRoleBinding,
+        field_manager: str = DEFAULT_FIELD_MANAGER,
+        force: bool = False,
+    ) -> Optional[V1ClusterRoleBinding]:
+        _, name = object_key(body)
+        applied_clusterrolebinding = None
+        try:
+            with server_side_apply(self.api_client.api_client):
+                applied_clusterrolebinding = self.api_client.patch_cluster_role_binding(
+                    name=name, body=body, field_manager=field_manager, force=force
+                )
+        except exceptions.ApiException as e:
+            self._logger.error(f"Failed to apply clusterrolebinding {name}: {e}")
+
+        return applied_clusterrolebinding
+
     def update(
         self, name: str, body: V1ClusterRoleBinding
     ) -> Optional[V1ClusterRoleBinding]:
@@ -89,7 +128,9 @@ class ClusterRoleBinding(ResourceApi[RbacAuthorizationV1Api]):
     def create_from_yaml(self, yaml_file: str) -> Optional[List[V1ClusterRoleBinding]]:
         created_clusterrolebinding = None
         try:
-            created_clusterrolebinding = create_from_yaml(self.api_client, yaml_file)
+            created_clusterrolebinding = create_from_yaml(
+                self.api_client.api_client, yaml_objects=load_manifests(yaml_file)
+            )
         except exceptions.ApiException as e:
             self._logger.error(f"Failed to create clusterrolebinding from yaml: {e}")
 
@@ -98,3 +139,9 @@ class ClusterRoleBinding(ResourceApi[RbacAuthorizationV1Api]):
     def is_ready(self, name: str) -> bool:
         clusterrolebinding = self.get(name=name)
         return clusterrolebinding is not None
+
+    def _is_object_ready(self, clusterrolebinding: V1ClusterRoleBinding) -> bool:
+        return True
+
+    def _list_call(self, namespace: Optional[str]) -> Tuple[Callable, Dict[str, Any]]:
+        return self.api_client.list_cluster_role_binding, {}
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from kubernetes.client import (
     CustomObjectsApi,
@@ -10,6 +10,10 @@ from kubernetes.utils import create_from_yaml
 
 from kubeclient.client import KubernetesApiClient
 
+from .._apply import DEFAULT_FIELD_MANAGER, server_side_apply
+from ..manifests import load_manifests
+from ._objects import object_key
+from ._selector import Selector, parse_label_selector
 from .resource_api import ResourceApi
 
 
@@ -31,7 +35,13 @@ class CustomResource(ResourceApi[CustomObjectsApi]):
         self._version = version
         self._plural = plural
 
-    def get(self, namespace: str, name: str) -> Optional[V1CustomResourceDefinition]:
+    def get(
+        self, namespace: str, name: str, raw: bool = False
+    ) -> Optional[V1CustomResourceDefinition]:
+        informer = self._informer(namespace)
+        if informer is not None and not raw:
+            return informer.get(namespace, name)
+
         customresource = None
         try:
             customresource = self.api_client.get_namespaced_custom_object(
@@ -40,15 +50,26 @@ class CustomResource(ResourceApi[CustomObjectsApi]):
                 plural=self._plural,
                 name=name,
                 namespace=namespace,
+                **self._request_options(raw),
             )
         except exceptions.ApiException as e:
             self._logger.error(
                 f"Failed to get customresource {name} in namespace {namespace}: {e}"
             )
 
-        return customresource
+        return self._decode(customresource, raw)
+
+    def list(
+        self,
+        namespace: str,
+        raw: bool = False,
+        label_selector: Optional[Selector] = None,
+        field_selector: Optional[Selector] = None,
+    ) -> Optional[V1CustomResourceDefinitionList]:
+        informer = self._informer(namespace)
+        if informer is not None and not raw and field_selector is None:
+            return informer.list(parse_label_selector(label_selector))
 
-    def list(self, namespace: str) -> Optional[V1CustomResourceDefinitionList]:
         customresources = None
         try:
             customresources = self.api_client.list_namespaced_custom_object(
@@ -56,13 +77,14 @@ class CustomResource(ResourceApi[CustomObjectsApi]):
                 group=self._group,
                 version=self._version,
                 plural=self._plural,
+                **self._list_options(raw, label_selector, field_selector),
             )
         except exceptions.ApiException as e:
             self._logger.error(
                 f"Failed to list customresources in namespace {namespace}: {e}"
             )
 
-        return customresources
+        return self._decode(customresources, raw)
 
     def create(
         self, namespace: str, body: V1CustomResourceDefinition
@@ -120,6 +142,34 @@ class CustomResource(ResourceApi[CustomObjectsApi]):
 
         return patched_customresource
 
+    def apply(
+        self,
+        namespace: str,
+        body: V1CustomResourceDefinition,
+        field_manager: str = DEFAULT_FIELD_MANAGER,
+        force: bool = False,
+    ) -> Optional[V1CustomResourceDefinition]:
+        _, name = object_key(body)
+        applied_customresource = None
+        try:
+            with server_side_apply(self.api_client.api_client):
+                applied_customresource = self.api_client.patch_namespaced_custom_object(
+                    namespace=namespace,
+                    group=self._group,
+                    version=self._version,
+                    plural=self._plural,
+                    name=name,
+                    body=body,
+                    field_manager=field_manager,
+                    force=force,
+                )
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to apply customresource {name} in namespace {namespace}: {e}"
+            )
+
+        return applied_customresource
+
     def update(
         self, namespace: str, name: str, body: V1CustomResourceDefinition
     ) -> Optional[V1CustomResourceDefinition]:
@@ -146,7 +196,9 @@ class CustomResource(ResourceApi[CustomObjectsApi]):
         created_customresource = None
         try:
             created_customresource = create_from_yaml(
-                self.api_client, yaml_file_path, namespace=namespace
+                self.api_client.api_client,
+                yaml_objects=load_manifests(yaml_file_path),
+                namespace=namespace,
             )
         except exceptions.ApiException as e:
             self._logger.error(
@@ -160,4 +212,22 @@ class CustomResource(ResourceApi[CustomObjectsApi]):
         if customresource is None:
             return False
 
+        return self._is_object_ready(customresource)
+
+    def _is_object_ready(self, customresource: dict) -> bool:
         return True
+
+    def _list_call(self, namespace: str) -> Tuple[Callable, Dict[str, Any]]:
+        return self.api_client.list_namespaced_custom_object, {
+            "namespace": namespace,
+            "group": self._group,
+            "version": self._version,
+            "plural": self._plural,
+        }
+
+    def _all_namespaces_call(self) -> Tuple[Callable, Dict[str, Any]]:
+        return self.api_client.list_cluster_custom_object, {
+            "group": self._group,
+            "version": self._version,
+            "plural": self._plural,
+        }
@@ -1,8 +1,12 @@
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from kubernetes.client import AppsV1Api, V1DaemonSet, V1DaemonSetList, exceptions
 from kubernetes.utils import create_from_yaml
 
+from .._apply import DEFAULT_FIELD_MANAGER, server_side_apply
+from ..manifests import load_manifests
+from ._objects import object_key
+from ._selector import Selector, parse_label_selector
 from .resource_api import ResourceApi
 
 
@@ -13,29 +17,48 @@ class DaemonSet(ResourceApi[AppsV1Api]):
 
     api_client_type = AppsV1Api
 
-    def get(self, namespace: str, name: str) -> Optional[V1DaemonSet]:
+    def get(
+        self, namespace: str, name: str, raw: bool = False
+    ) -> Optional[V1DaemonSet]:
+        informer = self._informer(namespace)
+        if informer is not None and not raw:
+            return informer.get(namespace, name)
+
         daemonset = None
         try:
             daemonset = self.api_client.read_namespaced_daemon_set(
-                name=name, namespace=namespace
+                name=name, namespace=namespace, **self._request_options(raw)
             )
         except exceptions.ApiException as e:
             self._logger.error(
                 f"Failed to get daemonset {name} in namespace {namespace}: {e}"
             )
 
-        return daemonset
+        return self._decode(daemonset, raw)
+
+    def list(
+        self,
+        namespace: str,
+        raw: bool = False,
+        label_selector: Optional[Selector] = None,
+        field_selector: Optional[Selector] = None,
+    ) -> Optional[V1DaemonSetList]:
+        informer = self._informer(namespace)
+        if informer is not None and not raw and field_selector is None:
+            return informer.list(parse_label_selector(label_selector))
 
-    def list(self, namespace: str) -> Optional[V1DaemonSetList]:
         daemonsets = None
         try:
-            daemonsets = self.api_client.list_namespaced_daemon_set(namespace=namespace)
+            daemonsets = self.api_client.list_namespaced_daemon_set(
+                namespace=namespace,
+                **self._list_options(raw, label_selector, field_selector),
+            )
         except exceptions.ApiException as e:
             self._logger.error(
                 f"Failed to list daemonsets in namespace {namespace}: {e}"
             )
 
-        return daemonsets
+        return self._decode(daemonsets, raw)
 
     def create(self, namespace: str, body: V1DaemonSet) -> Optional[V1DaemonSet]:
         created_daemonset = None
@@ -78,6 +101,31 @@ class DaemonSet(ResourceApi[AppsV1Api]):
 
         return patched_daemonset
 
+    def apply(
+        self,
+        namespace: str,
+        body: V1DaemonSet,
+        field_manager: str = DEFAULT_FIELD_MANAGER,
+        force: bool = False,
+    ) -> Optional[V1DaemonSet]:
+        _, name = object_key(body)
+        applied_daemonset = None
+        try:
+            with server_side_apply(self.api_client.api_client):
+                applied_daemonset = self.api_client.patch_namespaced_daemon_set(
+                    name=name,
+                    namespace=namespace,
+                    body=body,
+                    field_manager=field_manager,
+                    force=force,
+                )
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to apply daemonset {name} in namespace {namespace}: {e}"
+            )
+
+        return applied_daemonset
+
     def update(
         self, namespace: str, name: str, body: V1DaemonSet
     ) -> Optional[V1DaemonSet]:
@@ -99,7 +147,9 @@ class DaemonSet(ResourceApi[AppsV1Api]):
         created_daemonset = None
         try:
             created_daemonset = create_from_yaml(
-                self.api_client, yaml_file_path, namespace=namespace
+                self.api_client.api_client,
+                yaml_objects=load_manifests(yaml_file_path),
+                namespace=namespace,
             )
         except exceptions.ApiException as e:
             self._logger.error(
@@ -113,6 +163,15 @@ class DaemonSet(ResourceApi[AppsV1Api]):
         if daemonset is None:
             return False
 
+        return self._is_object_ready(daemonset)
+
+    def _is_object_ready(self, daemonset: V1DaemonSet) -> bool:
         return (
             daemonset.status.number_ready == daemonset.status.desired_number_scheduled
         )
+
+    def _list_call(self, namespace: str) -> Tuple[Callable, Dict[str, Any]]:
+        return self.api_client.list_namespaced_daemon_set, {"namespace": namespace}
+
+    def _all_namespaces_call(self) -> Tuple[Callable, Dict[str, Any]]:
+        return self.api_client.list_daemon_set_for_all_namespaces, {}
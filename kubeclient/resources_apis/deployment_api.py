@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from kubernetes.client import (
     AppsV1Api,
@@ -9,6 +9,10 @@ from kubernetes.client import (
 )
 from kubernetes.utils import create_from_yaml
 
+from .._apply import DEFAULT_FIELD_MANAGER, server_side_apply
+from ..manifests import load_manifests
+from ._objects import object_key
+from ._selector import Selector, parse_label_selector
 from .resource_api import ResourceApi
 
 
@@ -19,31 +23,48 @@ class Deployment(ResourceApi[AppsV1Api]):
 
     api_client_type = AppsV1Api
 
-    def get(self, namespace: str, name: str) -> Optional[V1Deployment]:
+    def get(
+        self, namespace: str, name: str, raw: bool = False
+    ) -> Optional[V1Deployment]:
+        informer = self._informer(namespace)
+        if informer is not None and not raw:
+            return informer.get(namespace, name)
+
         deployment = None
         try:
             deployment = self.api_client.read_namespaced_deployment(
-                name=name, namespace=namespace
+                name=name, namespace=namespace, **self._request_options(raw)
             )
         except exceptions.ApiException as e:
             self._logger.error(
                 f"Failed to get deployment {name} in namespace {namespace}: {e}"
             )
 
-        return deployment
+        return self._decode(deployment, raw)
+
+    def list(
+        self,
+        namespace: str,
+        raw: bool = False,
+        label_selector: Optional[Selector] = None,
+        field_selector: Optional[Selector] = None,
+    ) -> Optional[V1DeploymentList]:
+        informer = self._informer(namespace)
+        if informer is not None and not raw and field_selector is None:
+            return informer.list(parse_label_selector(label_selector))
 
-    def list(self, namespace: str) -> Optional[V1DeploymentList]:
         deployments = None
         try:
             deployments = self.api_client.list_namespaced_deployment(
-                namespace=namespace
+                namespace=namespace,
+                **self._list_options(raw, label_selector, field_selector),
             )
         except exceptions.ApiException as e:
             self._logger.error(
                 f"Failed to list deployments in namespace {namespace}: {e}"
             )
 
-        return deployments
+        return self._decode(deployments, raw)
 
     def create(self, namespace: str, body: V1Deployment) -> Optional[V1Deployment]:
         created_deployment = None
@@ -86,6 +107,31 @@ class Deployment(ResourceApi[AppsV1Api]):
 
         return patched_deployment
 
+    def apply(
+        self,
+        namespace: str,
+        body: V1Deployment,
+        field_manager: str = DEFAULT_FIELD_MANAGER,
+        force: bool = False,
+    ) -> Optional[V1Deployment]:
+        _, name = object_key(body)
+        applied_deployment = None
+        try:
+            with server_side_apply(self.api_client.api_client):
+                applied_deployment = self.api_client.patch_namespaced_deployment(
+                    name=name,
+                    namespace=namespace,
+                    body=body,
+                    field_manager=field_manager,
+                    force=force,
+                )
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to apply deployment {name} in namespace {namespace}: {e}"
+            )
+
+        return applied_deployment
+
     def update(
         self, namespace: str, name: str, body: V1Deployment
     ) -> Optional[V1Deployment]:
@@ -120,7 +166,9 @@ class Deployment(ResourceApi[AppsV1Api]):
         created_deployment = None
         try:
             created_deployment = create_from_yaml(
-                self.api_client, yaml_file_path, namespace=namespace
+                self.api_client.api_client,
+                yaml_objects=load_manifests(yaml_file_path),
+                namespace=namespace,
             )
         except exceptions.ApiException as e:
             self._logger.error(
@@ -134,4 +182,13 @@ class Deployment(ResourceApi[AppsV1Api]):
         if deployment is None:
             return False
 
+        return self._is_object_ready(deployment)
+
+    def _is_object_ready(self, deployment: V1Deployment) -> bool:
         return deployment.status.ready_replicas == deployment.status.replicas
+
+    def _list_call(self, namespace: str) -> Tuple[Callable, Dict[str, Any]]:
+        return self.api_client.list_namespaced_deployment, {"namespace": namespace}
+
+    def _all_namespaces_call(self) -> Tuple[Callable, Dict[str, Any]]:
+        return self.api_client.list_deployment_for_all_namespaces, {}
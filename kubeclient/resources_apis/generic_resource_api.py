@@ -0,0 +1,361 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from kubernetes.client import ApiClient, exceptions
+
+from kubeclient.client import KubernetesApiClient
+
+from .._apply import DEFAULT_FIELD_MANAGER, server_side_apply
+from .._plan import flatten
+from ..discovery import APIResource, Discovery, get_discovery
+from ..manifests import load_manifests
+from ._objects import object_key
+from ._selector import Selector, parse_label_selector
+from .resource_api import ResourceApi
+
+JSON_PATCH_CONTENT_TYPE = "application/json-patch+json"
+MERGE_PATCH_CONTENT_TYPE = "application/merge-patch+json"
+
+_READY_CONDITIONS = ("Ready", "Available", "Established")
+
+
+def _query_param(name: str) -> str:
+    if name == "_continue":
+        return "continue"
+    first, *rest = name.split("_")
+    return first + "".join(word.capitalize() for word in rest)
+
+
+class DynamicApi:
+    """
+    The API methods of any resource described by an APIResource, in the
+    shape of the generated API classes: they raise ApiException and return
+    the objects as dicts, or the response with _preload_content=False.
+    Query parameters are given in snake case, like label_selector.
+    """
+
+    def __init__(self, api_client: Optional[ApiClient] = None) -> None:
+        self.api_client = api_client or ApiClient()
+
+    def _call(
+        self,
+        method: str,
+        resource: APIResource,
+        namespace: Optional[str],
+        name: Optional[str] = None,
+        body: Any = None,
+        content_type: str = "application/json",
+        _preload_content: bool = True,
+        _request_timeout=None,
+        **params,
+    ):
+        header_params = {
+            "Accept": self.api_client.select_header_accept(["application/json"])
+        }
+        if body is not None:
+            header_params["Content-Type"] = self.api_client.select_header_content_type(
+                [content_type]
+            )
+        return self.api_client.call_api(
+            resource.path(namespace, name),
+            method,
+            query_params=[
+                (_query_param(key), value)
+                for key, value in params.items()
+                if value is not None
+            ],
+            header_params=header_params,
+            body=body,
+            response_type="object",
+            auth_settings=["BearerToken"],
+            _return_http_data_only=True,
+            _preload_content=_preload_content,
+            _request_timeout=_request_timeout,
+        )
+
+    def list_resource(
+        self, resource: APIResource, namespace: Optional[str] = None, **kwargs
+    ):
+        """
+        List or watch the objects of a resource, in every namespace when the
+        namespace is None.
+        :return: object
+        """
+        return self._call("GET", resource, namespace, **kwargs)
+
+    def read_resource(
+        self,
+        resource: APIResource,
+        name: str,
+        namespace: Optional[str] = None,
+        **kwargs,
+    ):
+        return self._call("GET", resource, namespace, name, **kwargs)
+
+    def create_resource(
+        self, resource: APIResource, body, namespace: Optional[str] = None, **kwargs
+    ):
+        return self._call("POST", resource, namespace, body=body, **kwargs)
+
+    def replace_resource(
+        self,
+        resource: APIResource,
+        name: str,
+        body,
+        namespace: Optional[str] = None,
+        **kwargs,
+    ):
+        return self._call("PUT", resource, namespace, name, body=body, **kwargs)
+
+    def patch_resource(
+        self,
+        resource: APIResource,
+        name: str,
+        body,
+        namespace: Optional[str] = None,
+        **kwargs,
+    ):
+        """
+        Patch an object with a JSON patch when the body is a list of
+        operations, or a JSON merge patch otherwise.
+        """
+        content_type = (
+            JSON_PATCH_CONTENT_TYPE
+            if isinstance(body, list)
+            else MERGE_PATCH_CONTENT_TYPE
+        )
+        return self._call(
+            "PATCH",
+            resource,
+            namespace,
+            name,
+            body=body,
+            content_type=content_type,
+            **kwargs,
+        )
+
+    def delete_resource(
+        self,
+        resource: APIResource,
+        name: str,
+        namespace: Optional[str] = None,
+        **kwargs,
+    ):
+        return self._call("DELETE", resource, namespace, name, **kwargs)
+
+
+class GenericResource(ResourceApi[DynamicApi]):
+    """
+    A class to manage any Kubernetes resource, built-in or custom, found by
+    API discovery from its kind or name, like:
+        GenericResource(client, "ConfigMap")
+        GenericResource(client, "widgets.example.com")
+    The objects are dicts. The namespace is ignored for cluster scoped
+    resources.
+    api_version:Optional: The group version, like "apps/v1", the preferred
+        version of the group by default.
+    discovery:Optional: The Discovery resolving the resource, the one shared
+        by the client by default.
+    """
+
+    api_client_type = DynamicApi
+    resource: APIResource
+
+    def __init__(
+        self,
+        kubeclient: KubernetesApiClient,
+        resource: str,
+        api_version: Optional[str] = None,
+        discovery: Optional[Discovery] = None,
+    ):
+        super().__init__(kubeclient)
+        discovery = discovery or get_discovery(kubeclient)
+        self.resource = discovery.resolve(resource, api_version)
+
+    def _scope(self, namespace: Optional[str]) -> Dict[str, Any]:
+        return {
+            "resource": self.resource,
+            "namespace": namespace if self.resource.namespaced else None,
+        }
+
+    def get(self, namespace: Optional[str], name: str, raw: bool = False):
+        scope = self._scope(namespace)
+        informer = self._informer(namespace)
+        if informer is not None and not raw:
+            return informer.get(scope["namespace"], name)
+
+        obj = None
+        try:
+            obj = self.api_client.read_resource(
+                name=name, **scope, **self._request_options(raw)
+            )
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to get {self.resource.kind} {name} in namespace {namespace}: {e}"
+            )
+
+        return self._decode(obj, raw)
+
+    def list(
+        self,
+        namespace: Optional[str],
+        raw: bool = False,
+        label_selector: Optional[Selector] = None,
+        field_selector: Optional[Selector] = None,
+    ):
+        informer = self._informer(namespace)
+        if informer is not None and not raw and field_selector is None:
+            return informer.list(parse_label_selector(label_selector))
+
+        objects = None
+        try:
+            objects = self.api_client.list_resource(
+                **self._scope(namespace),
+                **self._list_options(raw, label_selector, field_selector),
+            )
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to list {self.resource.name} in namespace {namespace}: {e}"
+            )
+
+        return self._decode(objects, raw)
+
+    def create(self, namespace: Optional[str], body: dict) -> Optional[dict]:
+        created = None
+        try:
+            created = self.api_client.create_resource(
+                body=body, **self._scope(namespace)
+            )
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to create {self.resource.kind} {object_key(body)[1]} in namespace {namespace}: {e}"
+            )
+
+        return created
+
+    def delete(self, namespace: Optional[str], name: str) -> Optional[dict]:
+        deleted = None
+        try:
+            deleted = self.api_client.delete_resource(
+                name=name, **self._scope(namespace)
+            )
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to delete {self.resource.kind} {name} in namespace {namespace}: {e}"
+            )
+
+        return deleted
+
+    def patch(self, namespace: Optional[str], name: str, body) -> Optional[dict]:
+        patched = None
+        try:
+            patched = self.api_client.patch_resource(
+                name=name, body=body, **self._scope(namespace)
+            )
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to patch {self.resource.kind} {name} in namespace {namespace}: {e}"
+            )
+
+        return patched
+
+    def apply(
+        self,
+        namespace: Optional[str],
+        body: dict,
+        field_manager: str = DEFAULT_FIELD_MANAGER,
+        force: bool = False,
+    ) -> Optional[dict]:
+        _, name = object_key(body)
+        applied = None
+        try:
+            with server_side_apply(self.api_client.api_client):
+                applied = self.api_client.patch_resource(
+                    name=name,
+                    body=body,
+                    field_manager=field_manager,
+                    force=force,
+                    **self._scope(namespace),
+                )
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to apply {self.resource.kind} {name} in namespace {namespace}: {e}"
+            )
+
+        return applied
+
+    def update(self, namespace: Optional[str], name: str, body: dict) -> Optional[dict]:
+        updated = None
+        try:
+            updated = self.api_client.replace_resource(
+                name=name, body=body, **self._scope(namespace)
+            )
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to update {self.resource.kind} {name} in namespace {namespace}: {e}"
+            )
+
+        return updated
+
+    def create_from_yaml(
+        self, namespace: Optional[str], yaml_file_path: str
+    ) -> Optional[List[dict]]:
+        """
+        Create the objects of the resource kind defined in a yaml file, the
+        others are ignored.
+        """
+        created = []
+        try:
+            for obj in flatten(load_manifests(yaml_file_path)):
+                if obj.get("kind") != self.resource.kind:
+                    continue
+                namespace_of = (obj.get("metadata") or {}).get("namespace", namespace)
+                created.append(
+                    self.api_client.create_resource(
+                        body=obj, **self._scope(namespace_of)
+                    )
+                )
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to create {self.resource.name} from yaml in namespace {namespace}: {e}"
+            )
+            return None
+
+        return created
+
+    def is_ready(self, namespace: Optional[str], name: str) -> bool:
+        obj = self.get(namespace, name)
+        if obj is None:
+            return False
+
+        return self._is_object_ready(obj)
+
+    def _is_object_ready(self, obj: dict) -> bool:
+        """
+        A generic readiness predicate: the controller has observed the last
+        generation, and the Ready, Available or Established condition, or
+        else the ready replicas, say so.
+        """
+        metadata = obj.get("metadata") or {}
+        status = obj.get("status") or {}
+        generation = metadata.get("generation")
+        observed = status.get("observedGeneration")
+        if generation is not None and observed is not None and observed < generation:
+            return False
+
+        conditions = {
+            condition.get("type"): condition.get("status")
+            for condition in status.get("conditions") or []
+        }
+        for condition in _READY_CONDITIONS:
+            if condition in conditions:
+                return conditions[condition] == "True"
+        if "replicas" in status:
+            return status.get("readyReplicas", 0) >= status["replicas"]
+
+        return True
+
+    def _list_call(self, namespace: Optional[str]) -> Tuple[Callable, Dict[str, Any]]:
+        return self.api_client.list_resource, self._scope(namespace)
+
+    def _all_namespaces_call(self) -> Tuple[Callable, Dict[str, Any]]:
+        return self.api_client.list_resource, self._scope(None)
@@ -1,8 +1,12 @@
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from kubernetes.client import CoreV1Api, V1Namespace, V1NamespaceList, exceptions
 from kubernetes.utils import create_from_yaml
 
+from .._apply import DEFAULT_FIELD_MANAGER, server_side_apply
+from ..manifests import load_manifests
+from ._objects import object_key
+from ._selector import Selector, parse_label_selector
 from .resource_api import ResourceApi
 
 
@@ -13,23 +17,40 @@ class Namespace(ResourceApi[CoreV1Api]):
 
     api_client_type = CoreV1Api
 
-    def get(self, name: str) -> Optional[V1Namespace]:
+    def get(self, name: str, raw: bool = False) -> Optional[V1Namespace]:
+        informer = self._informer(None)
+        if informer is not None and not raw:
+            return informer.get(None, name)
+
         namespace = None
         try:
-            namespace = self.api_client.read_namespace(name=name)
+            namespace = self.api_client.read_namespace(
+                name=name, **self._request_options(raw)
+            )
         except exceptions.ApiException as e:
             self._logger.error(f"Failed to get namespace {name}: {e}")
 
-        return namespace
+        return self._decode(namespace, raw)
+
+    def list(
+        self,
+        raw: bool = False,
+        label_selector: Optional[Selector] = None,
+        field_selector: Optional[Selector] = None,
+    ) -> Optional[V1NamespaceList]:
+        informer = self._informer(None)
+        if informer is not None and not raw and field_selector is None:
+            return informer.list(parse_label_selector(label_selector))
 
-    def list(self) -> Optional[V1NamespaceList]:
         namespaces = None
         try:
-            namespaces = self.api_client.list_namespace()
+            namespaces = self.api_client.list_namespace(
+                **self._list_options(raw, label_selector, field_selector)
+            )
         except exceptions.ApiException as e:
             self._logger.error(f"Failed to list namespaces: {e}")
 
-        return namespaces
+        return self._decode(namespaces, raw)
 
     def create(self, body: V1Namespace) -> Optional[V1Namespace]:
         created_namespace = None
@@ -58,6 +79,24 @@ class Namespace(ResourceApi[CoreV1Api]):
 
         return patched_namespace
 
+    def apply(
+        self,
+        body: V1Namespace,
+        field_manager: str = DEFAULT_FIELD_MANAGER,
+        force: bool = False,
+    ) -> Optional[V1Namespace]:
+        _, name = object_key(body)
+        applied_namespace = None
+        try:
+            with server_side_apply(self.api_client.api_client):
+                applied_namespace = self.api_client.patch_namespace(
+                    name=name, body=body, field_manager=field_manager, force=force
+                )
+        except exceptions.ApiException as e:
+            self._logger.error(f"Failed to apply namespace {name}: {e}")
+
+        return applied_namespace
+
     def update(self, name: str, body: V1Namespace) -> Optional[V1Namespace]:
         updated_namespace = None
         try:
@@ -70,7 +109,9 @@ class Namespace(ResourceApi[CoreV1Api]):
     def create_from_yaml(self, yaml_file_path: str) -> Optional[List[V1Namespace]]:
         created_namespace = None
         try:
-            created_namespace = create_from_yaml(self.api_client, yaml_file_path)
+            created_namespace = create_from_yaml(
+                self.api_client.api_client, yaml_objects=load_manifests(yaml_file_path)
+            )
         except exceptions.ApiException as e:
             self._logger.error(f"Failed to create namespace from yaml: {e}")
 
@@ -78,4 +119,10 @@ class Namespace(ResourceApi[CoreV1Api]):
 
     def is_ready(self, namespace: str, name: str) -> bool:
         namespace = self.get(name)
-        return namespace is not None and namespace.status.phase == "Active"
+        return namespace is not None and self._is_object_ready(namespace)
+
+    def _is_object_ready(self, namespace: V1Namespace) -> bool:
+        return namespace.status.phase == "Active"
+
+    def _list_call(self, namespace: Optional[str]) -> Tuple[Callable, Dict[str, Any]]:
+        return self.api_client.list_namespace, {}
@@ -1,8 +1,12 @@
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from kubernetes.client import CoreV1Api, V1Pod, V1PodList, exceptions
 from kubernetes.utils import create_from_yaml
 
+from .._apply import DEFAULT_FIELD_MANAGER, server_side_apply
+from ..manifests import load_manifests
+from ._objects import object_key
+from ._selector import Selector, parse_label_selector
 from .resource_api import ResourceApi
 
 
@@ -13,25 +17,44 @@ class Pod(ResourceApi[CoreV1Api]):
 
     api_client_type = CoreV1Api
 
-    def get(self, namespace: str, name: str) -> Optional[V1Pod]:
+    def get(self, namespace: str, name: str, raw: bool = False) -> Optional[V1Pod]:
+        informer = self._informer(namespace)
+        if informer is not None and not raw:
+            return informer.get(namespace, name)
+
         pod = None
         try:
-            pod = self.api_client.read_namespaced_pod(name=name, namespace=namespace)
+            pod = self.api_client.read_namespaced_pod(
+                name=name, namespace=namespace, **self._request_options(raw)
+            )
         except exceptions.ApiException as e:
             self._logger.error(
                 f"Failed to get pod {name} in namespace {namespace}: {e}"
             )
 
-        return pod
+        return self._decode(pod, raw)
+
+    def list(
+        self,
+        namespace: str,
+        raw: bool = False,
+        label_selector: Optional[Selector] = None,
+        field_selector: Optional[Selector] = None,
+    ) -> Optional[V1PodList]:
+        informer = self._informer(namespace)
+        if informer is not None and not raw and field_selector is None:
+            return informer.list(parse_label_selector(label_selector))
 
-    def list(self, namespace: str) -> Optional[V1PodList]:
         pods = None
         try:
-            pods = self.api_client.list_namespaced_pod(namespace=namespace)
+            pods = self.api_client.list_namespaced_pod(
+                namespace=namespace,
+                **self._list_options(raw, label_selector, field_selector),
+            )
         except exceptions.ApiException as e:
             self._logger.error(f"Failed to list pods in namespace {namespace}: {e}")
 
-        return pods
+        return self._decode(pods, raw)
 
     def create(self, namespace: str, body: V1Pod) -> Optional[V1Pod]:
         created_pod = None
@@ -52,7 +75,9 @@ class Pod(ResourceApi[CoreV1Api]):
         created_pod = None
         try:
             created_pod = create_from_yaml(
-                self.api_client, yaml_file_path, namespace=namespace
+                self.api_client.api_client,
+                yaml_objects=load_manifests(yaml_file_path),
+                namespace=namespace,
             )
         except exceptions.ApiException as e:
             self._logger.error(
@@ -87,6 +112,31 @@ class Pod(ResourceApi[CoreV1Api]):
 
         return patched_pod
 
+    def apply(
+        self,
+        namespace: str,
+        body: V1Pod,
+        field_manager: str = DEFAULT_FIELD_MANAGER,
+        force: bool = False,
+    ) -> Optional[V1Pod]:
+        _, name = object_key(body)
+        applied_pod = None
+        try:
+            with server_side_apply(self.api_client.api_client):
+                applied_pod = self.api_client.patch_namespaced_pod(
+                    name=name,
+                    namespace=namespace,
+                    body=body,
+                    field_manager=field_manager,
+                    force=force,
+                )
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to apply pod {name} in namespace {namespace}: {e}"
+            )
+
+        return applied_pod
+
     def update(self, namespace: str, name: str, body: V1Pod) -> Optional[V1Pod]:
         updated_pod = None
         try:
@@ -105,4 +155,13 @@ class Pod(ResourceApi[CoreV1Api]):
         if pod is None:
             return False
 
+        return self._is_object_ready(pod)
+
+    def _is_object_ready(self, pod: V1Pod) -> bool:
         return pod.status.phase == "Running"
+
+    def _list_call(self, namespace: str) -> Tuple[Callable, Dict[str, Any]]:
+        return self.api_client.list_namespaced_pod, {"namespace": namespace}
+
+    def _all_namespaces_call(self) -> Tuple[Callable, Dict[str, Any]]:
+        return self.api_client.list_pod_for_all_namespaces, {}
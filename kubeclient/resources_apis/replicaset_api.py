@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from kubernetes.client import (
     AppsV1Api,
@@ -9,6 +9,10 @@ from kubernetes.client import (
 )
 from kubernetes.utils import create_from_yaml
 
+from .._apply import DEFAULT_FIELD_MANAGER, server_side_apply
+from ..manifests import load_manifests
+from ._objects import object_key
+from ._selector import Selector, parse_label_selector
 from .resource_api import ResourceApi
 
 
@@ -19,31 +23,48 @@ class ReplicaSet(ResourceApi[AppsV1Api]):
 
     api_client_type = AppsV1Api
 
-    def get(self, namespace: str, name: str) -> Optional[V1ReplicaSet]:
+    def get(
+        self, namespace: str, name: str, raw: bool = False
+    ) -> Optional[V1ReplicaSet]:
+        informer = self._informer(namespace)
+        if informer is not None and not raw:
+            return informer.get(namespace, name)
+
         replicaset = None
         try:
             replicaset = self.api_client.read_namespaced_replica_set(
-                name=name, namespace=namespace
+                name=name, namespace=namespace, **self._request_options(raw)
             )
         except exceptions.ApiException as e:
             self._logger.error(
                 f"Failed to get replicaset {name} in namespace {namespace}: {e}"
             )
 
-        return replicaset
+        return self._decode(replicaset, raw)
+
+    def list(
+        self,
+        namespace: str,
+        raw: bool = False,
+        label_selector: Optional[Selector] = None,
+        field_selector: Optional[Selector] = None,
+    ) -> Optional[V1ReplicaSetList]:
+        informer = self._informer(namespace)
+        if informer is not None and not raw and field_selector is None:
+            return informer.list(parse_label_selector(label_selector))
 
-    def list(self, namespace: str) -> Optional[V1ReplicaSetList]:
         replicasets = None
         try:
             replicasets = self.api_client.list_namespaced_replica_set(
-                namespace=namespace
+                namespace=namespace,
+                **self._list_options(raw, label_selector, field_selector),
             )
         except exceptions.ApiException as e:
             self._logger.error(
                 f"Failed to list replicasets in namespace {namespace}: {e}"
             )
 
-        return replicasets
+        return self._decode(replicasets, raw)
 
     def create(self, namespace: str, body: V1ReplicaSet) -> Optional[V1ReplicaSet]:
         created_replicaset = None
@@ -86,6 +107,31 @@ class ReplicaSet(ResourceApi[AppsV1Api]):
 
         return patched_replicaset
 
+    def apply(
+        self,
+        namespace: str,
+        body: V1ReplicaSet,
+        field_manager: str = DEFAULT_FIELD_MANAGER,
+        force: bool = False,
+    ) -> Optional[V1ReplicaSet]:
+        _, name = object_key(body)
+        applied_replicaset = None
+        try:
+            with server_side_apply(self.api_client.api_client):
+                applied_replicaset = self.api_client.patch_namespaced_replica_set(
+                    name=name,
+                    namespace=namespace,
+                    body=body,
+                    field_manager=field_manager,
+                    force=force,
+                )
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to apply replicaset {name} in namespace {namespace}: {e}"
+            )
+
+        return applied_replicaset
+
     def update(
         self, namespace: str, name: str, body: V1ReplicaSet
     ) -> Optional[V1ReplicaSet]:
@@ -120,7 +166,9 @@ class ReplicaSet(ResourceApi[AppsV1Api]):
         created_replicaset = None
         try:
             created_replicaset = create_from_yaml(
-                self.api_client, yaml_file_path, namespace=namespace
+                self.api_client.api_client,
+                yaml_objects=load_manifests(yaml_file_path),
+                namespace=namespace,
             )
         except exceptions.ApiException as e:
             self._logger.error(
@@ -134,6 +182,15 @@ class ReplicaSet(ResourceApi[AppsV1Api]):
         if replicaset is None:
             return False
 
+        return self._is_object_ready(replicaset)
+
+    def _is_object_ready(self, replicaset: V1ReplicaSet) -> bool:
         ready_replicas = replicaset.status.ready_replicas
         desired_replicas = replicaset.spec.replicas
         return ready_replicas == desired_replicas
+
+    def _list_call(self, namespace: str) -> Tuple[Callable, Dict[str, Any]]:
+        return self.api_client.list_namespaced_replica_set, {"namespace": namespace}
+
+    def _all_namespaces_call(self) -> Tuple[Callable, Dict[str, Any]]:
+        return self.api_client.list_replica_set_for_all_namespaces, {}
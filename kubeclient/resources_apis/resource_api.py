@@ -1,12 +1,75 @@
+import json
 import logging
+import math
+import time
 from abc import ABCMeta, abstractmethod
-from typing import Generic, List, Optional, Type, TypeVar
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
+from kubernetes import watch
+from kubernetes.client import CoreV1Api, exceptions
+
+from .._apply import DEFAULT_FIELD_MANAGER, server_side_apply
+from .._headers import override_header
+from .._raw import RAW_REQUEST_OPTIONS, decode
 from ..client import KubernetesApiClient
+from ._batch import DEFAULT_CONCURRENCY, BatchResults, run_batch
 from ._condition import Condition
+from ._informer import (
+    HTTP_STATUS_GONE,
+    Informer,
+    get_shared_informer,
+    start_shared_informer,
+    stop_shared_informer,
+)
+from ._metadata import PARTIAL_OBJECT_METADATA_LIST_ACCEPT, ObjectMetadata
+from ._objects import list_continue, list_items, list_resource_version, object_key
+from ._projection import Fields, Projection
+from ._selector import (
+    Selector,
+    format_field_selector,
+    parse_label_selector,
+    selector_options,
+)
+
+HTTP_STATUS_FORBIDDEN = 403
 
 T = TypeVar("T")
-logging.basicConfig(level=logging.INFO)
+
+
+def _expired_continue(error: exceptions.ApiException) -> Optional[str]:
+    """
+    Return the continue token of a 410 ResourceExpired status, if the
+    apiserver offered one to resume an inconsistent list.
+    """
+    try:
+        return json.loads(error.body).get("metadata", {}).get("continue")
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def _body_name(body) -> Optional[str]:
+    try:
+        return object_key(body)[1]
+    except AttributeError:
+        return None
 
 
 class ResourceApi(Generic[T], metaclass=ABCMeta):
@@ -45,6 +108,39 @@ class ResourceApi(Generic[T], metaclass=ABCMeta):
     def patch(self, namespace: str, name: str, body: dict, **kwargs):
         raise NotImplementedError
 
+    def apply(
+        self,
+        namespace: str,
+        body: dict,
+        field_manager: str = DEFAULT_FIELD_MANAGER,
+        force: bool = False,
+    ):
+        """
+        Create or update the object with a server-side apply patch, in one
+        request and without a read-modify-write cycle. The body must carry
+        apiVersion, kind and metadata.name.
+        Patches through the patch function of the resource found by
+        _list_call, so subclasses only override it to type their objects.
+        """
+        name = _body_name(body)
+        applied = None
+        try:
+            func, scope = self._verb_call("patch", namespace)
+            with server_side_apply(self.api_client.api_client):
+                applied = func(
+                    **scope,
+                    name=name,
+                    body=body,
+                    field_manager=field_manager,
+                    force=force,
+                )
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to apply {self.__class__.__name__} {name} in namespace {namespace}: {e}"
+            )
+
+        return applied
+
     @abstractmethod
     def update(self, namespace: str, name: str, body: dict, **kwargs):
         raise NotImplementedError
@@ -53,13 +149,419 @@ class ResourceApi(Generic[T], metaclass=ABCMeta):
     def is_ready(self, namespace: str, name: str, **kwargs):
         raise NotImplementedError
 
+    def _list_call(self, namespace: Optional[str]) -> Tuple[Callable, Dict[str, Any]]:
+        """
+        Return the list function of the resource and the keyword arguments
+        that scope it, so generic helpers can list and watch any kind.
+        """
+        raise NotImplementedError
+
+    def _is_object_ready(self, obj) -> bool:
+        """
+        The readiness predicate of the resource, evaluated on a fetched object.
+        """
+        raise NotImplementedError
+
+    def iter_list(
+        self,
+        namespace: Optional[str] = None,
+        page_size: int = 500,
+        raw: bool = False,
+        label_selector: Optional[Selector] = None,
+        field_selector: Optional[Selector] = None,
+        **kwargs,
+    ) -> Iterator:
+        """
+        List the resource page by page using limit/continue and yield the
+        items lazily, so memory is bounded by the page size.
+        If a continue token expires, the list resumes from the token the
+        apiserver returns with the 410 error, or restarts from the beginning
+        and skips the objects up to the last yielded one when it returns none.
+        A failure before the first item is logged and nothing is yielded, like
+        list returning None. A failure after it raises the ApiException, so a
+        truncated list is never taken for a complete one.
+        page_size:Optional: The maximum number of items fetched per request.
+        raw:Optional: Yield RawObject views of the decoded JSON instead of models.
+        label_selector:Optional: Only list the objects whose labels match.
+        field_selector:Optional: Only list the objects whose fields match.
+        """
+        func, scope = self._list_call(namespace)
+        kwargs.update(self._list_options(raw, label_selector, field_selector))
+        yielded = False
+        try:
+            for obj in self._paginate(func, dict(scope, **kwargs), page_size, raw):
+                yielded = True
+                yield obj
+        except exceptions.ApiException as e:
+            if yielded:
+                raise
+            self._logger.error(
+                f"Failed to list {self.__class__.__name__} in namespace {namespace}: {e}"
+            )
+
+    def _paginate(
+        self, func: Callable, kwargs: Dict[str, Any], page_size: int, raw: bool
+    ) -> Iterator:
+        """
+        Yield the items of a list call page by page, raising its errors.
+        """
+        last_key = None
+        # The key of the last item yielded before the list restarted from the
+        # beginning, None unless an expired token came without a new one.
+        skip_until = None
+        token = None
+        while True:
+            try:
+                objects = self._decode(
+                    func(**kwargs, limit=page_size, _continue=token), raw
+                )
+            except exceptions.ApiException as e:
+                if e.status != HTTP_STATUS_GONE or token is None:
+                    raise
+
+                self._logger.warning(
+                    f"Continue token expired while listing {self.__class__.__name__}"
+                )
+                token = _expired_continue(e)
+                if token is None:
+                    skip_until = last_key
+                continue
+
+            for obj in list_items(objects):
+                key = "/".join(object_key(obj))
+                # The apiserver returns objects ordered by their storage key,
+                # which makes a restarted list skip what was already yielded.
+                if skip_until is not None and key <= skip_until:
+                    continue
+                last_key = key
+                yield obj
+
+            token = list_continue(objects)
+            if not token:
+                return
+
+    def list_all_namespaces(
+        self,
+        label_selector: Optional[Selector] = None,
+        field_selector: Optional[Selector] = None,
+        page_size: int = 500,
+        raw: bool = False,
+        namespaces: Optional[Iterable[str]] = None,
+        max_workers: int = 8,
+    ) -> Optional[Dict[str, List]]:
+        """
+        List the resource in every namespace with the paginated cluster-wide
+        list call and group the objects by namespace.
+        Identities that are not allowed to list cluster-wide fall back to one
+        list per namespace on a bounded thread pool, skipping the namespaces
+        they cannot read.
+        namespaces:Optional: The namespaces listed by the fallback, by default
+            every namespace of the cluster.
+        max_workers:Optional: The maximum number of concurrent lists of the fallback.
+        """
+        options = self._list_options(raw, label_selector, field_selector)
+        func, scope = self._all_namespaces_call()
+        grouped = defaultdict(list)
+        try:
+            for obj in self._paginate(func, dict(scope, **options), page_size, raw):
+                namespace, _ = object_key(obj)
+                grouped[namespace].append(obj)
+            return dict(grouped)
+        except exceptions.ApiException as e:
+            if e.status != HTTP_STATUS_FORBIDDEN:
+                self._logger.error(
+                    f"Failed to list {self.__class__.__name__} in all namespaces: {e}"
+                )
+                return None
+
+        self._logger.warning(
+            f"Not allowed to list {self.__class__.__name__} in all namespaces, "
+            "listing them namespace by namespace"
+        )
+        if namespaces is None:
+            namespaces = self._namespace_names(page_size)
+            if namespaces is None:
+                return None
+
+        def list_namespace(namespace: str) -> List:
+            func, scope = self._list_call(namespace)
+            try:
+                return list(
+                    self._paginate(func, dict(scope, **options), page_size, raw)
+                )
+            except exceptions.ApiException as e:
+                if e.status != HTTP_STATUS_FORBIDDEN:
+                    raise
+                self._logger.warning(
+                    f"Not allowed to list {self.__class__.__name__} in namespace {namespace}"
+                )
+                return []
+
+        namespaces = list(namespaces)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(list_namespace, namespaces))
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to list {self.__class__.__name__} namespace by namespace: {e}"
+            )
+            return None
+
+        return {
+            namespace: objects
+            for namespace, objects in zip(namespaces, results)
+            if objects
+        }
+
+    def _all_namespaces_call(self) -> Tuple[Callable, Dict[str, Any]]:
+        """
+        Return the cluster-wide list function of a namespaced resource and
+        its keyword arguments.
+        """
+        raise NotImplementedError
+
+    def _namespace_names(self, page_size: int) -> Optional[List[str]]:
+        core_v1 = CoreV1Api(self.api_client.api_client)
+        try:
+            return [
+                object_key(namespace)[1]
+                for namespace in self._paginate(
+                    core_v1.list_namespace, dict(RAW_REQUEST_OPTIONS), page_size, True
+                )
+            ]
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to list the namespaces to list {self.__class__.__name__} in: {e}"
+            )
+            return None
+
+    def project(
+        self,
+        namespace: Optional[str],
+        fields: Union[Fields, Projection],
+        page_size: int = 500,
+        **kwargs,
+    ) -> Iterator:
+        """
+        List the resource and yield compact named tuple records holding only
+        the given fields, built from the decoded JSON of each page.
+        fields: The dotted field paths to keep, like "metadata.name" or
+            "spec.containers.image", or a mapping of record names to paths.
+        page_size:Optional: The maximum number of items fetched per request.
+        """
+        projection = fields if isinstance(fields, Projection) else Projection(fields)
+        for obj in self.iter_list(namespace, page_size, raw=True, **kwargs):
+            yield projection(obj.to_dict())
+
+    def _request_options(self, raw: bool) -> Dict[str, Any]:
+        """
+        The request options of the raw mode, which skips the deserialization
+        of the response into the generated models.
+        """
+        return RAW_REQUEST_OPTIONS if raw else {}
+
+    def list_metadata(
+        self,
+        namespace: Optional[str] = None,
+        label_selector: Optional[Selector] = None,
+        field_selector: Optional[Selector] = None,
+        page_size: int = 500,
+    ) -> Optional[List[ObjectMetadata]]:
+        """
+        List the metadata of the objects of the resource, without their spec
+        and status. The apiserver is asked for a PartialObjectMetadataList,
+        which is decoded page by page into ObjectMetadata records. When an
+        informer is running, the records are built from its store instead.
+        page_size:Optional: The maximum number of items fetched per request.
+        """
+        informer = self._informer(namespace)
+        if informer is not None and field_selector is None:
+            serialize = self.api_client.api_client.sanitize_for_serialization
+            objects = informer.list(parse_label_selector(label_selector), copies=False)
+            return [
+                ObjectMetadata(serialize(obj).get("metadata") or {})
+                for obj in list_items(objects)
+            ]
+
+        func, scope = self._list_call(namespace)
+        options = self._list_options(True, label_selector, field_selector)
+        records = []
+        token = None
+        try:
+            with override_header(
+                self.api_client.api_client,
+                "Accept",
+                PARTIAL_OBJECT_METADATA_LIST_ACCEPT,
+            ):
+                while True:
+                    objects = decode(
+                        func(**scope, **options, limit=page_size, _continue=token)
+                    ).to_dict()
+                    records.extend(
+                        ObjectMetadata(obj.get("metadata") or {})
+                        for obj in list_items(objects)
+                    )
+                    token = list_continue(objects)
+                    if not token:
+                        return records
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to list {self.__class__.__name__} metadata in namespace {namespace}: {e}"
+            )
+            return None
+
+    def _list_options(
+        self,
+        raw: bool,
+        label_selector: Optional[Selector],
+        field_selector: Optional[Selector],
+    ) -> Dict[str, Any]:
+        return dict(
+            selector_options(label_selector, field_selector),
+            **self._request_options(raw),
+        )
+
+    def _decode(self, response, raw: bool):
+        return decode(response) if raw else response
+
+    def _verb_call(
+        self, verb: str, namespace: Optional[str]
+    ) -> Tuple[Callable, Dict[str, Any]]:
+        """
+        Return the function of another verb of the resource, like
+        create_namespaced_pod for list_namespaced_pod, and the keyword
+        arguments that scope it. Unlike the single-object methods, it raises
+        its ApiExceptions.
+        """
+        func, scope = self._list_call(namespace)
+        name = func.__name__.replace("list", verb, 1)
+        return getattr(self.api_client, name), scope
+
+    def create_many(
+        self,
+        namespace: Optional[str],
+        bodies: Iterable,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        fail_fast: bool = False,
+        ordering_key: Optional[Callable[[Any], Hashable]] = None,
+        **kwargs,
+    ) -> BatchResults:
+        """
+        Create many objects of the resource concurrently over the worker pool
+        shared by every batch, and return the outcome of each body in order,
+        with the ApiException of the failed ones.
+        namespace: The namespace, None for cluster scoped resources.
+        concurrency:Optional: The maximum number of requests of this batch in flight.
+        fail_fast:Optional: Skip the bodies not started yet after a failure.
+        ordering_key:Optional: A function of a body; the bodies with the same
+            key are created one after the other in their order.
+        """
+        func, scope = self._verb_call("create", namespace)
+        return run_batch(
+            lambda body: func(**scope, body=body, **kwargs),
+            bodies,
+            _body_name,
+            concurrency,
+            fail_fast,
+            ordering_key,
+        )
+
+    def patch_many(
+        self,
+        namespace: Optional[str],
+        patches: Union[Mapping[str, Any], Iterable[Tuple[str, Any]]],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        fail_fast: bool = False,
+        ordering_key: Optional[Callable[[Tuple[str, Any]], Hashable]] = None,
+        **kwargs,
+    ) -> BatchResults:
+        """
+        Patch many objects of the resource concurrently, like create_many.
+        patches: The patch bodies by name, or (name, body) pairs to patch the
+            same object several times.
+        ordering_key:Optional: A function of a (name, body) pair.
+        """
+        if isinstance(patches, Mapping):
+            patches = patches.items()
+        func, scope = self._verb_call("patch", namespace)
+        return run_batch(
+            lambda patch: func(**scope, name=patch[0], body=patch[1], **kwargs),
+            patches,
+            lambda patch: patch[0],
+            concurrency,
+            fail_fast,
+            ordering_key,
+        )
+
+    def delete_many(
+        self,
+        namespace: Optional[str],
+        names: Iterable[str],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        fail_fast: bool = False,
+        ordering_key: Optional[Callable[[str], Hashable]] = None,
+        **kwargs,
+    ) -> BatchResults:
+        """
+        Delete many objects of the resource by name concurrently, like
+        create_many.
+        """
+        func, scope = self._verb_call("delete", namespace)
+        return run_batch(
+            lambda name: func(**scope, name=name, **kwargs),
+            names,
+            lambda name: name,
+            concurrency,
+            fail_fast,
+            ordering_key,
+        )
+
+    def start_informer(
+        self, namespace: Optional[str] = None, timeout: Optional[float] = 30, **options
+    ) -> Informer:
+        """
+        Start the shared informer of the resource in a namespace, or join the
+        one another ResourceApi on the same client already started, and wait
+        for its initial list. Once synced, get and list read from its store.
+        timeout:Optional: The timeout in seconds to wait for the initial list.
+        """
+        func, kwargs = self._list_call(namespace)
+        informer = start_shared_informer(
+            self.api_client.api_client, func, kwargs, **options
+        )
+        if not informer.wait_for_sync(timeout):
+            self._logger.warning(
+                f"Informer for {self.__class__.__name__} in namespace {namespace} has not synced yet"
+            )
+
+        return informer
+
+    def stop_informer(self, namespace: Optional[str] = None) -> None:
+        func, kwargs = self._list_call(namespace)
+        stop_shared_informer(self.api_client.api_client, func, kwargs)
+
+    def _informer(self, namespace: Optional[str]) -> Optional[Informer]:
+        """
+        Return the synced shared informer of the resource in a namespace, if any.
+        """
+        func, kwargs = self._list_call(namespace)
+        informer = get_shared_informer(self.api_client.api_client, func, kwargs)
+        if informer is None or not informer.has_synced:
+            return None
+
+        return informer
+
     def wait_for_ready(
         self,
         namespace: str,
         name: str,
         timeout: Optional[int],
         interval: Optional[float],
+        use_watch: bool = False,
     ) -> bool:
+        if use_watch:
+            return self.watch_for_ready(namespace, name, timeout)
+
         return self.wait_for_condition(
             Condition(
                 name=f"{self.__class__.__name__} {name} in namespace {namespace} to be ready",
@@ -69,6 +571,175 @@ class ResourceApi(Generic[T], metaclass=ABCMeta):
             )
         )
 
+    def watch_for_ready(
+        self, namespace: str, name: str, timeout: Optional[int]
+    ) -> bool:
+        """
+        Wait for the resource to be ready using a watch instead of polling.
+        The object is listed once with a field selector on its name and then
+        watched from the returned resourceVersion, so readiness is seen as soon
+        as the apiserver reports it. An expired resourceVersion triggers a relist.
+        timeout:Optional: The timeout in seconds, None to wait forever.
+        """
+        description = (
+            f"{self.__class__.__name__} {name} in namespace {namespace} to be ready"
+        )
+        self._logger.info(f"Watching for {description}")
+
+        func, kwargs = self._list_call(namespace)
+        kwargs["field_selector"] = f"metadata.name={name}"
+        deadline = None if timeout is None else time.monotonic() + timeout
+        resource_version = None
+        while True:
+            if resource_version is None:
+                try:
+                    objects = func(**kwargs)
+                except exceptions.ApiException as e:
+                    self._logger.error(
+                        f"Failed to list while watching for {description}: {e}"
+                    )
+                    return False
+
+                if any(self._is_object_ready(obj) for obj in list_items(objects)):
+                    return True
+                resource_version = list_resource_version(objects)
+
+            watch_kwargs = dict(kwargs, resource_version=resource_version)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._logger.error(f"Timeout watching for {description}")
+                    return False
+                # The apiserver takes whole seconds, the deadline is also
+                # checked on every event.
+                watch_kwargs["timeout_seconds"] = math.ceil(remaining)
+
+            stream = watch.Watch()
+            try:
+                for event in stream.stream(func, **watch_kwargs):
+                    if event["type"] in ("ADDED", "MODIFIED") and self._is_object_ready(
+                        event["object"]
+                    ):
+                        return True
+                    if deadline is not None and time.monotonic() >= deadline:
+                        break
+                resource_version = stream.resource_version or resource_version
+            except exceptions.ApiException as e:
+                if e.status != HTTP_STATUS_GONE:
+                    self._logger.error(f"Failed to watch for {description}: {e}")
+                    return False
+                resource_version = None
+            finally:
+                stream.stop()
+
+    def wait_for_all_ready(
+        self,
+        targets: Iterable[Tuple[str, str]],
+        timeout: Optional[int],
+        interval: Optional[float] = 0.5,
+    ) -> Tuple[Dict[Tuple[str, str], bool], Set[Tuple[str, str]]]:
+        """
+        Wait for many objects of this resource to be ready at once.
+        The targets are grouped by namespace and each group is checked with
+        one list per tick, or from the informer store when one is running,
+        instead of one get per object.
+        targets: The (namespace, name) pairs to wait for.
+        Return the readiness of every target and the targets still pending.
+        """
+        results = {target: False for target in targets}
+        pending = defaultdict(set)
+        for namespace, name in results:
+            pending[namespace].add(name)
+
+        def check() -> bool:
+            for namespace in list(pending):
+                names = pending[namespace]
+                try:
+                    for obj in self._iter_objects(namespace):
+                        _, name = object_key(obj)
+                        if name in names and self._is_object_ready(obj):
+                            names.discard(name)
+                            results[(namespace, name)] = True
+                except exceptions.ApiException as e:
+                    # Checked again on the next tick.
+                    self._logger.warning(
+                        f"Failed to list {self.__class__.__name__} in namespace {namespace}: {e}"
+                    )
+                if not names:
+                    del pending[namespace]
+            return not pending
+
+        self.wait_for_condition(
+            Condition(
+                name=f"{len(results)} {self.__class__.__name__} objects to be ready",
+                fn=check,
+                timeout=timeout,
+                interval=interval,
+            )
+        )
+        return results, {
+            (namespace, name) for namespace, names in pending.items() for name in names
+        }
+
+    def wait_for_selector_ready(
+        self,
+        namespace: Optional[str],
+        label_selector: Optional[Selector],
+        timeout: Optional[int],
+        interval: Optional[float] = 0.5,
+        field_selector: Optional[Selector] = None,
+        min_count: int = 1,
+    ) -> bool:
+        """
+        Wait for every object matching the selectors to be ready, like all
+        the pods with app=x. The selectors are pushed down to the apiserver,
+        or evaluated on the informer store when one is running.
+        min_count:Optional: The number of matching objects required, so the
+            wait does not succeed before the objects are created.
+        """
+        selector = parse_label_selector(label_selector)
+        field_selector = format_field_selector(field_selector)
+        matching = ",".join(str(s) for s in (selector, field_selector) if s)
+
+        def check() -> bool:
+            count = 0
+            try:
+                for obj in self._iter_objects(namespace, selector, field_selector):
+                    if not self._is_object_ready(obj):
+                        return False
+                    count += 1
+            except exceptions.ApiException as e:
+                self._logger.warning(
+                    f"Failed to list {self.__class__.__name__} in namespace {namespace}: {e}"
+                )
+                return False
+            return count >= min_count
+
+        return self.wait_for_condition(
+            Condition(
+                name=f"{self.__class__.__name__} objects matching '{matching}' in namespace {namespace} to be ready",
+                fn=check,
+                timeout=timeout,
+                interval=interval,
+            )
+        )
+
+    def _iter_objects(
+        self,
+        namespace: Optional[str],
+        label_selector: Optional[Selector] = None,
+        field_selector: Optional[Selector] = None,
+    ) -> Iterable:
+        informer = self._informer(namespace)
+        if informer is not None and field_selector is None:
+            return list_items(
+                informer.list(parse_label_selector(label_selector), copies=False)
+            )
+
+        return self.iter_list(
+            namespace, label_selector=label_selector, field_selector=field_selector
+        )
+
     def wait_for_condition(self, condition: Condition) -> bool:
         self._logger.info(f"Waiting for {condition._name}")
         return condition.wait()
@@ -1,8 +1,12 @@
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from kubernetes.client import CoreV1Api, V1Service, V1ServiceList, exceptions
 from kubernetes.utils import create_from_yaml
 
+from .._apply import DEFAULT_FIELD_MANAGER, server_side_apply
+from ..manifests import load_manifests
+from ._objects import object_key
+from ._selector import Selector, parse_label_selector
 from .resource_api import ResourceApi
 
 
@@ -13,27 +17,44 @@ class Service(ResourceApi[CoreV1Api]):
 
     api_client_type = CoreV1Api
 
-    def get(self, namespace: str, name: str) -> Optional[V1Service]:
+    def get(self, namespace: str, name: str, raw: bool = False) -> Optional[V1Service]:
+        informer = self._informer(namespace)
+        if informer is not None and not raw:
+            return informer.get(namespace, name)
+
         service = None
         try:
             service = self.api_client.read_namespaced_service(
-                name=name, namespace=namespace
+                name=name, namespace=namespace, **self._request_options(raw)
             )
         except exceptions.ApiException as e:
             self._logger.error(
                 f"Failed to get service {name} in namespace {namespace}: {e}"
             )
 
-        return service
+        return self._decode(service, raw)
+
+    def list(
+        self,
+        namespace: str,
+        raw: bool = False,
+        label_selector: Optional[Selector] = None,
+        field_selector: Optional[Selector] = None,
+    ) -> Optional[V1ServiceList]:
+        informer = self._informer(namespace)
+        if informer is not None and not raw and field_selector is None:
+            return informer.list(parse_label_selector(label_selector))
 
-    def list(self, namespace: str) -> Optional[V1ServiceList]:
         services = None
         try:
-            services = self.api_client.list_namespaced_service(namespace=namespace)
+            services = self.api_client.list_namespaced_service(
+                namespace=namespace,
+                **self._list_options(raw, label_selector, field_selector),
+            )
         except exceptions.ApiException as e:
             self._logger.error(f"Failed to list services in namespace {namespace}: {e}")
 
-        return services
+        return self._decode(services, raw)
 
     def create(self, namespace: str, body: V1Service) -> Optional[V1Service]:
         created_service = None
@@ -74,6 +95,31 @@ class Service(ResourceApi[CoreV1Api]):
 
         return patched_service
 
+    def apply(
+        self,
+        namespace: str,
+        body: V1Service,
+        field_manager: str = DEFAULT_FIELD_MANAGER,
+        force: bool = False,
+    ) -> Optional[V1Service]:
+        _, name = object_key(body)
+        applied_service = None
+        try:
+            with server_side_apply(self.api_client.api_client):
+                applied_service = self.api_client.patch_namespaced_service(
+                    name=name,
+                    namespace=namespace,
+                    body=body,
+                    field_manager=field_manager,
+                    force=force,
+                )
+        except exceptions.ApiException as e:
+            self._logger.error(
+                f"Failed to apply service {name} in namespace {namespace}: {e}"
+            )
+
+        return applied_service
+
     def update(self, namespace: str, name: str, body: V1Service) -> Optional[V1Service]:
         updated_service = None
         try:
@@ -93,7 +139,9 @@ class Service(ResourceApi[CoreV1Api]):
         created_service = None
         try:
             created_service = create_from_yaml(
-                self.api_client, yaml_path, namespace=namespace
+                self.api_client.api_client,
+                yaml_objects=load_manifests(yaml_path),
+                namespace=namespace,
             )
         except exceptions.ApiException as e:
             self._logger.error(
@@ -107,7 +155,16 @@ class Service(ResourceApi[CoreV1Api]):
         if service is None:
             return False
 
+        return self._is_object_ready(service)
+
+    def _is_object_ready(self, service: V1Service) -> bool:
         return (
             service.status.load_balancer.ingress is not None
             and len(service.status.load_balancer.ingress) > 0
         )
+
+    def _list_call(self, namespace: str) -> Tuple[Callable, Dict[str, Any]]:
+        return self.api_client.list_namespaced_service, {"namespace": namespace}
+
+    def _all_namespaces_call(self) -> Tuple[Callable, Dict[str, Any]]:
+        return self.api_client.list_service_for_all_namespaces, {}
@@ -5,8 +5,13 @@ setup(
     version="0.0.1",
     description="Kubescape team kubernetes client wrapper",
     author="Kubescape team",
-    find_packages=find_packages(exclude=["tests", "tests.*"]),
+    find_packages=find_packages(
+        exclude=["tests", "tests.*", "benchmarks", "benchmarks.*"]
+    ),
     install_requires=[
         "kubernetes~=28.1",
     ],
+    extras_require={
+        "async": ["kubernetes_asyncio~=28.2"],
+    },
 )
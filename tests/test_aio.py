@@ -0,0 +1,64 @@
+import asyncio
+from types import SimpleNamespace
+from unittest import mock
+
+from kubernetes_asyncio.client import (
+    ApiClient,
+    V1Namespace,
+    V1NamespaceStatus,
+    V1ObjectMeta,
+    V1Pod,
+    V1PodStatus,
+)
+
+from kubeclient.aio import resources_apis
+from kubeclient.resources_apis._condition import Condition
+
+
+def test_condition_wait_async_awaits_coroutine_functions():
+    results = iter([False, False, True])
+
+    async def check():
+        return next(results)
+
+    condition = Condition(name="ready", fn=check, timeout=5, interval=0.01)
+    assert asyncio.run(condition.wait_async())
+
+
+def test_pod_wait_for_ready_polls_without_blocking():
+    async def run():
+        pod_api = resources_apis.Pod(SimpleNamespace(api_client=ApiClient()))
+        pod_api.api_client.read_namespaced_pod = mock.AsyncMock(
+            side_effect=[
+                V1Pod(metadata=V1ObjectMeta(name="web"), status=V1PodStatus(phase=p))
+                for p in ("Pending", "Running")
+            ]
+        )
+        try:
+            return await pod_api.wait_for_ready("default", "web", 5, 0.01)
+        finally:
+            await pod_api.api_client.api_client.close()
+
+    assert asyncio.run(run())
+
+
+def test_cluster_scoped_wait_for_ready_polls():
+    async def run():
+        namespace_api = resources_apis.Namespace(
+            SimpleNamespace(api_client=ApiClient())
+        )
+        namespace_api.api_client.read_namespace = mock.AsyncMock(
+            side_effect=[
+                V1Namespace(
+                    metadata=V1ObjectMeta(name="team"),
+                    status=V1NamespaceStatus(phase=phase),
+                )
+                for phase in ("Terminating", "Active")
+            ]
+        )
+        try:
+            return await namespace_api.wait_for_ready("team", 5, 0.01)
+        finally:
+            await namespace_api.api_client.api_client.close()
+
+    assert asyncio.run(run())
@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+from kubernetes import client
+from kubernetes.client import ApiException
+
+from kubeclient import KubernetesApiClient, resources_apis
+from kubeclient.fake import FakeCluster
+from kubeclient.resources_apis._batch import run_batch
+
+
+@pytest.fixture
+def kubeclient():
+    cluster = FakeCluster()
+    yield KubernetesApiClient(backend=cluster)
+    cluster.close()
+
+
+def _widget(name: str) -> dict:
+    return {
+        "apiVersion": "example.com/v1",
+        "kind": "Widget",
+        "metadata": {"name": name},
+        "spec": {"size": 1},
+    }
+
+
+def test_custom_resources_in_batches(kubeclient):
+    widgets = resources_apis.CustomResource(kubeclient, "example.com", "v1", "widgets")
+    bodies = [_widget(f"w{i}") for i in range(50)] + [_widget("w7")]
+
+    results = widgets.create_many("default", bodies, concurrency=8)
+    assert not results
+    assert len(results.succeeded) == 50
+    [failed] = results.failed
+    assert (failed.index, failed.name) == (50, "w7")
+    assert isinstance(failed.error, ApiException) and failed.error.status == 409
+
+    results = widgets.patch_many("default", {"w1": {"spec": {"size": 2}}})
+    assert results and results[0].response["spec"]["size"] == 2
+
+    results = widgets.delete_many("default", ["w1", "missing"])
+    assert [r.ok for r in results] == [True, False]
+    assert results.failed[0].error.status == 404
+    assert len(widgets.list("default")["items"]) == 49
+
+
+def test_cluster_scoped_batch(kubeclient):
+    bodies = [
+        client.V1Namespace(metadata=client.V1ObjectMeta(name=name))
+        for name in ("a", "b")
+    ]
+    namespace_api = resources_apis.Namespace(kubeclient)
+    results = namespace_api.create_many(None, bodies)
+    assert [r.response.metadata.name for r in results] == ["a", "b"]
+
+
+def test_ordering_keys_serialize_and_keep_the_order(kubeclient):
+    deployment_api = resources_apis.Deployment(kubeclient)
+    patches = [("web", {"metadata": {"labels": {"step": str(i)}}}) for i in range(10)]
+    deployment_api.create(
+        "default",
+        client.V1Deployment(metadata=client.V1ObjectMeta(name="web")),
+    )
+
+    results = deployment_api.patch_many(
+        "default", patches, ordering_key=lambda patch: patch[0]
+    )
+    assert results
+    versions = [int(r.response.metadata.resource_version) for r in results]
+    assert versions == sorted(versions)
+    assert deployment_api.get("default", "web").metadata.labels == {"step": "9"}
+
+
+def test_fail_fast_skips_the_remaining_items():
+    lock = threading.Lock()
+    running = []
+
+    def call(item: int) -> int:
+        with lock:
+            running.append(item)
+        time.sleep(0.01)
+        if item == 2:
+            raise ApiException(status=422)
+        return item
+
+    results = run_batch(call, range(20), str, concurrency=2, fail_fast=True)
+    assert results.failed[0].error.status == 422
+    assert len(results.skipped) >= 15
+    assert len(running) + len(results.skipped) == 20
@@ -0,0 +1,55 @@
+import pytest
+
+from benchmarks.run import KUBECONFIG, compare
+from benchmarks.standin import StandInApiServer, seed
+from kubeclient import KubernetesApiClient, resources_apis
+
+
+@pytest.fixture
+def standin(tmp_path):
+    server = StandInApiServer().start()
+    seed(server.cluster, "bench", 5)
+    kubeconfig = tmp_path / "kubeconfig.yaml"
+    kubeconfig.write_text(KUBECONFIG.format(server=server.url))
+    yield KubernetesApiClient(config_file_path=kubeconfig)
+    server.stop()
+
+
+def test_standin_serves_the_resource_apis(standin):
+    pod_api = resources_apis.Pod(standin)
+
+    assert len(pod_api.list("bench").items) == 5
+    assert [p.metadata.name for p in pod_api.iter_list("bench", page_size=2)] == [
+        f"pod-{index:06d}" for index in range(5)
+    ]
+    assert len(pod_api.list("bench", label_selector={"tier": "frontend"}).items) == 2
+    assert pod_api.wait_for_ready("bench", "pod-000001", 1, 0.1)
+
+    pod_api.delete("bench", "pod-000001")
+    assert pod_api.get("bench", "pod-000001") is None
+    widgets = resources_apis.CustomResource(
+        standin, "bench.kubeclient.io", "v1", "widgets"
+    )
+    assert len(widgets.list("bench")["items"]) == 5
+
+
+def test_compare_reports_regressions_beyond_the_tolerance():
+    def report(p50, throughput):
+        return {
+            "results": [
+                {
+                    "scenario": "list_pods",
+                    "size": 10,
+                    "p50_ms": p50,
+                    "p99_ms": 1,
+                    "peak_rss_mb": 1,
+                    "objects_per_second": throughput,
+                }
+            ]
+        }
+
+    assert compare(report(1.1, 95), report(1, 100), 0.2) == []
+    assert compare(report(2, 50), report(1, 100), 0.2) == [
+        "list_pods[10] p50_ms: 1 -> 2",
+        "list_pods[10] objects_per_second: 100 -> 50",
+    ]
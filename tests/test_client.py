@@ -0,0 +1,146 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+from kubernetes import client
+
+from kubeclient import KubernetesApiClient
+from kubeclient.metrics import InMemoryMetrics
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # The number of requests answered with 429 before succeeding.
+    rejections = 0
+
+    def do_GET(self):
+        if _Handler.rejections:
+            _Handler.rejections -= 1
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def _client(host, **kwargs) -> KubernetesApiClient:
+    api_client = client.ApiClient(client.Configuration(host=host))
+    with mock.patch.object(KubernetesApiClient, "_load_config"), mock.patch(
+        "kubeclient.client.client.ApiClient",
+        return_value=api_client,
+    ):
+        return KubernetesApiClient(**kwargs)
+
+
+def test_pool_options_and_stats(server):
+    kubeclient = _client(server, pool_maxsize=2, pool_block=True)
+    pool_manager = kubeclient.api_client.rest_client.pool_manager
+    assert pool_manager.connection_pool_kw["maxsize"] == 2
+    assert pool_manager.connection_pool_kw["block"] is True
+    assert (
+        socket.SOL_SOCKET,
+        socket.SO_KEEPALIVE,
+        1,
+    ) in pool_manager.connection_pool_kw["socket_options"]
+
+    for _ in range(3):
+        kubeclient.api_client.rest_client.GET(f"{server}/version")
+
+    assert kubeclient.pool_stats() == {
+        "pools": 1,
+        "requests": 3,
+        "hits": 2,
+        "misses": 1,
+    }
+
+
+def test_pool_configuration_closes_the_replaced_pool(server):
+    api_client = client.ApiClient(client.Configuration(host=server))
+    replaced = api_client.rest_client.pool_manager
+    api_client.rest_client.GET(f"{server}/version")
+    assert replaced.pools
+    with mock.patch.object(KubernetesApiClient, "_load_config"), mock.patch(
+        "kubeclient.client.client.ApiClient",
+        return_value=api_client,
+    ):
+        kubeclient = KubernetesApiClient(pool_maxsize=2)
+
+    assert kubeclient.api_client.rest_client.pool_manager is not replaced
+    assert not replaced.pools
+
+
+def test_default_timeout_skips_watches(server):
+    kubeclient = _client(server, connect_timeout=1, read_timeout=2)
+    rest_client = kubeclient.api_client.rest_client
+    with mock.patch.object(
+        rest_client.pool_manager, "request", wraps=rest_client.pool_manager.request
+    ) as request:
+        rest_client.GET(f"{server}/api/v1/pods")
+        rest_client.GET(f"{server}/api/v1/pods", query_params=[("watch", True)])
+
+    first, second = request.call_args_list
+    assert (
+        first.kwargs["timeout"].connect_timeout,
+        first.kwargs["timeout"].read_timeout,
+    ) == (1, 2)
+    assert second.kwargs["timeout"] is None
+
+
+def test_rate_limiter_and_retries_on_too_many_requests(server):
+    kubeclient = _client(server, qps=20, burst=1, max_retries=2)
+    rest_client = kubeclient.api_client.rest_client
+
+    _Handler.rejections = 2
+    rest_client.GET(f"{server}/api/v1/pods")
+    for _ in range(2):
+        rest_client.GET(f"{server}/api/v1/pods")
+
+    stats = kubeclient.throttle_stats()
+    assert stats["requests"] == 5
+    assert stats["retries"] == 2
+    assert stats["throttled"] >= 3
+    assert stats["throttled_seconds"] >= 0.15
+
+    _Handler.rejections = 3
+    with pytest.raises(client.ApiException) as error:
+        rest_client.GET(f"{server}/api/v1/pods")
+    assert error.value.status == 429
+    assert kubeclient.throttle_stats()["retries_exhausted"] == 1
+
+
+def test_metrics_record_requests_and_deserialization(server):
+    metrics = InMemoryMetrics()
+    kubeclient = _client(server, max_retries=0, metrics=metrics)
+    core_v1 = client.CoreV1Api(kubeclient.api_client)
+
+    core_v1.read_namespace("a")
+    _Handler.rejections = 1
+    with pytest.raises(client.ApiException):
+        core_v1.read_namespace("a")
+
+    labels = ("get", "namespaces", "")
+    assert metrics.requests == {labels + ("200",): 1, labels + ("429",): 1}
+    assert metrics.errors == {labels + ("429",): 1}
+    assert metrics.request_duration[labels].count == 2
+    assert metrics.response_size[labels].sum == 2
+    assert metrics.deserialization_duration[labels].count == 1
@@ -0,0 +1,124 @@
+import time
+from concurrent import futures
+from pathlib import Path
+
+from kubernetes import client
+
+from kubeclient import ClusterSet, Deployer, KubernetesApiClient, resources_apis
+from kubeclient.cluster_set import ResourceApiError
+from kubeclient.fake import FakeCluster
+
+YAML = Path(__file__).parent / "deployments" / "pod-with-host-mount.yaml"
+
+KUBECONFIG = """
+apiVersion: v1
+kind: Config
+clusters:
+- name: east
+  cluster:
+    server: https://east.example.com
+- name: west
+  cluster:
+    server: https://west.example.com
+contexts:
+- name: east
+  context:
+    cluster: east
+    user: admin
+- name: west
+  context:
+    cluster: west
+    user: admin
+current-context: east
+users:
+- name: admin
+  user:
+    token: secret
+"""
+
+
+def _fake_clusters(*contexts):
+    return ClusterSet(
+        clients={
+            context: KubernetesApiClient(backend=FakeCluster()) for context in contexts
+        }
+    )
+
+
+def test_contexts_of_the_kubeconfig(tmp_path):
+    path = tmp_path / "kubeconfig.yaml"
+    path.write_text(KUBECONFIG)
+    clusters = ClusterSet(config_file_path=path)
+
+    assert clusters.contexts == ["east", "west"]
+    assert clusters.client("west").get_config.host == "https://west.example.com"
+
+
+def test_run_and_map_on_every_cluster():
+    clusters = _fake_clusters("east", "west")
+    pod = client.V1Pod(
+        metadata=client.V1ObjectMeta(name="web"),
+        spec=client.V1PodSpec(containers=[client.V1Container(name="c", image="nginx")]),
+    )
+    resources_apis.Pod(clusters.client("east")).create("default", pod)
+
+    results = clusters.map(
+        lambda kubeclient: Deployer(kubeclient).create_from_yaml(YAML)
+    )
+    assert results and len(results) == 2
+
+    listed = clusters.run(resources_apis.Pod, "list", "default")
+    names = {
+        context: sorted(pod.metadata.name for pod in pods.items)
+        for context, pods in listed.succeeded.items()
+    }
+    assert names == {"east": ["host-mount-pod", "web"], "west": ["host-mount-pod"]}
+    ready = clusters.run(resources_apis.Pod, "is_ready", "default", "web")
+    assert ready.succeeded == {"east": True, "west": False}
+
+
+def test_run_reports_failed_methods_and_takes_api_args():
+    clusters = _fake_clusters("east", "west")
+    config_map = {"metadata": {"name": "settings"}, "data": {"mode": "fast"}}
+    resources_apis.GenericResource(clusters.client("east"), "configmaps").create(
+        "default", config_map
+    )
+
+    results = clusters.run(
+        resources_apis.GenericResource,
+        "get",
+        "default",
+        "settings",
+        api_args=("configmaps",),
+    )
+    assert not results
+    assert results.succeeded["east"]["data"] == {"mode": "fast"}
+    assert isinstance(results.failed["west"], ResourceApiError)
+    assert clusters.resource_api(
+        "east", resources_apis.GenericResource, "configmaps"
+    ) is clusters.resource_api("east", resources_apis.GenericResource, "configmaps")
+
+
+def test_a_slow_cluster_times_out_alone():
+    clusters = _fake_clusters("fast", "slow", "broken")
+    clusters = ClusterSet(
+        clients={context: clusters.client(context) for context in clusters.contexts},
+        timeout=5,
+        timeouts={"slow": 0.2},
+    )
+
+    def operation(kubeclient):
+        if kubeclient is clusters.client("slow"):
+            time.sleep(1)
+        if kubeclient is clusters.client("broken"):
+            raise RuntimeError("unreachable")
+        return "done"
+
+    start = time.monotonic()
+    results = clusters.map(operation)
+
+    assert time.monotonic() - start < 0.9
+    assert not results
+    assert results.succeeded == {"fast": "done"}
+    assert isinstance(results["slow"].error, futures.TimeoutError)
+    assert isinstance(results["broken"].error, RuntimeError)
@@ -0,0 +1,54 @@
+import itertools
+import time
+
+from kubeclient.resources_apis._condition import Condition, ConditionScheduler
+
+
+def _after(checks: int):
+    counter = itertools.count(1)
+    return lambda: next(counter) >= checks
+
+
+def test_condition_delay_backs_off_with_jitter_and_cap():
+    condition = Condition(
+        "backoff", lambda: False, 1, 0.1, backoff=2, max_interval=0.5, jitter=0.1
+    )
+
+    delays = [condition.delay(attempt) for attempt in range(5)]
+
+    for delay, expected in zip(delays, [0.1, 0.2, 0.4, 0.5, 0.5]):
+        assert expected * 0.9 <= delay <= expected * 1.1
+
+
+def test_scheduler_resolves_futures():
+    with ConditionScheduler() as scheduler:
+        met = scheduler.submit(Condition("met", _after(3), 5, 0.01))
+        missed = scheduler.submit(Condition("missed", lambda: False, 0.05, 0.01))
+
+        assert met.result(timeout=5) is True
+        assert missed.result(timeout=5) is False
+
+
+def test_scheduler_all_of_and_any_of_share_a_deadline():
+    with ConditionScheduler() as scheduler:
+        started = time.monotonic()
+        never = scheduler.all_of(
+            [
+                Condition("met", _after(1), 60, 0.01),
+                Condition("never", lambda: False, 60, 0.01),
+            ],
+            timeout=0.1,
+        )
+        assert never.result(timeout=5) is False
+        assert time.monotonic() - started < 5
+
+        assert scheduler.all_of(
+            [Condition(f"met {i}", _after(2), 5, 0.01) for i in range(20)]
+        ).result(timeout=5)
+        assert scheduler.any_of(
+            [
+                Condition("never", lambda: False, 60, 0.01),
+                Condition("met", _after(2), 60, 0.01),
+            ],
+            timeout=5,
+        ).result(timeout=5)
@@ -1,4 +1,8 @@
 from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from kubernetes.client import ApiClient, ApiException
 
 from kubeclient import Deployer, KubernetesApiClient, resources_apis
 
@@ -17,3 +21,117 @@ def test_deployer():
 
     assert deployer.delete_from_yaml(YAML)
     assert not pod_api.wait_for_ready("default", "host-mount-pod", 5, 0.5)
+
+
+BUNDLE = """
+apiVersion: v1
+kind: Namespace
+metadata:
+  name: bundle
+---
+apiVersion: v1
+kind: ConfigMap
+metadata:
+  name: config
+  namespace: bundle
+---
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: web
+  namespace: bundle
+"""
+
+
+def test_delete_from_yaml_deletes_in_reverse_dependency_order(tmp_path):
+    bundle = tmp_path / "bundle.yaml"
+    bundle.write_text(BUNDLE)
+    deployer = Deployer(SimpleNamespace(api_client=ApiClient()))
+    deleted = []
+
+    def call_for_object(api_client, verb, obj, namespace, definitions, **kwargs):
+        if obj["kind"] == "ConfigMap":
+            raise ApiException(status=404, reason="Not Found")
+        deleted.append(obj["kind"])
+
+    with mock.patch("kubeclient.deployer.call_for_object", call_for_object):
+        results = deployer.delete_from_yaml(bundle)
+        assert not results
+        assert [(r.kind, r.namespace) for r in results.failed] == [
+            ("ConfigMap", "bundle")
+        ]
+        assert deployer.delete_from_yaml(bundle, ignore_not_found=True)
+
+    assert deleted == ["Deployment", "Namespace"] * 2
+
+
+CUSTOM_BUNDLE = """
+apiVersion: apiextensions.k8s.io/v1
+kind: CustomResourceDefinition
+metadata:
+  name: widgets.example.com
+spec:
+  group: example.com
+  scope: Namespaced
+  names:
+    plural: widgets
+    kind: Widget
+  versions:
+    - name: v1
+      served: true
+      storage: true
+---
+apiVersion: v1
+kind: ConfigMap
+metadata:
+  name: config
+---
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: web
+---
+apiVersion: example.com/v1
+kind: Widget
+metadata:
+  name: widget
+"""
+
+
+def test_apply_reports_every_failure_per_object(tmp_path):
+    bundle = tmp_path / "bundle.yaml"
+    bundle.write_text(CUSTOM_BUNDLE)
+    deployer = Deployer(SimpleNamespace(api_client=ApiClient()))
+    called = []
+
+    def call_for_object(api_client, verb, obj, namespace, definitions, **kwargs):
+        if obj["kind"] == "ConfigMap":
+            raise ConnectionError("connection reset")
+        called.append(obj["kind"])
+
+    with mock.patch("kubeclient.deployer.call_for_object", call_for_object):
+        with mock.patch.object(Deployer, "_wait_for_established", return_value=False):
+            results = deployer.apply(bundle)
+
+    assert called == ["CustomResourceDefinition", "Deployment"]
+    assert [(r.kind, type(r.error).__name__) for r in results.failed] == [
+        ("ConfigMap", "ConnectionError"),
+        ("Widget", "ApiException"),
+    ]
+
+
+def test_create_from_yaml_returns_the_responses_in_document_order(tmp_path):
+    bundle = tmp_path / "bundle.yaml"
+    bundle.write_text("---\n".join(reversed(BUNDLE.split("---\n"))))
+    deployer = Deployer(SimpleNamespace(api_client=ApiClient()))
+    created = []
+
+    def call_for_object(api_client, verb, obj, namespace, definitions, **kwargs):
+        created.append(obj["kind"])
+        return obj["kind"]
+
+    with mock.patch("kubeclient.deployer.call_for_object", call_for_object):
+        responses = deployer.create_from_yaml(bundle)
+
+    assert created == ["Namespace", "ConfigMap", "Deployment"]
+    assert responses == [["Deployment"], ["ConfigMap"], ["Namespace"]]
@@ -0,0 +1,113 @@
+from unittest import mock
+
+import pytest
+
+from kubeclient import KubernetesApiClient, resources_apis
+from kubeclient.discovery import Discovery, UnknownResourceError
+from kubeclient.fake import FakeCluster
+
+WIDGETS = {
+    "apiVersion": "apiextensions.k8s.io/v1",
+    "kind": "CustomResourceDefinition",
+    "metadata": {"name": "widgets.example.com"},
+    "spec": {
+        "group": "example.com",
+        "scope": "Namespaced",
+        "names": {
+            "plural": "widgets",
+            "singular": "widget",
+            "kind": "Widget",
+            "shortNames": ["wd"],
+        },
+        "versions": [{"name": "v1", "served": True, "storage": True}],
+    },
+}
+
+
+@pytest.fixture
+def kubeclient():
+    cluster = FakeCluster()
+    yield KubernetesApiClient(backend=cluster)
+    cluster.close()
+
+
+def _counting_gets():
+    return mock.patch.object(
+        Discovery, "_get", autospec=True, side_effect=Discovery._get
+    )
+
+
+def test_discovery_is_cached_on_disk(kubeclient, tmp_path):
+    with _counting_gets() as get:
+        resources = Discovery(kubeclient, cache_dir=tmp_path).resources()
+        requests = get.call_count
+    assert requests == 2 + 4
+    assert (tmp_path / "localhost" / "servergroups.json").is_file()
+    assert (tmp_path / "localhost" / "apps" / "v1" / "serverresources.json").is_file()
+    deployments = [r for r in resources if r.kind == "Deployment"]
+    assert [(r.api_version, r.namespaced) for r in deployments] == [("apps/v1", True)]
+
+    with _counting_gets() as get:
+        assert Discovery(kubeclient, cache_dir=tmp_path).resources() == resources
+        assert get.call_count == 0
+
+        Discovery(kubeclient, cache_dir=tmp_path, ttl=0).resources()
+        assert get.call_count == requests
+
+
+def test_generic_resource_serves_builtin_and_custom_kinds(kubeclient, tmp_path):
+    discovery = Discovery(kubeclient, cache_dir=tmp_path)
+    definitions = resources_apis.GenericResource(kubeclient, "crd", discovery=discovery)
+    assert definitions.resource.name == "customresourcedefinitions"
+    assert definitions.create(None, WIDGETS)
+
+    # The CRD is not in the cache yet, so resolving it discovers again.
+    widgets = resources_apis.GenericResource(kubeclient, "wd", discovery=discovery)
+    assert widgets.resource.api_version == "example.com/v1"
+    results = widgets.create_many(
+        "default",
+        [
+            {
+                "apiVersion": "example.com/v1",
+                "kind": "Widget",
+                "metadata": {"name": f"w{i}", "labels": {"even": str(i % 2 == 0)}},
+            }
+            for i in range(4)
+        ],
+    )
+    assert results
+    assert widgets.patch("default", "w1", {"spec": {"size": 3}})["spec"] == {"size": 3}
+    selected = widgets.list("default", label_selector={"even": "True"})
+    assert [w["metadata"]["name"] for w in selected["items"]] == ["w0", "w2"]
+    assert widgets.delete("default", "w0") is not None
+    assert widgets.get("default", "w0") is None
+
+    namespaces = resources_apis.GenericResource(
+        kubeclient, "namespaces", "v1", discovery=discovery
+    )
+    assert namespaces.create("ignored", {"metadata": {"name": "team"}})
+    assert namespaces.is_ready(None, "team")
+
+    deployments = resources_apis.GenericResource(
+        kubeclient, "deployments.apps", discovery=discovery
+    )
+    deployments.create(
+        "default",
+        {"metadata": {"name": "web"}, "spec": {"replicas": 2}},
+    )
+    assert deployments.wait_for_ready("default", "web", 2, 0.01, use_watch=True)
+
+
+def test_unknown_resources_rediscover_at_most_once(kubeclient, tmp_path):
+    discovery = Discovery(kubeclient, cache_dir=tmp_path)
+    discovery.resources()
+    cached = tmp_path / "localhost" / "servergroups.json"
+    with _counting_gets() as get:
+        with pytest.raises(UnknownResourceError):
+            discovery.resolve("gadgets")
+        assert get.call_count == 6
+        assert cached.is_file()
+
+        with pytest.raises(UnknownResourceError):
+            discovery.resolve("Deployment", "apps/v1beta1")
+        assert get.call_count == 6
@@ -0,0 +1,144 @@
+from pathlib import Path
+
+import pytest
+from kubernetes import client, watch
+from kubernetes.client import ApiException
+
+from kubeclient import Deployer, KubernetesApiClient, resources_apis
+from kubeclient.fake import FakeCluster
+from kubeclient.metrics import InMemoryMetrics
+
+YAML = Path(__file__).parent / "deployments" / "pod-with-host-mount.yaml"
+
+
+def _deployment(name: str, replicas: int = 2) -> client.V1Deployment:
+    labels = {"app": name}
+    return client.V1Deployment(
+        metadata=client.V1ObjectMeta(name=name, labels=labels),
+        spec=client.V1DeploymentSpec(
+            replicas=replicas,
+            selector=client.V1LabelSelector(match_labels=labels),
+            template=client.V1PodTemplateSpec(
+                metadata=client.V1ObjectMeta(labels=labels),
+                spec=client.V1PodSpec(
+                    containers=[client.V1Container(name="app", image="nginx")]
+                ),
+            ),
+        ),
+    )
+
+
+@pytest.fixture
+def cluster():
+    cluster = FakeCluster()
+    yield cluster
+    cluster.close()
+
+
+def test_deployer_on_fake_cluster(cluster):
+    kubeclient = KubernetesApiClient(backend=cluster)
+    deployer = Deployer(kubeclient)
+    deployer.create_from_yaml(YAML)
+
+    pod_api = resources_apis.Pod(kubeclient)
+    assert pod_api.wait_for_ready("default", "host-mount-pod", 1, 0.01)
+    assert pod_api.get("default", "host-mount-pod").status.phase == "Running"
+
+    assert deployer.delete_from_yaml(YAML)
+    assert pod_api.get("default", "host-mount-pod") is None
+
+
+def test_readiness_follows_the_schedule():
+    cluster = FakeCluster(ready_after=None)
+    kubeclient = KubernetesApiClient(backend=cluster)
+    deployment_api = resources_apis.Deployment(kubeclient)
+    deployment_api.create("default", _deployment("web"))
+
+    assert not deployment_api.wait_for_ready("default", "web", 0.1, 0.01)
+    cluster.schedule(0.05, "apps", "deployments", "default", "web")
+    assert deployment_api.wait_for_ready("default", "web", 2, 0.01, use_watch=True)
+    assert deployment_api.get("default", "web").status.ready_replicas == 2
+    cluster.close()
+
+
+def test_updates_bump_resource_versions_and_keep_the_status(cluster):
+    kubeclient = KubernetesApiClient(backend=cluster)
+    apps = client.AppsV1Api(kubeclient.api_client)
+    created = apps.create_namespaced_deployment("default", _deployment("web"))
+    assert created.metadata.generation == 1
+
+    patched = apps.patch_namespaced_deployment(
+        "web", "default", {"spec": {"replicas": 3}, "status": {"readyReplicas": 0}}
+    )
+    assert int(patched.metadata.resource_version) > int(
+        created.metadata.resource_version
+    )
+    assert patched.metadata.generation == 2
+    assert patched.status.ready_replicas == 3
+
+    patched = apps.patch_namespaced_deployment(
+        "web", "default", [{"op": "add", "path": "/metadata/labels/tier", "value": "a"}]
+    )
+    assert patched.metadata.labels == {"app": "web", "tier": "a"}
+    assert patched.metadata.generation == 2
+
+    with pytest.raises(ApiException) as error:
+        apps.replace_namespaced_deployment("web", "default", created)
+    assert error.value.status == 409
+
+    with pytest.raises(ApiException) as error:
+        apps.create_namespaced_deployment("default", _deployment("web"))
+    assert error.value.status == 409
+
+
+def test_list_pages_and_selectors(cluster):
+    kubeclient = KubernetesApiClient(backend=cluster)
+    deployment_api = resources_apis.Deployment(kubeclient)
+    for name in ("a", "b", "c"):
+        deployment_api.create("default", _deployment(name))
+
+    assert [d.metadata.name for d in deployment_api.iter_list("default", 2)] == [
+        "a",
+        "b",
+        "c",
+    ]
+    selected = deployment_api.list("default", label_selector="app in (a,c)")
+    assert [d.metadata.name for d in selected.items] == ["a", "c"]
+    selected = deployment_api.list("default", field_selector="metadata.name!=a")
+    assert [d.metadata.name for d in selected.items] == ["b", "c"]
+
+
+def test_watch_streams_events_from_a_resource_version(cluster):
+    kubeclient = KubernetesApiClient(backend=cluster, metrics=InMemoryMetrics())
+    core = client.CoreV1Api(kubeclient.api_client)
+    namespace = client.V1Namespace(metadata=client.V1ObjectMeta(name="first"))
+    listed = core.list_namespace()
+    core.create_namespace(namespace)
+    core.delete_namespace("first")
+
+    events = watch.Watch().stream(
+        core.list_namespace,
+        resource_version=listed.metadata.resource_version,
+        timeout_seconds=1,
+    )
+    assert [(e["type"], e["object"].metadata.name) for e in events] == [
+        ("ADDED", "first"),
+        ("DELETED", "first"),
+    ]
+
+
+def test_watch_from_a_compacted_resource_version_expires():
+    cluster = FakeCluster(history=2)
+    core = client.CoreV1Api(KubernetesApiClient(backend=cluster).api_client)
+    for name in ("a", "b", "c"):
+        core.create_namespace(
+            client.V1Namespace(metadata=client.V1ObjectMeta(name=name))
+        )
+
+    with pytest.raises(ApiException) as error:
+        list(
+            watch.Watch().stream(
+                core.list_namespace, resource_version="1", timeout_seconds=1
+            )
+        )
+    assert error.value.status == 410
@@ -0,0 +1,36 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from kubeclient import resources_apis
+
+
+def _run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        stdout=subprocess.PIPE,
+        cwd=Path(__file__).resolve().parent.parent,
+        text=True,
+    ).stdout.strip()
+
+
+def test_import_does_not_load_the_kubernetes_client():
+    output = _run(
+        "import logging, sys, kubeclient, kubeclient.resources_apis; "
+        "print('kubernetes' in sys.modules, logging.getLogger().handlers)"
+    )
+    assert output == "False []"
+
+
+def test_attributes_resolve_on_first_access():
+    output = _run(
+        "import kubeclient; "
+        "print(kubeclient.Deployer.__module__, kubeclient.resources_apis.Pod.__name__)"
+    )
+    assert output == "kubeclient.deployer Pod"
+    assert "StatefulSet" in dir(resources_apis)
+    with pytest.raises(AttributeError):
+        resources_apis.Secret
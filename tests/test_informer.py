@@ -0,0 +1,112 @@
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+from kubernetes.client import (
+    ApiClient,
+    V1ListMeta,
+    V1ObjectMeta,
+    V1OwnerReference,
+    V1Pod,
+    V1PodList,
+)
+
+from kubeclient import resources_apis
+from kubeclient.resources_apis._informer import Informer, Store
+from kubeclient.resources_apis._selector import LabelSelector
+
+
+def _pod(name: str, labels=None, owner_uid=None) -> V1Pod:
+    owners = None
+    if owner_uid is not None:
+        owners = [
+            V1OwnerReference(
+                api_version="v1", kind="ReplicaSet", name="rs", uid=owner_uid
+            )
+        ]
+    return V1Pod(
+        metadata=V1ObjectMeta(
+            name=name, namespace="default", labels=labels, owner_references=owners
+        )
+    )
+
+
+def test_store_indexes_follow_updates():
+    store = Store()
+    store.add(_pod("a", labels={"app": "web"}, owner_uid="rs-1"))
+    store.add(_pod("b", labels={"app": "web"}))
+    assert {p.metadata.name for p in store.by_label("app", "web")} == {"a", "b"}
+    assert [p.metadata.name for p in store.by_owner("rs-1")] == ["a"]
+
+    store.add(_pod("a", labels={"app": "db"}))
+    assert [p.metadata.name for p in store.by_label("app", "web")] == ["b"]
+    assert store.by_owner("rs-1") == []
+
+    store.delete(_pod("b"))
+    assert store.by_label("app", "web") == []
+    assert store.get("default", "a").metadata.labels == {"app": "db"}
+
+
+def test_store_selects_through_the_label_index():
+    store = Store()
+    store.add(_pod("a", labels={"app": "web", "tier": "front"}))
+    store.add(_pod("b", labels={"app": "web", "tier": "back"}))
+    store.add(_pod("c", labels={"app": "db"}))
+
+    selector = LabelSelector.parse("app=web,tier!=back")
+    with mock.patch.object(
+        LabelSelector, "matches", autospec=True, side_effect=LabelSelector.matches
+    ) as matches:
+        assert [p.metadata.name for p in store.select(selector)] == ["a"]
+        assert matches.call_count == 2
+        selector = LabelSelector.parse("app in (db,cache)")
+        assert [p.metadata.name for p in store.select(selector)] == ["c"]
+        assert matches.call_count == 3
+        selector = LabelSelector.parse("tier")
+        assert [p.metadata.name for p in store.select(selector)] == ["a", "b"]
+
+
+def test_informer_returns_copies():
+    informer = Informer(mock.Mock(__name__="list_namespaced_pod"), {})
+    informer._list_type = V1PodList
+    informer.store.add(_pod("a", labels={"app": "web"}))
+
+    informer.get("default", "a").metadata.labels["app"] = "changed"
+    informer.list().items[0].metadata.labels["app"] = "changed"
+    assert informer.store.get("default", "a").metadata.labels == {"app": "web"}
+    shared = informer.list(copies=False).items[0]
+    assert shared is informer.store.get("default", "a")
+
+
+def test_get_and_list_read_from_shared_informer():
+    client = SimpleNamespace(api_client=ApiClient())
+    pod_api = resources_apis.Pod(client)
+    other_pod_api = resources_apis.Pod(client)
+    list_pods = mock.Mock(
+        __name__="list_namespaced_pod",
+        return_value=V1PodList(
+            items=[_pod("web")], metadata=V1ListMeta(resource_version="3")
+        ),
+    )
+    pod_api.api_client.list_namespaced_pod = list_pods
+    other_pod_api.api_client.list_namespaced_pod = list_pods
+
+    stopped = threading.Event()
+
+    def stream(*args, **kwargs):
+        stopped.wait()
+        return iter(())
+
+    with mock.patch("kubeclient.resources_apis._informer.watch.Watch") as watch:
+        watch.return_value.stream.side_effect = stream
+        pod_api.start_informer("default")
+        other_pod_api.start_informer("default")
+        try:
+            assert other_pod_api.get("default", "web").metadata.name == "web"
+            assert [p.metadata.name for p in other_pod_api.list("default").items] == [
+                "web"
+            ]
+            list_pods.assert_called_once_with(namespace="default")
+        finally:
+            pod_api.stop_informer("default")
+            stopped.set()
@@ -0,0 +1,62 @@
+import pytest
+import yaml
+
+from kubeclient.manifests import ManifestLoader
+
+MANIFEST = """
+apiVersion: v1
+kind: ConfigMap
+metadata:
+  name: first
+---
+---
+apiVersion: v1
+kind: ConfigMap
+metadata:
+  name: second
+"""
+
+
+def _names(documents):
+    return [document["metadata"]["name"] for document in documents]
+
+
+def test_loader_memoizes_until_the_file_changes(tmp_path):
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text(MANIFEST)
+    loader = ManifestLoader()
+
+    assert _names(loader.load(manifest)) == ["first", "second"]
+    assert _names(loader.load(manifest)) == ["first", "second"]
+    assert (loader.hits, loader.misses) == (1, 1)
+
+    manifest.write_text(MANIFEST.replace("second", "third"))
+    assert _names(loader.load(manifest)) == ["first", "third"]
+    assert loader.misses == 2
+
+
+def test_loader_evicts_least_recently_used(tmp_path):
+    loader = ManifestLoader(max_entries=2)
+    paths = []
+    for index in range(3):
+        paths.append(tmp_path / f"{index}.yaml")
+        paths[-1].write_text(MANIFEST)
+
+    loader.load(paths[0])
+    loader.load(paths[1])
+    loader.load(paths[0])
+    loader.load(paths[2])
+    loader.load(paths[0])
+    loader.load(paths[1])
+
+    assert (loader.hits, loader.misses) == (2, 4)
+
+
+def test_loader_streams_documents_before_the_parse_finishes(tmp_path):
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text(MANIFEST + "---\nkey: [unclosed\n")
+    documents = ManifestLoader().iter_documents(manifest)
+
+    assert _names([next(documents), next(documents)]) == ["first", "second"]
+    with pytest.raises(yaml.YAMLError):
+        next(documents)
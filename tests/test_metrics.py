@@ -0,0 +1,74 @@
+import pytest
+
+from kubeclient.metrics import InMemoryMetrics, request_labels
+
+
+@pytest.mark.parametrize(
+    "method, url, query_params, headers, labels",
+    [
+        (
+            "GET",
+            "https://k/api/v1/namespaces/a/pods",
+            None,
+            None,
+            ("list", "pods", "a"),
+        ),
+        (
+            "GET",
+            "https://k/api/v1/namespaces/a/pods/p/log",
+            None,
+            None,
+            ("get", "pods/log", "a"),
+        ),
+        (
+            "GET",
+            "https://k/api/v1/pods",
+            [("watch", True)],
+            None,
+            ("watch", "pods", ""),
+        ),
+        ("GET", "https://k/api/v1/namespaces/a", None, None, ("get", "namespaces", "")),
+        (
+            "POST",
+            "https://k/apis/apps/v1/namespaces/a/deployments",
+            None,
+            None,
+            ("create", "deployments", "a"),
+        ),
+        (
+            "PATCH",
+            "https://k/apis/example.com/v1/namespaces/a/widgets/w",
+            None,
+            {"Content-Type": "application/apply-patch+yaml"},
+            ("apply", "widgets", "a"),
+        ),
+        (
+            "DELETE",
+            "https://k/api/v1/namespaces/a/pods",
+            None,
+            None,
+            ("deletecollection", "pods", "a"),
+        ),
+        ("GET", "https://k/version", None, None, ("list", "", "")),
+    ],
+)
+def test_request_labels(method, url, query_params, headers, labels):
+    assert request_labels(method, url, query_params, headers) == labels
+
+
+def test_in_memory_metrics_renders_prometheus_text():
+    metrics = InMemoryMetrics(latency_buckets=(0.1, 1), size_buckets=(1024,))
+    metrics.observe_request(("list", "pods", "a"), "200", 0.05, 2048)
+    metrics.observe_request(("list", "pods", "a"), "429", 0.5, None)
+    metrics.observe_deserialization(("list", "pods", "a"), 0.2)
+
+    text = metrics.to_prometheus()
+
+    labels = 'verb="list",resource="pods",namespace="a"'
+    assert f'kubeclient_request_duration_seconds_bucket{{{labels},le="0.1"}} 1' in text
+    assert f'kubeclient_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"kubeclient_request_duration_seconds_count{{{labels}}} 2" in text
+    assert f'kubeclient_requests_total{{{labels},code="200"}} 1' in text
+    assert f'kubeclient_request_errors_total{{{labels},code="429"}} 1' in text
+    assert f'kubeclient_response_size_bytes_bucket{{{labels},le="1024"}} 0' in text
+    assert f"kubeclient_deserialization_duration_seconds_sum{{{labels}}} 0.2" in text
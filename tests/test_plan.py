@@ -0,0 +1,49 @@
+from kubeclient._plan import CustomResourceDefinitions, guess_plural, plan_layers
+
+CRD = {
+    "apiVersion": "apiextensions.k8s.io/v1",
+    "kind": "CustomResourceDefinition",
+    "metadata": {"name": "widgets.example.com"},
+    "spec": {
+        "group": "example.com",
+        "scope": "Cluster",
+        "names": {"kind": "Widget", "plural": "widgets"},
+    },
+}
+
+
+def _obj(kind, name, api_version="v1"):
+    return {"apiVersion": api_version, "kind": kind, "metadata": {"name": name}}
+
+
+def test_plan_layers_orders_by_dependency_and_keeps_file_order():
+    documents = [
+        _obj("Deployment", "web", "apps/v1"),
+        _obj("Widget", "w", "example.com/v1"),
+        None,
+        _obj("ConfigMap", "config"),
+        {"apiVersion": "v1", "kind": "List", "items": [_obj("Namespace", "ns"), CRD]},
+        _obj("ServiceAccount", "sa"),
+    ]
+
+    layers = plan_layers(documents)
+
+    assert [[obj["metadata"]["name"] for obj in layer] for layer in layers] == [
+        ["ns", "widgets.example.com"],
+        ["config", "sa"],
+        ["web"],
+        ["w"],
+    ]
+
+
+def test_custom_resource_definitions_resolve_plural_and_scope():
+    definitions = CustomResourceDefinitions([CRD])
+    widget = _obj("Widget", "w", "example.com/v1")
+    gadget = _obj("Gadget", "g", "example.com/v1")
+
+    assert definitions.plural(widget) == "widgets"
+    assert not definitions.is_namespaced(widget)
+    assert definitions.required_by([widget, gadget]) == ["widgets.example.com"]
+    assert definitions.plural(gadget) == "gadgets"
+    assert guess_plural("Policy") == "policies"
+    assert guess_plural("Ingress") == "ingresses"
@@ -0,0 +1,137 @@
+import os
+import sys
+import time
+
+import pytest
+from kubernetes import client
+
+from kubeclient import KubernetesApiClient, registry
+from kubeclient.registry import ClientRegistry
+
+PLUGIN = """
+import datetime, json, sys
+from pathlib import Path
+
+counter = Path(sys.argv[1])
+count = int(counter.read_text() or 0) + 1 if counter.exists() else 1
+counter.write_text(str(count))
+expiry = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=float(sys.argv[2]))
+print(json.dumps({
+    "apiVersion": "client.authentication.k8s.io/v1beta1",
+    "kind": "ExecCredential",
+    "status": {"token": f"token-{count}", "expirationTimestamp": expiry.strftime("%Y-%m-%dT%H:%M:%SZ")},
+}))
+"""
+
+KUBECONFIG = """
+apiVersion: v1
+kind: Config
+clusters:
+- name: {name}
+  cluster:
+    server: https://{name}.example.com
+contexts:
+- name: {name}
+  context:
+    cluster: {name}
+    user: {name}
+current-context: {name}
+users:
+- name: {name}
+  user:
+    exec:
+      apiVersion: client.authentication.k8s.io/v1beta1
+      command: {python}
+      args: ["{plugin}", "{counter}", "{lifetime}"]
+"""
+
+
+@pytest.fixture
+def kubeconfig(tmp_path):
+    plugin = tmp_path / "plugin.py"
+    plugin.write_text(PLUGIN)
+    counter = tmp_path / "counter"
+
+    def write(name: str = "one", lifetime: float = 3600):
+        path = tmp_path / "kubeconfig.yaml"
+        path.write_text(
+            KUBECONFIG.format(
+                name=name,
+                python=sys.executable,
+                plugin=plugin,
+                counter=counter,
+                lifetime=lifetime,
+            )
+        )
+        return path
+
+    write.runs = lambda: int(counter.read_text()) if counter.exists() else 0
+    return write
+
+
+def test_clients_share_the_configuration_and_credentials(kubeconfig):
+    path = kubeconfig()
+    clients = ClientRegistry()
+    default = client.Configuration.get_default_copy().host
+
+    first = KubernetesApiClient(path, registry=clients)
+    second = KubernetesApiClient(path, registry=clients)
+
+    assert first.get_config is second.get_config
+    assert first.get_config.host == "https://one.example.com"
+    assert first.get_config.get_api_key_with_prefix("authorization") == "Bearer token-1"
+    assert kubeconfig.runs() == 1
+    assert clients.api_client(path) is clients.api_client(path)
+    assert client.Configuration.get_default_copy().host == default
+    clients.close()
+
+
+def test_changed_kubeconfig_is_loaded_again(kubeconfig):
+    path = kubeconfig()
+    clients = ClientRegistry()
+    before = clients.configuration(path)
+
+    changed = kubeconfig("two")
+    os.utime(changed, (time.time() + 1, time.time() + 1))
+    after = clients.configuration(path)
+
+    assert after is not before
+    assert after.host == "https://two.example.com"
+    clients.close()
+
+
+def test_credentials_are_refreshed_before_they_expire(kubeconfig, monkeypatch):
+    monkeypatch.setattr(registry, "_MIN_REFRESH_INTERVAL", 0.1)
+    path = kubeconfig(lifetime=60)
+    clients = ClientRegistry(refresh_margin=3600)
+    configuration = clients.configuration(path)
+
+    def token():
+        return configuration.get_api_key_with_prefix("authorization")
+
+    deadline = time.monotonic() + 10
+    while token() == "Bearer token-1" and time.monotonic() < deadline:
+        time.sleep(0.05)
+    clients.close()
+
+    assert token() != "Bearer token-1"
+    assert kubeconfig.runs() >= 2
+
+
+def test_refreshed_tokens_are_persisted_like_load_kube_config(kubeconfig):
+    path = kubeconfig()
+    clients = ClientRegistry()
+    configuration = clients.configuration(path)
+    credentials = next(iter(clients._credentials.values()))
+    # Like the refresh of an OIDC token by the loader.
+    credentials._loader._user.value["token"] = "refreshed"
+
+    credentials._loader._config_persister()
+    assert "token: refreshed" in path.read_text()
+    assert clients.configuration(path) is configuration
+    clients.close()
+
+    clients = ClientRegistry(persist_config=False)
+    clients.configuration(path)
+    assert next(iter(clients._credentials.values()))._loader._config_persister is None
+    clients.close()
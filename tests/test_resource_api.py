@@ -0,0 +1,466 @@
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from kubernetes.client import (
+    ApiClient,
+    ApiException,
+    CoreV1Api,
+    V1ListMeta,
+    V1ObjectMeta,
+    V1Pod,
+    V1PodList,
+    V1PodStatus,
+)
+
+from kubeclient import resources_apis
+from kubeclient._headers import override_header
+
+
+def _pod(name: str, phase: str) -> V1Pod:
+    return V1Pod(metadata=V1ObjectMeta(name=name), status=V1PodStatus(phase=phase))
+
+
+def _pod_api() -> resources_apis.Pod:
+    return resources_apis.Pod(SimpleNamespace(api_client=ApiClient()))
+
+
+def test_watch_for_ready_returns_on_event():
+    pod_api = _pod_api()
+    pod_api.api_client.list_namespaced_pod = mock.Mock(
+        return_value=V1PodList(
+            items=[_pod("web", "Pending")], metadata=V1ListMeta(resource_version="7")
+        )
+    )
+    with mock.patch("kubeclient.resources_apis.resource_api.watch.Watch") as watch:
+        watch.return_value.stream.return_value = iter(
+            [
+                {"type": "MODIFIED", "object": _pod("web", "Pending")},
+                {"type": "MODIFIED", "object": _pod("web", "Running")},
+            ]
+        )
+        assert pod_api.wait_for_ready("default", "web", 5, 0.5, use_watch=True)
+
+    _, kwargs = watch.return_value.stream.call_args
+    assert kwargs["resource_version"] == "7"
+    assert kwargs["field_selector"] == "metadata.name=web"
+    pod_api.api_client.list_namespaced_pod.assert_called_once()
+
+
+def test_watch_for_ready_skips_watch_when_already_ready():
+    pod_api = _pod_api()
+    pod_api.api_client.list_namespaced_pod = mock.Mock(
+        return_value=V1PodList(
+            items=[_pod("web", "Running")], metadata=V1ListMeta(resource_version="7")
+        )
+    )
+    with mock.patch("kubeclient.resources_apis.resource_api.watch.Watch") as watch:
+        assert pod_api.wait_for_ready("default", "web", 5, 0.5, use_watch=True)
+
+    watch.assert_not_called()
+
+
+def test_watch_for_ready_stops_at_the_deadline():
+    pod_api = _pod_api()
+    pod_api.api_client.list_namespaced_pod = mock.Mock(
+        return_value=V1PodList(
+            items=[_pod("web", "Pending")], metadata=V1ListMeta(resource_version="7")
+        )
+    )
+
+    def events(*args, **kwargs):
+        while True:
+            time.sleep(0.05)
+            yield {"type": "MODIFIED", "object": _pod("web", "Pending")}
+
+    with mock.patch("kubeclient.resources_apis.resource_api.watch.Watch") as watch:
+        watch.return_value.stream.side_effect = events
+        start = time.monotonic()
+        assert not pod_api.wait_for_ready("default", "web", 0.2, 0.5, use_watch=True)
+
+    assert time.monotonic() - start < 0.5
+    _, kwargs = watch.return_value.stream.call_args
+    assert kwargs["timeout_seconds"] == 1
+
+
+def _page(names, token=None) -> V1PodList:
+    return V1PodList(
+        items=[_pod(name, "Running") for name in names],
+        metadata=V1ListMeta(_continue=token),
+    )
+
+
+def test_iter_list_pages_with_continue_tokens():
+    pod_api = _pod_api()
+    pod_api.api_client.list_namespaced_pod = mock.Mock(
+        side_effect=[_page(["a", "b"], "t1"), _page(["c"])]
+    )
+
+    assert [p.metadata.name for p in pod_api.iter_list("default", page_size=2)] == [
+        "a",
+        "b",
+        "c",
+    ]
+    calls = pod_api.api_client.list_namespaced_pod.call_args_list
+    assert calls[0].kwargs["limit"] == 2 and calls[0].kwargs["_continue"] is None
+    assert calls[1].kwargs["_continue"] == "t1"
+
+
+def test_iter_list_keeps_unordered_pages():
+    pod_api = _pod_api()
+    pod_api.api_client.list_namespaced_pod = mock.Mock(
+        side_effect=[_page(["b", "a"], "t1"), _page(["d", "c"])]
+    )
+
+    assert [p.metadata.name for p in pod_api.iter_list("default")] == [
+        "b",
+        "a",
+        "d",
+        "c",
+    ]
+
+
+def test_iter_list_restarts_after_expired_continue_token():
+    pod_api = _pod_api()
+    pod_api.api_client.list_namespaced_pod = mock.Mock(
+        side_effect=[
+            _page(["a", "b"], "t1"),
+            ApiException(status=410, reason="Expired"),
+            _page(["a", "b"], "t2"),
+            _page(["c"]),
+        ]
+    )
+
+    assert [p.metadata.name for p in pod_api.iter_list("default", page_size=2)] == [
+        "a",
+        "b",
+        "c",
+    ]
+    assert (
+        pod_api.api_client.list_namespaced_pod.call_args_list[2].kwargs["_continue"]
+        is None
+    )
+
+
+def test_iter_list_raises_when_a_later_page_fails():
+    pod_api = _pod_api()
+    pod_api.api_client.list_namespaced_pod = mock.Mock(
+        side_effect=[_page(["a", "b"], "t1"), ApiException(status=500)]
+    )
+    names = []
+    with pytest.raises(ApiException):
+        for pod in pod_api.iter_list("default", page_size=2):
+            names.append(pod.metadata.name)
+    assert names == ["a", "b"]
+
+    pod_api.api_client.list_namespaced_pod = mock.Mock(
+        side_effect=ApiException(status=403)
+    )
+    assert list(pod_api.iter_list("default")) == []
+
+
+def test_wait_for_selector_ready_is_not_fooled_by_a_truncated_list():
+    pod_api = _pod_api()
+
+    def list_namespaced_pod(_continue=None, **kwargs):
+        if _continue is None:
+            return _page(["a"], "t1")
+        raise ApiException(status=500)
+
+    pod_api.api_client.list_namespaced_pod = mock.Mock(
+        __name__="list_namespaced_pod", side_effect=list_namespaced_pod
+    )
+
+    assert not pod_api.wait_for_selector_ready(
+        "default", "app=web", timeout=0.05, interval=0.01
+    )
+    assert pod_api.api_client.list_namespaced_pod.call_count > 2
+
+
+def test_wait_for_all_ready_lists_once_per_namespace_per_tick():
+    pod_api = _pod_api()
+    pod_api.api_client.list_namespaced_pod = mock.Mock(
+        __name__="list_namespaced_pod",
+        side_effect=lambda namespace, **kwargs: {
+            "a": V1PodList(items=[_pod("web", "Running"), _pod("db", "Pending")]),
+            "b": V1PodList(items=[_pod("web", "Running")]),
+        }[namespace],
+    )
+
+    results, pending = pod_api.wait_for_all_ready(
+        [("a", "web"), ("a", "db"), ("b", "web")], timeout=0.05, interval=0.01
+    )
+
+    assert results == {("a", "web"): True, ("a", "db"): False, ("b", "web"): True}
+    assert pending == {("a", "db")}
+    namespaces = [
+        call.kwargs["namespace"]
+        for call in pod_api.api_client.list_namespaced_pod.call_args_list
+    ]
+    assert namespaces.count("b") == 1
+    assert namespaces.count("a") > 1
+
+
+def test_apply_sends_server_side_apply_patch():
+    pod_api = _pod_api()
+    api_client = pod_api.api_client.api_client
+    content_types = []
+
+    def patch_namespaced_pod(**kwargs):
+        content_types.append(
+            api_client.select_header_content_type(["application/json-patch+json"])
+        )
+        return kwargs["body"]
+
+    pod_api.api_client.patch_namespaced_pod = mock.Mock(
+        side_effect=patch_namespaced_pod
+    )
+    body = {"apiVersion": "v1", "kind": "Pod", "metadata": {"name": "web"}}
+
+    assert pod_api.apply("default", body, field_manager="tests", force=True) == body
+    assert content_types == ["application/apply-patch+yaml"]
+    assert pod_api.api_client.patch_namespaced_pod.call_args.kwargs == {
+        "name": "web",
+        "namespace": "default",
+        "body": body,
+        "field_manager": "tests",
+        "force": True,
+    }
+    assert (
+        api_client.select_header_content_type(["application/json-patch+json"])
+        == "application/json-patch+json"
+    )
+
+
+def test_subclasses_inherit_a_server_side_apply():
+    class Secret(resources_apis.ResourceApi[CoreV1Api]):
+        api_client_type = CoreV1Api
+
+        get = list = create = create_from_yaml = None
+        delete = patch = update = is_ready = None
+
+        def _list_call(self, namespace):
+            return self.api_client.list_namespaced_secret, {"namespace": namespace}
+
+    secret_api = Secret(SimpleNamespace(api_client=ApiClient()))
+    api_client = secret_api.api_client.api_client
+    content_types = []
+
+    def patch_namespaced_secret(**kwargs):
+        content_types.append(api_client.select_header_content_type([]))
+        return kwargs
+
+    secret_api.api_client.patch_namespaced_secret = mock.Mock(
+        side_effect=patch_namespaced_secret
+    )
+    body = {"apiVersion": "v1", "kind": "Secret", "metadata": {"name": "token"}}
+
+    assert secret_api.apply("default", body) == {
+        "namespace": "default",
+        "name": "token",
+        "body": body,
+        "field_manager": "kubeclient",
+        "force": False,
+    }
+    assert content_types == ["application/apply-patch+yaml"]
+
+
+def test_header_overrides_apply_to_their_client_only():
+    applying, other = ApiClient(), ApiClient()
+    other.select_header_content_type(["application/json"])
+    with override_header(other, "Content-Type", "text/plain"):
+        pass
+
+    with override_header(applying, "Content-Type", "application/apply-patch+yaml"):
+        assert (
+            applying.select_header_content_type(["application/json"])
+            == "application/apply-patch+yaml"
+        )
+        with override_header(other, "Content-Type", "text/plain"):
+            assert other.select_header_content_type([]) == "text/plain"
+        assert (
+            other.select_header_content_type(["application/json"]) == "application/json"
+        )
+    assert (
+        applying.select_header_content_type(["application/json"]) == "application/json"
+    )
+
+
+def test_get_raw_skips_model_deserialization():
+    pod_api = _pod_api()
+    response = mock.Mock(
+        data=b'{"kind": "Pod", "metadata": {"name": "web"}, '
+        b'"status": {"podIP": "10.0.0.1", "containerStatuses": [{"ready": true}]}}'
+    )
+    pod_api.api_client.read_namespaced_pod = mock.Mock(return_value=response)
+
+    pod = pod_api.get("default", "web", raw=True)
+
+    assert pod_api.api_client.read_namespaced_pod.call_args.kwargs == {
+        "name": "web",
+        "namespace": "default",
+        "_preload_content": False,
+    }
+    response.release_conn.assert_called_once()
+    assert pod.metadata.name == "web"
+    assert pod.status.pod_ip == "10.0.0.1"
+    assert pod.status.container_statuses[0].ready is True
+    assert pod.spec is None
+    assert pod["status"]["podIP"] == "10.0.0.1"
+
+
+def test_project_builds_records_from_raw_pages():
+    pod_api = _pod_api()
+    pages = [
+        b'{"metadata": {"continue": "t1"}, "items": [{"metadata": {"name": "a", '
+        b'"namespace": "default"}, "spec": {"nodeName": "n1", "containers": '
+        b'[{"image": "nginx"}, {"image": "envoy"}]}}]}',
+        b'{"metadata": {}, "items": [{"metadata": {"name": "b", '
+        b'"namespace": "default"}, "spec": {"containers": []}}]}',
+    ]
+    pod_api.api_client.list_namespaced_pod = mock.Mock(
+        side_effect=[mock.Mock(data=page) for page in pages]
+    )
+
+    records = list(
+        pod_api.project(
+            "default", ["metadata.name", "spec.node_name", "spec.containers.image"]
+        )
+    )
+
+    assert [tuple(record) for record in records] == [
+        ("a", "n1", ("nginx", "envoy")),
+        ("b", None, ()),
+    ]
+    assert records[0].node_name == "n1"
+    calls = pod_api.api_client.list_namespaced_pod.call_args_list
+    assert calls[0].kwargs["_preload_content"] is False
+    assert calls[1].kwargs["_continue"] == "t1"
+
+
+def test_list_pushes_selectors_down_to_the_apiserver():
+    pod_api = _pod_api()
+    pod_api.api_client.list_namespaced_pod = mock.Mock(
+        __name__="list_namespaced_pod", return_value=_page(["a"])
+    )
+
+    pod_api.list(
+        "default", label_selector={"app": "web"}, field_selector="status.phase=Running"
+    )
+
+    assert pod_api.api_client.list_namespaced_pod.call_args.kwargs == {
+        "namespace": "default",
+        "label_selector": "app=web",
+        "field_selector": "status.phase=Running",
+    }
+
+
+def test_wait_for_selector_ready_waits_for_every_matching_object():
+    pod_api = _pod_api()
+    pod_api.api_client.list_namespaced_pod = mock.Mock(
+        __name__="list_namespaced_pod",
+        side_effect=[
+            V1PodList(items=[], metadata=V1ListMeta()),
+            V1PodList(items=[_pod("a", "Running"), _pod("b", "Pending")]),
+            V1PodList(items=[_pod("a", "Running"), _pod("b", "Running")]),
+        ],
+    )
+
+    assert pod_api.wait_for_selector_ready("default", "app=web", 5, 0.01)
+    calls = pod_api.api_client.list_namespaced_pod.call_args_list
+    assert len(calls) == 3
+    assert all(call.kwargs["label_selector"] == "app=web" for call in calls)
+
+
+def test_list_metadata_negotiates_partial_object_metadata():
+    pod_api = _pod_api()
+    api_client = pod_api.api_client.api_client
+    accepts = []
+    pages = [
+        b'{"kind": "PartialObjectMetadataList", "metadata": {"continue": "t1"}, '
+        b'"items": [{"metadata": {"name": "a", "namespace": "default", '
+        b'"resourceVersion": "7", "labels": {"app": "web"}, '
+        b'"ownerReferences": [{"kind": "ReplicaSet", "uid": "u1"}]}}]}',
+        b'{"kind": "PartialObjectMetadataList", "metadata": {}, '
+        b'"items": [{"metadata": {"name": "b", "namespace": "default"}}]}',
+    ]
+
+    def list_namespaced_pod(**kwargs):
+        accepts.append(api_client.select_header_accept(["application/json"]))
+        return mock.Mock(data=pages[len(accepts) - 1])
+
+    pod_api.api_client.list_namespaced_pod = mock.Mock(
+        __name__="list_namespaced_pod", side_effect=list_namespaced_pod
+    )
+
+    records = pod_api.list_metadata("default", label_selector="app")
+
+    assert [(r.name, r.resource_version, r.labels) for r in records] == [
+        ("a", "7", {"app": "web"}),
+        ("b", None, {}),
+    ]
+    assert records[0].owner_references[0].uid == "u1"
+    assert (
+        accepts
+        == [
+            "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1,"
+            "application/json"
+        ]
+        * 2
+    )
+    kwargs = pod_api.api_client.list_namespaced_pod.call_args.kwargs
+    assert kwargs["label_selector"] == "app" and kwargs["_continue"] == "t1"
+    assert api_client.select_header_accept(["application/json"]) == "application/json"
+
+
+def _namespaced_pod(namespace: str, name: str) -> V1Pod:
+    return V1Pod(metadata=V1ObjectMeta(namespace=namespace, name=name))
+
+
+def test_list_all_namespaces_groups_pages_by_namespace():
+    pod_api = _pod_api()
+    pod_api.api_client.list_pod_for_all_namespaces = mock.Mock(
+        side_effect=[
+            V1PodList(
+                items=[_namespaced_pod("a", "p1"), _namespaced_pod("a", "p2")],
+                metadata=V1ListMeta(_continue="t1"),
+            ),
+            V1PodList(items=[_namespaced_pod("b", "p3")], metadata=V1ListMeta()),
+        ]
+    )
+
+    grouped = pod_api.list_all_namespaces(label_selector="app=web", page_size=2)
+
+    assert {ns: [p.metadata.name for p in pods] for ns, pods in grouped.items()} == {
+        "a": ["p1", "p2"],
+        "b": ["p3"],
+    }
+    calls = pod_api.api_client.list_pod_for_all_namespaces.call_args_list
+    assert calls[1].kwargs == {
+        "label_selector": "app=web",
+        "limit": 2,
+        "_continue": "t1",
+    }
+
+
+def test_list_all_namespaces_falls_back_to_namespaces_when_forbidden():
+    pod_api = _pod_api()
+    pod_api.api_client.list_pod_for_all_namespaces = mock.Mock(
+        side_effect=ApiException(status=403)
+    )
+
+    def list_namespaced_pod(namespace, **kwargs):
+        if namespace == "kube-system":
+            raise ApiException(status=403)
+        return V1PodList(
+            items=[_namespaced_pod(namespace, "p")] if namespace == "a" else [],
+            metadata=V1ListMeta(),
+        )
+
+    pod_api.api_client.list_namespaced_pod = mock.Mock(side_effect=list_namespaced_pod)
+
+    grouped = pod_api.list_all_namespaces(namespaces=["a", "b", "kube-system"])
+
+    assert list(grouped) == ["a"]
+    assert pod_api.api_client.list_namespaced_pod.call_count == 3
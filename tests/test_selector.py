@@ -0,0 +1,50 @@
+import pytest
+
+from kubeclient.resources_apis._selector import (
+    LabelSelector,
+    format_field_selector,
+    selector_options,
+)
+
+
+def test_label_selector_composes_mappings_and_requirements():
+    assert str(LabelSelector.parse({"app": "web", "tier": ["a", "b"]})) == (
+        "app=web,tier in (a,b)"
+    )
+    assert str(LabelSelector.parse(["app==web", "!canary, env notin (dev,qa)"])) == (
+        "app=web,!canary,env notin (dev,qa)"
+    )
+
+
+def test_label_selector_matches_labels():
+    selector = LabelSelector.parse("app=web,tier in (a,b),!canary,team,env!=dev")
+
+    assert selector.matches({"app": "web", "tier": "a", "team": "x", "env": "prod"})
+    assert not selector.matches({"app": "web", "tier": "c", "team": "x"})
+    assert not selector.matches({"app": "web", "tier": "a", "team": "x", "canary": ""})
+    assert not selector.matches({"app": "web", "tier": "a"})
+    assert not selector.matches({"app": "web", "tier": "a", "team": "x", "env": "dev"})
+
+
+@pytest.mark.parametrize(
+    "selector", ["app=we b", "-app=web", "app in (a", "Example.com/app=web", "a" * 64]
+)
+def test_label_selector_rejects_invalid_selectors(selector):
+    with pytest.raises(ValueError):
+        LabelSelector.parse(selector)
+
+
+def test_field_selector_only_allows_equality():
+    assert format_field_selector({"status.phase": "Running"}) == "status.phase=Running"
+    assert format_field_selector("spec.nodeName!=n1") == "spec.nodeName!=n1"
+    with pytest.raises(ValueError):
+        format_field_selector("status.phase in (Running)")
+
+
+def test_selector_options_skip_empty_selectors():
+    assert selector_options() == {}
+    assert selector_options("", {}) == {}
+    assert selector_options({"app": "web"}, "metadata.name=a") == {
+        "label_selector": "app=web",
+        "field_selector": "metadata.name=a",
+    }